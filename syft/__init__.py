@@ -6,6 +6,7 @@ Differential Privacy, and Multi-Party Computation (MPC) within PyTorch.
 # We load these modules first so that syft knows which are available
 from syft import dependency_check
 from syft import frameworks  # Triggers registration of any available frameworks
+from syft.common.lazy_import import lazy_import
 
 # Major imports
 from syft.version import __version__
@@ -22,13 +23,32 @@ logger = logging.getLogger(__name__)
 # PySyft by making it possible to import the most commonly used objects from syft
 # directly (i.e., syft.TorchHook or syft.VirtualWorker or syft.LoggingTensor)
 
+# Objects whose module is only imported on their first access (see lazy_import below),
+# because importing it is slow or pulls in dependencies most workers don't use
+# (websockets, requests, phe, tf_encrypted)
+_lazy_imports = {
+    # Import grids
+    "PrivateGridNetwork": "syft.grid.private_grid",
+    "PublicGridNetwork": "syft.grid.public_grid",
+    # Import sandbox. syft.hook is syft.sandbox.hook, as before imports were lazy:
+    # the helper creating a quiet sandbox without datasets, which create_sandbox
+    # replaces by the TorchHook of the sandbox
+    "create_sandbox": "syft.sandbox",
+    "hook": "syft.sandbox",
+    # Import websocket workers
+    "WebsocketClientWorker": "syft.workers.websocket_client",
+    "WebsocketServerWorker": "syft.workers.websocket_server",
+    # Import Paillier key generation
+    "keygen": "syft.frameworks.torch.he.paillier",
+}
+
 # Tensorflow / Keras dependencies
 # Import Hooks
 
 if dependency_check.tfe_available:
-    from syft.frameworks.keras import KerasHook
-    from syft.workers.tfe import TFECluster
-    from syft.workers.tfe import TFEWorker
+    _lazy_imports["KerasHook"] = "syft.frameworks.keras"
+    _lazy_imports["TFECluster"] = "syft.workers.tfe"
+    _lazy_imports["TFEWorker"] = "syft.workers.tfe"
 
     __all__ = ["KerasHook", "TFECluster", "TFEWorker"]
 else:
@@ -39,13 +59,6 @@ else:
 # Import Hook
 from syft.frameworks.torch.hook.hook import TorchHook
 
-# Import grids
-from syft.grid.private_grid import PrivateGridNetwork
-from syft.grid.public_grid import PublicGridNetwork
-
-# Import sandbox
-from syft.sandbox import create_sandbox, hook
-
 # Import federate learning objects
 from syft.frameworks.torch.fl import FederatedDataset, FederatedDataLoader, BaseDataset
 from syft.federated.train_config import TrainConfig
@@ -58,8 +71,6 @@ from syft.execution.plan import method2plan
 
 # Import Worker Types
 from syft.workers.virtual import VirtualWorker
-from syft.workers.websocket_client import WebsocketClientWorker
-from syft.workers.websocket_server import WebsocketServerWorker
 
 # Import Syft's Public Tensor Types
 from syft.frameworks.torch.tensors.decorators.logging import LoggingTensor
@@ -81,12 +92,14 @@ from syft import serde
 
 # import functions
 from syft.frameworks.torch.functions import combine_pointers
-from syft.frameworks.torch.he.paillier import keygen
 
 # import common
 import syft.common.util
 
 
+lazy_import(__name__, _lazy_imports)
+
+
 def pool():
     if not hasattr(syft, "_pool"):
         import multiprocessing
@@ -1,6 +1,7 @@
 class PLAN_CMDS(object):
     FETCH_PLAN = "fetch_plan"
     FETCH_PROTOCOL = "fetch_protocol"
+    UPDATE_PLAN_STATE = "update_plan_state"
 
 
 class TENSOR_SERIALIZATION(object):
@@ -8,6 +9,15 @@ class TENSOR_SERIALIZATION(object):
     NUMPY = "numpy"
     TF = "tf"
     ALL = "all"
+    IN_PROCESS = "in_process"
+    RAW = "raw"
+
+
+class WEBSOCKET_FRAMES(object):
+    HEADER = "Syft-Frame-Mode"
+    BINARY = "binary"
+    PIPELINED = "pipelined"
+    REQUEST_ID_SIZE = 8
 
 
 class GATEWAY_ENDPOINTS(object):
@@ -0,0 +1,47 @@
+"""
+Imports of the attributes of a module on their first access.
+
+Modules can't define __getattr__ before Python 3.7 (PEP 562), so the class of
+the lazily importing modules is replaced by LazyModule, whose __getattr__ is
+called for the attributes not found in the module.
+"""
+import importlib
+import sys
+import types
+from typing import Dict
+
+
+class LazyModule(types.ModuleType):
+    """A module whose attributes listed in _lazy_imports are imported on their first
+    access, see lazy_import."""
+
+    def __getattr__(self, name: str):
+        try:
+            module_name = self.__dict__["_lazy_imports"][name]
+        except KeyError:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+
+        value = importlib.import_module(module_name)
+        if module_name != f"{self.__name__}.{name}":
+            value = getattr(value, name)
+
+        # Later accesses find the attribute without calling __getattr__
+        setattr(self, name, value)
+        return value
+
+
+def lazy_import(module_name: str, lazy_imports: Dict[str, str]):
+    """Makes the attributes of a module be imported on their first access.
+
+    Args:
+        module_name: the name of the module, usually its __name__.
+        lazy_imports: the name of the module of each attribute. An attribute
+            named like a submodule of the module is this submodule, the other
+            attributes are imported from their module.
+
+    Example:
+        >>> lazy_import(__name__, {"protobuf": "syft.serde.protobuf"})
+    """
+    module = sys.modules[module_name]
+    module._lazy_imports = lazy_imports
+    module.__class__ = LazyModule
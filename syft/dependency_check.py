@@ -4,13 +4,18 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# tensorflow is only imported to check its version when syft_tensorflow is installed,
+# as importing it takes seconds
+pstf_spec = util.find_spec("syft_tensorflow")
 try:
+    if pstf_spec is None:
+        raise ImportError()
+
     import tensorflow
 
     if LooseVersion(tensorflow.__version__) < LooseVersion("2.0.0"):
         raise ImportError()
-    pstf_spec = util.find_spec("syft_tensorflow")
-    tensorflow_available = pstf_spec is not None
+    tensorflow_available = True
 except ImportError:
     tensorflow_available = False
 
@@ -0,0 +1,295 @@
+"""
+Execution of the actions of a Plan without interpreting them at each call.
+
+A Plan run from its actions (for example a Plan fetched from a remote worker)
+is compiled once into a CompiledPlan: each placeholder gets an integer slot in
+a flat list of registers, the functions of the actions are resolved, and the
+order of the input and output placeholders is computed, so that running the
+plan only takes a loop over the steps without any eval, tag search or sort.
+When the plan is run on shared tensors, its steps are run by level of secure
+multiplications instead, see mpc_scheduler.
+"""
+import importlib
+import inspect
+from typing import List
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+import syft as sy
+from syft.execution import mpc_scheduler
+from syft.execution.placeholder import PlaceHolder
+
+# this if statement avoids circular imports between plan.py and compiled_plan.py
+if TYPE_CHECKING:
+    from syft.execution.plan import Plan
+
+
+def _unwrap(tensor):
+    """Removes the PlaceHolder or the wrappers around a tensor, like
+    PlaceHolder.instantiate does."""
+    if isinstance(tensor, PlaceHolder):
+        return tensor.child
+    while getattr(tensor, "is_wrapper", False):
+        tensor = tensor.child
+    return tensor
+
+
+def _resolve_function(name: str):
+    """Resolves the function of an action without a target, like "torch.add",
+    by importing its module and following its attributes."""
+    paths = name.split(".")
+    function = importlib.import_module(paths[0])
+    for path in paths[1:]:
+        function = getattr(function, path)
+    return function
+
+
+class _Step:
+    """An action of a compiled plan, whose placeholders are replaced with slots."""
+
+    __slots__ = (
+        "name",
+        "function",
+        "methods",
+        "target_slot",
+        "args",
+        "arg_slots",
+        "nested_args",
+        "kwargs",
+        "kwarg_slots",
+        "return_slots",
+    )
+
+    def __init__(self, action, slot_of):
+        self.name = action.name
+
+        if action.target is None:
+            # resolved once here instead of at each call
+            self.function = _resolve_function(action.name)
+            self.target_slot = None
+        else:
+            self.function = None
+            self.target_slot = slot_of(action.target)
+        # The methods of the targets by type, see call_method
+        self.methods = {}
+
+        self.args = list(action.args)
+        self.arg_slots = []
+        self.nested_args = False
+        for i, arg in enumerate(action.args):
+            if isinstance(arg, PlaceHolder):
+                self.arg_slots.append((i, slot_of(arg)))
+            elif isinstance(arg, (list, tuple)):
+                self.args[i] = _compile_nested(arg, slot_of)
+                self.nested_args = True
+
+        kwargs = action.kwargs or {}
+        self.kwargs = dict(kwargs)
+        self.kwarg_slots = [
+            (key, slot_of(value)) for key, value in kwargs.items() if isinstance(value, PlaceHolder)
+        ]
+
+        self.return_slots = _compile_return(action.return_ids, slot_of)
+
+    def run(self, registers: list):
+        """Runs the action on the registers, and stores its results in them."""
+        if self.nested_args:
+            args = [_load(arg, registers) for arg in self.args]
+        else:
+            args = self.args.copy()
+        for i, slot in self.arg_slots:
+            args[i] = registers[slot]
+
+        kwargs = self.kwargs
+        if self.kwarg_slots:
+            kwargs = dict(kwargs)
+            for key, slot in self.kwarg_slots:
+                kwargs[key] = registers[slot]
+
+        if self.function is not None:
+            response = self.function(*args, **kwargs)
+        else:
+            response = self.call_method(registers[self.target_slot], args, kwargs)
+
+        _store(self.return_slots, response, registers)
+
+    def call_method(self, target, args: list, kwargs: dict):
+        """Calls the method of the action on its target, with the unbound method
+        looked up once for each type of target."""
+        target_type = type(target)
+        method = self.methods.get(target_type)
+        if method is None:
+            method = inspect.getattr_static(target_type, self.name, None)
+            if not isinstance(method, (staticmethod, classmethod, property)) and callable(method):
+                method = getattr(target_type, self.name)
+            else:
+                # the method is bound by a descriptor or is an attribute of the instance
+                method = False
+            self.methods[target_type] = method
+        if method is False:
+            return getattr(target, self.name)(*args, **kwargs)
+        return method(target, *args, **kwargs)
+
+    def operand_slots(self) -> List[int]:
+        """Returns the slots read by the action."""
+        slots = [] if self.target_slot is None else [self.target_slot]
+        slots += [slot for _, slot in self.arg_slots]
+        if self.nested_args:
+            slots += [slot for arg in self.args for slot in _nested_slots(arg)]
+        slots += [slot for _, slot in self.kwarg_slots]
+        return slots
+
+    def result_slots(self) -> List[int]:
+        """Returns the slots written by the action."""
+        return _flatten(self.return_slots)
+
+
+class _Nested:
+    """A list or a tuple of an action args which contains placeholders."""
+
+    __slots__ = ("type", "items")
+
+    def __init__(self, type_, items):
+        self.type = type_
+        self.items = items
+
+    def load(self, registers: list):
+        return self.type(_load(item, registers) for item in self.items)
+
+
+class _Slot:
+    """A placeholder inside a list or a tuple of an action args."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+def _compile_nested(obj, slot_of):
+    if isinstance(obj, PlaceHolder):
+        return _Slot(slot_of(obj))
+    elif isinstance(obj, (list, tuple)):
+        return _Nested(type(obj), [_compile_nested(item, slot_of) for item in obj])
+    return obj
+
+
+def _nested_slots(item) -> List[int]:
+    if isinstance(item, _Slot):
+        return [item.index]
+    elif isinstance(item, _Nested):
+        return [slot for sub_item in item.items for slot in _nested_slots(sub_item)]
+    return []
+
+
+def _load(item, registers: list):
+    if isinstance(item, _Slot):
+        return registers[item.index]
+    elif isinstance(item, _Nested):
+        return item.load(registers)
+    return item
+
+
+def _compile_return(return_ids, slot_of):
+    """Returns the slot, or the tuple of slots (possibly nested), where to store the
+    response of an action."""
+    if return_ids is None:
+        return None
+    elif isinstance(return_ids, PlaceHolder):
+        return slot_of(return_ids)
+    elif isinstance(return_ids, (list, tuple)):
+        return tuple(_compile_return(r, slot_of) for r in return_ids)
+    else:
+        raise ValueError(f"Response of type {type(return_ids)} is not supported in plan actions")
+
+
+def _store(return_slots, response, registers: list):
+    if return_slots is None:
+        return
+    elif isinstance(return_slots, int):
+        registers[return_slots] = _unwrap(response)
+    else:
+        for slots, sub_response in zip(return_slots, response):
+            _store(slots, sub_response, registers)
+
+
+class CompiledPlan:
+    """The actions of a Plan, compiled to be run on a list of registers.
+
+    Args:
+        plan: the Plan to compile. Its actions and placeholders shouldn't change
+            after the compilation, else it must be compiled again.
+    """
+
+    def __init__(self, plan: "Plan"):
+        slots = {}
+        # The placeholders of the slots, to read the tensors of the state and of the
+        # placeholders which are not written by the actions at each call
+        self.placeholders: List[PlaceHolder] = []
+
+        def slot_of(placeholder: PlaceHolder) -> int:
+            # placeholders are compared by identity because a state placeholder may be
+            # registered in plan.placeholders with the id of its tensor
+            key = id(placeholder)
+            if key not in slots:
+                slots[key] = len(self.placeholders)
+                self.placeholders.append(placeholder)
+            return slots[key]
+
+        tag_sort = sy.execution.plan.tag_sort
+        inputs = sorted(plan.find_placeholders("#input"), key=tag_sort("input"))
+        outputs = sorted(plan.find_placeholders("#output"), key=tag_sort("output"))
+
+        self.input_slots: List[int] = [slot_of(p) for p in inputs]
+        self.steps: List[_Step] = [_Step(action, slot_of) for action in plan.actions]
+        self.output_slots: List[int] = [slot_of(p) for p in outputs]
+
+        written = set()
+        for step in self.steps:
+            written.update(_flatten(step.return_slots))
+        # The slots read from their placeholders at each call: the state, and the inputs
+        # which are not provided in the args
+        self.preloaded: List[Tuple[int, PlaceHolder]] = [
+            (slot, placeholder)
+            for slot, placeholder in enumerate(self.placeholders)
+            if slot not in written
+        ]
+        self.loaded_slots: List[int] = [slot for slot, _ in self.preloaded] + self.input_slots
+        # The steps grouped by level of secure multiplications, see mpc_scheduler.schedule
+        self.levels = None
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __call__(self, *args):
+        """Runs the actions of the plan on some args.
+
+        Returns:
+            The output tensors, or a tuple of them if the plan has several outputs.
+        """
+        registers = [None] * len(self.placeholders)
+        for slot, placeholder in self.preloaded:
+            registers[slot] = placeholder.child
+        for slot, arg in zip(self.input_slots, args):
+            registers[slot] = _unwrap(arg)
+
+        if mpc_scheduler.is_shared(registers[slot] for slot in self.loaded_slots):
+            # the multiplications of the plan are batched by level, see mpc_scheduler
+            if self.levels is None:
+                self.levels = mpc_scheduler.schedule(self.steps)
+            mpc_scheduler.run_levels(self.levels, registers)
+        else:
+            for step in self.steps:
+                step.run(registers)
+
+        if len(self.output_slots) == 1:
+            return registers[self.output_slots[0]]
+        return tuple(registers[slot] for slot in self.output_slots)
+
+
+def _flatten(return_slots):
+    if return_slots is None:
+        return []
+    elif isinstance(return_slots, int):
+        return [return_slots]
+    return [slot for slots in return_slots for slot in _flatten(slots)]
@@ -0,0 +1,138 @@
+"""
+Scheduling of the actions of a Plan run on additively shared tensors.
+
+Each secure multiplication (see syft.frameworks.torch.mpc.spdz) needs a
+multiplication triple and a round of communication between the workers to
+reconstruct its masked operands. When a plan runs its actions one after the
+other, it takes one round per multiplication, even for multiplications which
+don't depend on each other, such as the matmuls of the gates of an LSTM cell.
+
+schedule groups the actions in levels, where the actions with secure
+multiplications or comparisons of a level only depend on the actions of the
+previous levels. run_levels runs these actions of each level together (see
+spdz.run_in_rounds), so that their multiplications share their triple
+requests and their rounds. The number of rounds of the plan is then its
+multiplicative depth rather than its number of multiplications.
+"""
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+import syft as sy
+from syft.execution.plan_optimizer import is_inplace
+from syft.execution.plan_optimizer import SIDE_EFFECTS
+
+# The actions which run secure multiplications when run on shared tensors
+SECURE_ACTIONS = {
+    "mul",
+    "__mul__",
+    "__rmul__",
+    "matmul",
+    "__matmul__",
+    "mm",
+    "square",
+    "pow",
+    "__pow__",
+    "div",
+    "__truediv__",
+    "torch.mul",
+    "torch.matmul",
+    "torch.mm",
+    "torch.nn.functional.linear",
+    "gt",
+    "__gt__",
+    "ge",
+    "__ge__",
+    "lt",
+    "__lt__",
+    "le",
+    "__le__",
+    "eq",
+    "__eq__",
+    "relu",
+    "torch.relu",
+    "torch.nn.functional.relu",
+    "max",
+    "argmax",
+    "torch.max",
+    "torch.argmax",
+}
+
+
+def is_shared(tensors: Iterable) -> bool:
+    """Returns True if one of the tensors is, or wraps, an AdditiveSharingTensor."""
+    for tensor in tensors:
+        while tensor is not None:
+            if isinstance(tensor, sy.AdditiveSharingTensor):
+                return True
+            tensor = getattr(tensor, "child", None)
+    return False
+
+
+def schedule(steps: List) -> List[Tuple[List, List]]:
+    """Groups the steps of a CompiledPlan by level of secure multiplications.
+
+    The level of a step is the largest level of the steps computing its operands,
+    plus one for the steps running secure multiplications or comparisons. The steps
+    with side effects, such as in-place actions, are also ordered with all the steps
+    before and after them.
+
+    Args:
+        steps: the steps of a CompiledPlan.
+
+    Returns:
+        A list with, for each level, the steps running secure multiplications of the
+        level, which don't depend on each other, and the other steps of the level,
+        in the order of the plan.
+    """
+    # The level of the step which wrote each slot
+    slot_levels = {}
+    # The smallest level of the next steps, set by the steps with side effects
+    barrier = 0
+    max_level = 0
+    step_levels = []
+    for step in steps:
+        level = max([barrier] + [slot_levels.get(slot, 0) for slot in step.operand_slots()])
+        secure = step.name in SECURE_ACTIONS
+        if secure:
+            level += 1
+
+        if step.return_slots is None or step.name in SIDE_EFFECTS or is_inplace(step):
+            # the steps with side effects run after all the steps before them, and
+            # before all the steps after them
+            level = barrier = max(level, max_level)
+        for slot in step.result_slots():
+            slot_levels[slot] = level
+        max_level = max(level, max_level)
+        step_levels.append((level, secure))
+
+    levels = [([], []) for _ in range(max_level + 1)]
+    for step, (level, secure) in zip(steps, step_levels):
+        levels[level][0 if secure else 1].append(step)
+    return levels
+
+
+def run_levels(levels: List[Tuple[List, List]], registers: list):
+    """Runs the steps of a CompiledPlan level by level: first the secure steps of the
+    level together, then its other steps.
+
+    Args:
+        levels: the steps by level, see schedule.
+        registers: the registers of the CompiledPlan.
+    """
+    run_in_rounds = sy.frameworks.torch.mpc.spdz.run_in_rounds
+    for secure_steps, other_steps in levels:
+        if len(secure_steps) > 1:
+            run_in_rounds([_runner(step, registers) for step in secure_steps])
+        else:
+            for step in secure_steps:
+                step.run(registers)
+        for step in other_steps:
+            step.run(registers)
+
+
+def _runner(step, registers: list):
+    def run():
+        step.run(registers)
+
+    return run
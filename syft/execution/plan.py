@@ -1,3 +1,4 @@
+from collections import OrderedDict
 import re
 from typing import Dict
 from typing import List
@@ -7,7 +8,9 @@ from typing import Union
 import torch
 
 import syft as sy
+from syft.execution.compiled_plan import CompiledPlan
 from syft.execution.computation import ComputationAction
+from syft.execution import plan_optimizer
 from syft.execution.state import State
 from syft.generic.frameworks.types import FrameworkTensor
 from syft.generic.frameworks.types import FrameworkLayerModule
@@ -30,8 +33,10 @@ class func2plan(object):
     This class should be used only as a decorator.
     """
 
-    def __init__(self, args_shape=None, state=None):
+    def __init__(self, args_shape=None, state=None, optimize=False):
         self.args_shape = args_shape
+        # if true, the plan is optimized after being built, see Plan.optimize
+        self.optimize = optimize
         self.state_tensors = state or tuple()
         # include_state is used to distinguish if the initial plan is a function or a class:
         # if it's a function, then the state should be provided in the args, so include_state
@@ -61,6 +66,8 @@ class func2plan(object):
                     " - you have no simple numbers like int or float as args. If you do "
                     "so, please consider using a tensor instead."
                 )
+            if self.optimize:
+                plan.optimize()
         return plan
 
 
@@ -98,6 +105,12 @@ class Plan(AbstractObject, ObjectStorage):
         description: plan description
     """
 
+    # The default number of variants kept by a plan, see add_variant
+    MAX_VARIANTS = 8
+    # The number of syncs of a location with deltas after which its state is sent
+    # in full, to drop the rounding errors accumulated, see sync_state
+    FULL_SYNC_INTERVAL = 10
+
     def __init__(
         self,
         name: str = None,
@@ -145,9 +158,25 @@ class Plan(AbstractObject, ObjectStorage):
 
         self.include_state = include_state
         self.is_built = is_built
+        # The actions compiled to be run without a forward function, see compile
+        self._compiled = None
+
+        # The signature of the args the plan was built with, see shape_signature
+        self.signature = None
+        # The variants of the plan built for other args, by signature, from the least
+        # to the most recently used, see add_variant
+        self.variants = OrderedDict()
+        self.max_variants = self.MAX_VARIANTS
 
         # The plan has not been sent so it has no reference to remote locations
         self.pointers = dict()
+        # The copies of the state last sent to each location, see sync_state. The
+        # copies of the tensors which are the same for several locations are shared
+        # with the latest snapshot, see _snapshot_state
+        self._state_snapshots = dict()
+        self._latest_state_snapshot = dict()
+        # The number of syncs with deltas of each location since its last full sync
+        self._delta_syncs = dict()
 
         if not hasattr(self, "forward"):
             self.forward = forward_func or None
@@ -345,8 +374,114 @@ class Plan(AbstractObject, ObjectStorage):
 
         sy.hook.trace.clear()
         self.is_built = True
+        self._compiled = None
+        self.signature = shape_signature(args)
         self.owner.init_plan = None
 
+    def add_variant(self, *args, args_shape=None) -> "Plan":
+        """Builds a variant of the plan for args of other shapes or dtypes.
+
+        The actions of a plan are traced with the shapes of the args it is built
+        with, so a plan run from its actions (for example by a remote worker) only
+        supports these shapes. The variants are sent with the plan, and the variant
+        matching the shapes and dtypes of the args is run at each call, see
+        shape_signature. The plan keeps the max_variants variants most recently used.
+
+        If the plan was already sent, it is sent again to the same workers with the
+        new variant, which also syncs their copy of the state.
+
+        Args:
+            args: the args to build the variant with.
+            args_shape: the shapes of the args, to build the variant with zero
+                tensors instead of args, like func2plan.
+
+        Returns:
+            The variant, a plan with the same state.
+
+        Example:
+            >>> @sy.func2plan(args_shape=[(1, 3)])
+            ... def plan(x):
+            ...     return x.view(-1, 3).sum(dim=1)
+            >>> for batch_size in (8, 32, 64):
+            ...     plan.add_variant(args_shape=[(batch_size, 3)])
+        """
+        if self.forward is None:
+            raise RuntimeError("A plan without a forward function can't build new variants.")
+        if args_shape is not None:
+            args = Plan._create_placeholders(args_shape)
+
+        signature = shape_signature(args)
+        if signature == self.signature:
+            return self
+        if signature in self.variants:
+            self.variants.move_to_end(signature)
+            return self.variants[signature]
+
+        variant = Plan(
+            name=self.name,
+            state=self.state.copy(),
+            include_state=self.include_state,
+            forward_func=self.forward,
+            id=self.id,
+            owner=self.owner,
+        )
+        # the variant uses the placeholders of the state of the plan
+        variant.placeholders = {
+            key: placeholder
+            for key, placeholder in self.placeholders.items()
+            if "#state" in placeholder.tags
+        }
+        variant.var_count = self.var_count
+        variant.build(*args)
+        variant.forward = None
+
+        self.variants[signature] = variant
+        while len(self.variants) > self.max_variants:
+            self.variants.popitem(last=False)
+
+        # the workers the plan was sent to replace their copy with the plan and its
+        # variants, as the pointers to their copy are kept
+        for location in self.pointers:
+            self.owner.send(self, workers=location, create_pointer=False)
+            self._state_snapshots[location] = self._snapshot_state()
+            self._delta_syncs[location] = 0
+
+        return variant
+
+    def get_variant(self, args: Tuple) -> "Plan":
+        """Returns the variant of the plan matching some args, or the plan itself if
+        none matches, see add_variant."""
+        if not self.variants:
+            return self
+
+        signature = shape_signature(args)
+        variant = self.variants.get(signature)
+        if variant is None:
+            return self
+        self.variants.move_to_end(signature)
+        return variant
+
+    def optimize(self, passes=plan_optimizer.DEFAULT_PASSES) -> "Plan":
+        """Optimizes the actions of the plan, to send and run a smaller plan.
+
+        The passes remove the actions whose results are not used, the actions
+        identical to an earlier action, and run once the actions on constants, see
+        syft.execution.plan_optimizer. The forward function, if any, is not changed,
+        so this only speeds up the plan when it is run from its actions, for example
+        once sent to a remote worker.
+
+        Args:
+            passes: the optimization passes to run in order.
+
+        Returns:
+            The plan, which is optimized in place.
+        """
+        plan_optimizer.optimize(self, passes)
+        self._compiled = None
+        for variant in self.variants.values():
+            variant.optimize(passes)
+        return self
+
     def copy(self):
         """Creates a copy of a plan."""
         plan = Plan(
@@ -363,6 +498,8 @@ class Plan(AbstractObject, ObjectStorage):
         )
 
         plan.state.plan = plan
+        plan.signature = self.signature
+        plan.variants = self.variants.copy()
 
         return plan
 
@@ -390,11 +527,12 @@ class Plan(AbstractObject, ObjectStorage):
 
         When possible, run the original function to improve efficiency. When
         it's not, for example if you fetched the plan from a remote worker,
-        then run it from the tape of actions:
-        - Instantiate input placeholders
-        - for each recorded action, run the action on the placeholders
-          and use the result(s) to instantiate to appropriate placeholder.
-        - Return the instantiation of all the output placeholders.
+        then run it from the tape of actions of the variant matching the args
+        (see add_variant), compiled once (see compile):
+        - Load the input tensors in the registers of the input placeholders
+        - for each recorded action, run the action on the registers
+          and store the result(s) in the registers of the returned placeholders.
+        - Return the registers of all the output placeholders.
         """
         if self.forward is not None:  # if not self.is_built:
             if self.include_state:
@@ -402,35 +540,24 @@ class Plan(AbstractObject, ObjectStorage):
             return self.forward(*args)
 
         else:
-            # Instantiate all the input placeholders in the correct order
-
-            input_placeholders = sorted(self.find_placeholders("#input"), key=tag_sort("input"))
-            for placeholder, arg in zip(input_placeholders, args):
-                placeholder.instantiate(arg)
-
-            for i, action in enumerate(self.actions):
-                cmd, _self, args, kwargs, return_placeholder = (
-                    action.name,
-                    action.target,  # target is equivalent to the "self" in a method
-                    action.args,
-                    action.kwargs,
-                    action.return_ids,
-                )
-                if _self is None:
-                    response = eval(cmd)(*args, **kwargs)  # nosec
-                else:
-                    response = getattr(_self, cmd)(*args, **kwargs)
+            plan = self.get_variant(args)
+            compiled = plan._compiled
+            if compiled is None:
+                compiled = plan.compile()
+            return compiled(*args)
 
-                self.instantiate(return_placeholder, response)
+    def compile(self) -> CompiledPlan:
+        """Compiles the actions of the plan, to run them without the forward function.
 
-            # This ensures that we return the output placeholder in the correct order
-            output_placeholders = sorted(self.find_placeholders("#output"), key=tag_sort("output"))
-            response = [p.child for p in output_placeholders]
+        The plan is compiled on its first call without a forward function, for
+        example after being fetched from a remote worker, and must be compiled
+        again if its actions are modified.
 
-            if len(response) == 1:
-                return response[0]
-            else:
-                return tuple(response)
+        Returns:
+            The CompiledPlan, which is also kept to run the next calls.
+        """
+        self._compiled = CompiledPlan(self)
+        return self._compiled
 
     @staticmethod
     def instantiate(placeholder, response):
@@ -489,6 +616,7 @@ class Plan(AbstractObject, ObjectStorage):
             pointer = self.owner.send(self, workers=location)
 
             self.pointers[location] = pointer
+            self._state_snapshots[location] = self._snapshot_state()
         else:
             ids_at_location = []
             for location in locations:
@@ -500,6 +628,7 @@ class Plan(AbstractObject, ObjectStorage):
                     pointer = self.owner.send(self, workers=location)
 
                     self.pointers[location] = pointer
+                    self._state_snapshots[location] = self._snapshot_state()
 
                 ids_at_location.append(pointer.id_at_location)
 
@@ -507,6 +636,62 @@ class Plan(AbstractObject, ObjectStorage):
 
         return pointer
 
+    def sync_state(self, *locations: AbstractWorker, deltas: bool = False) -> "Plan":
+        """Sends the state tensors modified since the plan was sent, or since the last
+        sync, to the workers holding the plan, which update their copy of the state
+        in place.
+
+        Unlike sending the plan again, only the modified tensors are sent, for example
+        the parameters updated by a round of training. The plan keeps a copy of the
+        state last sent to each location to find them.
+
+        Args:
+            locations: the workers to sync, by default all the workers the plan was
+                sent to.
+            deltas: if True, send the differences between the tensors and their last
+                values sent, which the workers add to their state, rather than the
+                tensors themselves. As adding deltas accumulates rounding errors, the
+                tensors themselves are sent every FULL_SYNC_INTERVAL syncs.
+
+        Returns:
+            The plan.
+        """
+        locations = locations or tuple(self.pointers)
+        for location in locations:
+            if location not in self.pointers:
+                raise RuntimeError(f"The plan was not sent to {location}, it can't be synced.")
+
+            snapshot = self._state_snapshots[location]
+            use_deltas = deltas and self._delta_syncs.get(location, 0) < self.FULL_SYNC_INTERVAL
+            values, state_deltas = self.state.changes(snapshot, deltas=use_deltas)
+            if not values and not state_deltas:
+                continue
+
+            self.owner.update_plan_state(
+                self.pointers[location].id_at_location, location, values, state_deltas
+            )
+            snapshot.update(self._snapshot_state(ids=set(values) | set(state_deltas)))
+            if use_deltas:
+                self._delta_syncs[location] = self._delta_syncs.get(location, 0) + 1
+            else:
+                self._delta_syncs[location] = 0
+
+        return self
+
+    def _snapshot_state(self, ids=None) -> Dict:
+        """Returns copies of the state tensors to find later the tensors modified, see
+        State.snapshot. The copies of the tensors which didn't change since the latest
+        snapshot are reused, so that sending or syncing the plan to several workers
+        copies each tensor once.
+
+        Args:
+            ids: the ids of the placeholders of the tensors to copy, or None to copy
+                all of them.
+        """
+        copies = self.state.snapshot(ids=ids, base=self._latest_state_snapshot)
+        self._latest_state_snapshot.update(copies)
+        return copies
+
     def get_(self):
         self.state.get_()
         return self
@@ -641,6 +826,27 @@ class Plan(AbstractObject, ObjectStorage):
             sy.serde.msgpack.serde._simplify(worker, plan.tags),
             sy.serde.msgpack.serde._simplify(worker, plan.description),
             sy.serde.msgpack.serde._simplify(worker, plan.placeholders),
+            sy.serde.msgpack.serde._simplify(
+                worker,
+                [
+                    (signature, variant.actions, variant.placeholders, plan._variant_state(variant))
+                    for signature, variant in plan.variants.items()
+                ],
+            ),
+        )
+
+    def _variant_state(self, variant: "Plan") -> State:
+        """Returns the state of a variant which is not in the state of the plan, such
+        as its folded constants, to send the variants without sending the state of the
+        plan several times."""
+        state_placeholders = {id(placeholder) for placeholder in self.state.state_placeholders}
+        return State(
+            owner=self.owner,
+            state_placeholders=[
+                placeholder
+                for placeholder in variant.state.state_placeholders
+                if id(placeholder) not in state_placeholders
+            ],
         )
 
     @staticmethod
@@ -663,6 +869,7 @@ class Plan(AbstractObject, ObjectStorage):
             tags,
             description,
             placeholders,
+            variants,
         ) = plan_tuple
 
         worker._tmp_placeholders = {}
@@ -670,6 +877,8 @@ class Plan(AbstractObject, ObjectStorage):
         actions = sy.serde.msgpack.serde._detail(worker, actions)
         state = sy.serde.msgpack.serde._detail(worker, state)
         placeholders = sy.serde.msgpack.serde._detail(worker, placeholders)
+        # the variants share the placeholders of the state of the plan
+        variants = sy.serde.msgpack.serde._detail(worker, variants)
 
         plan = sy.Plan(
             include_state=include_state,
@@ -679,6 +888,20 @@ class Plan(AbstractObject, ObjectStorage):
             id=id,
             owner=worker,
         )
+        for signature, variant_actions, variant_placeholders, variant_state in variants:
+            variant = sy.Plan(
+                include_state=include_state,
+                is_built=is_built,
+                actions=variant_actions,
+                placeholders=variant_placeholders,
+                id=id,
+                owner=worker,
+            )
+            variant.state = State(
+                owner=worker,
+                state_placeholders=state.state_placeholders + variant_state.state_placeholders,
+            )
+            plan.variants[signature] = variant
         del worker._tmp_placeholders
 
         plan.state = state
@@ -778,6 +1001,19 @@ class Plan(AbstractObject, ObjectStorage):
         return plan
 
 
+def shape_signature(args: Tuple) -> tuple:
+    """Returns the shapes and dtypes of the tensors of some args, or the type of the
+    other args, which select the variant of a plan to run, see Plan.add_variant."""
+    signature = []
+    for arg in args:
+        shape = getattr(arg, "shape", None)
+        if shape is None:
+            signature.append(type(arg).__name__)
+        else:
+            signature.append((tuple(shape), str(getattr(arg, "dtype", None))))
+    return tuple(signature)
+
+
 def tag_sort(keyword):
     """
     Utility function to sort tensors by their (unique) tag including "keyword"
@@ -0,0 +1,500 @@
+"""
+Optimization passes over the actions of a Plan.
+
+Plan.build records all the actions traced while running the function of the
+plan, including actions whose results are never used, identical actions run
+several times, and actions on constants. The passes below remove or rewrite
+them, so that the plan is smaller to send and faster to run remotely. For plans
+on shared tensors, each multiplication removed also saves a round of
+communication between the workers.
+
+Each pass modifies the plan in place:
+
+- fold_constants: runs once the actions whose operands are all constants, and
+  stores their results in the state of the plan
+- eliminate_common_subexpressions: removes the actions identical to an
+  earlier action, and uses the results of the earlier action instead
+- eliminate_dead_code: removes the actions whose results are not used to
+  compute the outputs of the plan
+- rewrite_inplace: runs the actions on temporary tensors in place, which must
+  only be used for plans run without autograd (see rewrite_inplace)
+
+Example:
+    >>> plan.optimize()
+    >>> plan.optimize(passes=(functools.partial(fold_constants, fold_state=True), rewrite_inplace))
+"""
+from typing import Callable
+from typing import Iterable
+
+import torch  # also used to resolve the functions of the actions
+
+import syft as sy
+from syft.execution.computation import ComputationAction
+from syft.execution.placeholder import PlaceHolder
+
+# The actions whose names contain one of these are random, so running them again
+# doesn't give the same results
+NON_DETERMINISTIC = (
+    "rand",
+    "dropout",
+    "normal",
+    "bernoulli",
+    "uniform",
+    "multinomial",
+    "poisson",
+    "cauchy",
+    "exponential",
+    "geometric",
+    "perm",
+)
+
+# The actions which change the state of the worker or of other objects than
+# their results, and must be kept even when their results are not used
+SIDE_EFFECTS = {
+    "backward",
+    "send",
+    "send_",
+    "get",
+    "get_",
+    "move",
+    "remote_send",
+    "remote_get",
+    "mid_get",
+    "share_",
+    "fix_precision_",
+    "fix_prec_",
+    "float_precision_",
+    "float_prec_",
+    "__setitem__",
+}
+
+# The in-place variants of the methods whose results have the dtype and the
+# shape of their target when their args are numbers
+INPLACE_METHODS = {
+    "add": "add_",
+    "__add__": "add_",
+    "sub": "sub_",
+    "__sub__": "sub_",
+    "mul": "mul_",
+    "__mul__": "mul_",
+    "div": "div_",
+    "__truediv__": "div_",
+    "pow": "pow_",
+    "__pow__": "pow_",
+    "clamp": "clamp_",
+    "neg": "neg_",
+    "__neg__": "neg_",
+    "abs": "abs_",
+    "__abs__": "abs_",
+    "relu": "relu_",
+    "sigmoid": "sigmoid_",
+    "tanh": "tanh_",
+    "exp": "exp_",
+    "log": "log_",
+    "sqrt": "sqrt_",
+}
+
+# The in-place variants of INPLACE_METHODS which keep the dtype of any tensor
+INPLACE_KEEPING_DTYPE = {"relu_", "neg_", "abs_"}
+
+# The actions whose results are floating point tensors, whatever their operands
+FLOATING_RESULTS = {
+    "float",
+    "double",
+    "half",
+    "sigmoid",
+    "tanh",
+    "exp",
+    "log",
+    "sqrt",
+    "torch.sigmoid",
+    "torch.tanh",
+    "torch.exp",
+    "torch.log",
+    "torch.sqrt",
+}
+
+# The actions whose results are new tensors, rather than views of their operands
+FRESH_RESULTS = set(INPLACE_METHODS).union(
+    INPLACE_METHODS.values(),
+    {
+        "matmul",
+        "__matmul__",
+        "mm",
+        "bmm",
+        "mv",
+        "clone",
+        "torch.matmul",
+        "torch.mm",
+        "torch.add",
+        "torch.sub",
+        "torch.mul",
+        "torch.div",
+        "torch.cat",
+        "torch.stack",
+        "torch.relu",
+        "torch.sigmoid",
+        "torch.tanh",
+        "torch.nn.functional.linear",
+        "torch.nn.functional.relu",
+        "torch.nn.functional.conv2d",
+    },
+)
+
+
+def is_inplace(action: ComputationAction) -> bool:
+    """Returns True if the action modifies its target."""
+    name = action.name
+    if name.startswith("__"):
+        return name.startswith("__i") and name not in ("__int__", "__index__", "__invert__")
+    return name.endswith("_")
+
+
+def is_pure(action: ComputationAction) -> bool:
+    """Returns True if running the action again gives the same results without
+    changing any other object."""
+    name = action.name
+    return (
+        action.return_ids is not None
+        and name not in SIDE_EFFECTS
+        and not is_inplace(action)
+        and "out" not in (action.kwargs or {})
+        and not any(keyword in name for keyword in NON_DETERMINISTIC)
+    )
+
+
+def placeholders_of(obj) -> list:
+    """Returns the placeholders in an object, possibly nested in lists, tuples or dicts."""
+    if isinstance(obj, PlaceHolder):
+        return [obj]
+    elif isinstance(obj, (list, tuple)):
+        return [p for item in obj for p in placeholders_of(item)]
+    elif isinstance(obj, dict):
+        return [p for value in obj.values() for p in placeholders_of(value)]
+    return []
+
+
+def operands_of(action: ComputationAction) -> list:
+    """Returns the placeholders read by an action."""
+    return placeholders_of((action.target, action.args, action.kwargs))
+
+
+def results_of(action: ComputationAction) -> list:
+    """Returns the placeholders written by an action."""
+    return placeholders_of(action.return_ids)
+
+
+def _is_interface(placeholder: PlaceHolder) -> bool:
+    """Returns True for the placeholders of the inputs and the outputs of the plan."""
+    return any("#input" in tag or "#output" in tag for tag in placeholder.tags)
+
+
+def _substitute(obj, replacements: dict):
+    """Replaces the placeholders of an object, found by identity in replacements."""
+    if isinstance(obj, PlaceHolder):
+        return replacements.get(id(obj), obj)
+    elif isinstance(obj, (list, tuple)):
+        return type(obj)(_substitute(item, replacements) for item in obj)
+    elif isinstance(obj, dict):
+        return {key: _substitute(value, replacements) for key, value in obj.items()}
+    return obj
+
+
+def _expression_key(obj):
+    """Returns a hashable key of the operands of an action, where placeholders are
+    compared by identity, or raises TypeError if an operand can't be hashed."""
+    if isinstance(obj, PlaceHolder):
+        return (PlaceHolder, id(obj))
+    elif isinstance(obj, (list, tuple)):
+        return (type(obj), tuple(_expression_key(item) for item in obj))
+    elif isinstance(obj, dict):
+        return (dict, tuple(sorted((key, _expression_key(value)) for key, value in obj.items())))
+    hash(obj)
+    return (type(obj), obj)
+
+
+def _aliases(actions: Iterable[ComputationAction]) -> Callable:
+    """Groups the placeholders which may share their memory: the results of the
+    actions which aren't in FRESH_RESULTS may be views of their operands, and the
+    results of in-place actions and of actions with an out tensor are this tensor.
+
+    Returns:
+        A function returning the id of the group of a placeholder id.
+    """
+    parents = {}
+
+    def find(placeholder_id):
+        root = placeholder_id
+        while parents.get(root, root) != root:
+            root = parents[root]
+        parents[placeholder_id] = root
+        return root
+
+    for action in actions:
+        if is_inplace(action):
+            shared = placeholders_of(action.target)
+        elif action.name in FRESH_RESULTS:
+            shared = placeholders_of((action.kwargs or {}).get("out"))
+        else:
+            shared = operands_of(action)
+        ids = [id(p) for p in shared + results_of(action)]
+        for placeholder_id in ids[1:]:
+            parents[find(placeholder_id)] = find(ids[0])
+
+    return find
+
+
+def _modified_targets(action: ComputationAction) -> list:
+    """Returns the placeholders an action writes to, other than its results."""
+    modified = []
+    if is_inplace(action) or action.name == "__setitem__":
+        modified += placeholders_of(action.target)
+    modified += placeholders_of((action.kwargs or {}).get("out"))
+    return modified
+
+
+def _floating(plan: "sy.Plan") -> set:
+    """Returns the ids of the placeholders of a plan known to hold floating point
+    tensors: the inputs and the state of such dtypes, the results of
+    FLOATING_RESULTS, and the results of arithmetic on floating point operands or
+    on Python floats."""
+    floating = set()
+    input_dtypes = [
+        signature[1] if isinstance(signature, tuple) else None
+        for signature in (plan.signature or ())
+    ]
+    for placeholder in plan.placeholders.values():
+        for tag in placeholder.tags:
+            if tag.startswith("#input-"):
+                index = int(tag.split("-")[-1])
+                if index < len(input_dtypes) and "float" in str(input_dtypes[index]):
+                    floating.add(id(placeholder))
+    for placeholder in plan.state.state_placeholders:
+        child = getattr(placeholder, "child", None)
+        if isinstance(child, torch.Tensor) and child.is_floating_point():
+            floating.add(id(placeholder))
+
+    for action in plan.actions:
+        if action.name in FLOATING_RESULTS or (
+            action.name in FRESH_RESULTS
+            and (
+                any(id(p) in floating for p in operands_of(action))
+                or any(type(arg) is float for arg in action.args)
+            )
+        ):
+            floating.update(id(p) for p in results_of(action))
+    return floating
+
+
+def eliminate_dead_code(plan: "sy.Plan"):
+    """Removes the actions whose results are not used to compute the outputs of the
+    plan, unless they have side effects such as in-place actions."""
+    live = {id(p) for p in plan.find_placeholders("#output")}
+
+    actions = []
+    for action in reversed(plan.actions):
+        results = results_of(action)
+        if (
+            action.return_ids is None
+            or action.name in SIDE_EFFECTS
+            or is_inplace(action)
+            or any(id(p) in live for p in results)
+        ):
+            actions.append(action)
+            live.update(id(p) for p in operands_of(action))
+
+    plan.actions = actions[::-1]
+
+
+def eliminate_common_subexpressions(plan: "sy.Plan"):
+    """Removes the actions identical to an earlier action, whose results are then
+    used instead of theirs."""
+    # the expressions on placeholders modified in place, directly or through views,
+    # can't be compared
+    alias = _aliases(plan.actions)
+    modified = {alias(id(p)) for action in plan.actions for p in _modified_targets(action)}
+
+    expressions = {}
+    replacements = {}
+    actions = []
+    for action in plan.actions:
+        if replacements:
+            action = ComputationAction(
+                action.name,
+                _substitute(action.target, replacements),
+                _substitute(action.args, replacements),
+                _substitute(action.kwargs, replacements),
+                action.return_ids,
+            )
+
+        results = results_of(action)
+        if (
+            not is_pure(action)
+            or any(alias(id(p)) in modified for p in operands_of(action) + results)
+            or any(_is_interface(p) for p in results)
+        ):
+            actions.append(action)
+            continue
+
+        try:
+            key = _expression_key((action.name, action.target, action.args, action.kwargs))
+        except TypeError:
+            actions.append(action)
+            continue
+
+        if key in expressions:
+            earlier_results = results_of(expressions[key])
+            for result, earlier_result in zip(results, earlier_results):
+                replacements[id(result)] = earlier_result
+        else:
+            expressions[key] = action
+            actions.append(action)
+
+    plan.actions = actions
+
+
+def fold_constants(plan: "sy.Plan", fold_state: bool = False):
+    """Runs once the actions whose operands are all constants, such as tensors
+    created in the plan, and stores their results in the state of the plan.
+
+    Args:
+        plan: the plan to optimize.
+        fold_state: if True, the tensors of the state are also considered as
+            constants. The results of the actions on the state are then not updated
+            when the state is modified, for example by training the plan.
+    """
+    constants = {
+        id(p): p for p in plan.state.state_placeholders if fold_state or "#folded" in p.tags
+    }
+
+    actions = []
+    for action in plan.actions:
+        results = results_of(action)
+        if (
+            not is_pure(action)
+            or not results
+            or any(_is_interface(p) for p in results)
+            or any(id(p) not in constants for p in operands_of(action))
+        ):
+            actions.append(action)
+            continue
+
+        args = _instantiate(action.args)
+        kwargs = _instantiate(action.kwargs or {})
+        if action.target is None:
+            response = eval(action.name)(*args, **kwargs)  # nosec
+        else:
+            response = getattr(action.target.child, action.name)(*args, **kwargs)
+        sy.Plan.instantiate(action.return_ids, response)
+
+        for result in results:
+            result.tags.update({"#state", "#folded"})
+            plan.state.state_placeholders.append(result)
+            constants[id(result)] = result
+
+    plan.actions = actions
+
+
+def _instantiate(obj):
+    """Replaces the placeholders of an object with their tensors."""
+    if isinstance(obj, PlaceHolder):
+        return obj.child
+    elif isinstance(obj, (list, tuple)):
+        return type(obj)(_instantiate(item) for item in obj)
+    elif isinstance(obj, dict):
+        return {key: _instantiate(value) for key, value in obj.items()}
+    return obj
+
+
+def rewrite_inplace(plan: "sy.Plan"):
+    """Rewrites the actions on temporary tensors which are not used afterwards to
+    their in-place variants, such as x.add(1) to x.add_(1), which saves allocating
+    their results.
+
+    The methods rewritten are the ones of INPLACE_METHODS whose args are numbers,
+    on tensors computed by the plan (not views of other tensors). As the in-place
+    variants can't change the dtype of their target, the methods other than
+    INPLACE_KEEPING_DTYPE are only rewritten on floating point tensors, see
+    _floating. Autograd can't
+    compute the gradients of the tensors modified in place when they are needed by
+    the backward of the action which computed them, so this pass must only be used
+    on plans run without autograd, for example for inference.
+    """
+    fresh = set()
+    floating = _floating(plan)
+    last_use = {}
+    for i, action in enumerate(plan.actions):
+        for placeholder in operands_of(action):
+            last_use[id(placeholder)] = i
+
+    actions = []
+    for i, action in enumerate(plan.actions):
+        target = action.target
+        if (
+            isinstance(target, PlaceHolder)
+            and action.name in INPLACE_METHODS
+            and id(target) in fresh
+            and last_use[id(target)] == i
+            and not _is_interface(target)
+            and "#state" not in target.tags
+            and not placeholders_of(action.args)
+            and all(type(arg) in (int, float) for arg in action.args)
+            and not action.kwargs
+            and (INPLACE_METHODS[action.name] in INPLACE_KEEPING_DTYPE or id(target) in floating)
+        ):
+            action = ComputationAction(
+                INPLACE_METHODS[action.name], target, action.args, action.kwargs, action.return_ids,
+            )
+
+        if action.name in FRESH_RESULTS:
+            if isinstance(action.return_ids, PlaceHolder):
+                fresh.add(id(action.return_ids))
+        else:
+            # the results of the other actions may be views of their operands
+            fresh.difference_update(id(p) for p in operands_of(action))
+        actions.append(action)
+
+    plan.actions = actions
+
+
+def prune_placeholders(plan: "sy.Plan"):
+    """Removes the placeholders which are no longer used by the actions of the plan,
+    and the folded constants which are no longer used from its state."""
+    used = {id(p) for action in plan.actions for p in operands_of(action) + results_of(action)}
+
+    def is_used(placeholder):
+        return id(placeholder) in used or _is_interface(placeholder)
+
+    def is_kept(placeholder):
+        if "#folded" in placeholder.tags:
+            return is_used(placeholder)
+        return is_used(placeholder) or "#state" in placeholder.tags
+
+    plan.placeholders = {
+        key: placeholder for key, placeholder in plan.placeholders.items() if is_kept(placeholder)
+    }
+    plan.state.state_placeholders = [
+        placeholder for placeholder in plan.state.state_placeholders if is_kept(placeholder)
+    ]
+
+
+DEFAULT_PASSES = (fold_constants, eliminate_common_subexpressions, eliminate_dead_code)
+
+
+def optimize(plan: "sy.Plan", passes: Iterable[Callable] = DEFAULT_PASSES) -> "sy.Plan":
+    """Runs optimization passes on the actions of a plan.
+
+    Args:
+        plan: the plan to optimize, which is modified in place.
+        passes: the passes to run in order. By default, the passes which don't change
+            the results of the plan, even when its state is modified or when it is
+            run with autograd. Passes can be configured with functools.partial, for
+            example functools.partial(fold_constants, fold_state=True).
+
+    Returns:
+        The plan.
+    """
+    for optimization_pass in passes:
+        optimization_pass(plan)
+    prune_placeholders(plan)
+    return plan
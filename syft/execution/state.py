@@ -73,12 +73,92 @@ class State(object):
 
         tensors = []
         for placeholder in self.state_placeholders:
-            # State elements from sub plan should not be reported when read() is used
-            if "#inner" not in placeholder.tags:
+            # State elements from sub plan, or folded by plan_optimizer.fold_constants,
+            # should not be reported when read() is used
+            if "#inner" not in placeholder.tags and "#folded" not in placeholder.tags:
                 tensor = placeholder.child
                 tensors.append(tensor)
         return tensors
 
+    def snapshot(self, ids=None, base: Dict = None) -> Dict:
+        """
+        Return copies of the local state tensors by placeholder id, to find later
+        the tensors modified since then, see changes.
+
+        Args:
+            ids: the ids of the placeholders of the tensors to copy, or None to
+                copy all of them.
+            base: an earlier snapshot, whose copies of the tensors which didn't
+                change since then are reused instead of copying the tensors again.
+        """
+        base = base or {}
+        copies = {}
+        for placeholder in self.state_placeholders:
+            if not _is_local(placeholder.child) or (ids is not None and placeholder.id not in ids):
+                continue
+            tensor = placeholder.child.detach()
+            previous = base.get(placeholder.id)
+            if (
+                previous is not None
+                and previous.shape == tensor.shape
+                and previous.dtype == tensor.dtype
+                and torch.equal(previous, tensor)
+            ):
+                copies[placeholder.id] = previous
+            else:
+                copies[placeholder.id] = tensor.clone()
+        return copies
+
+    def changes(self, snapshot: Dict, deltas: bool = False) -> Tuple[Dict, Dict]:
+        """
+        Return the local state tensors which differ from a snapshot, by placeholder id.
+
+        Args:
+            snapshot: copies of the state tensors, see snapshot.
+            deltas: if True, return the differences between the tensors and their
+                copies rather than the tensors, when they have the same shape and dtype.
+
+        Returns:
+            The new values of the tensors to set, and the deltas to add, see update_.
+        """
+        values = {}
+        state_deltas = {}
+        for placeholder in self.state_placeholders:
+            if not _is_local(placeholder.child):
+                continue
+            tensor = placeholder.child.detach()
+            previous = snapshot.get(placeholder.id)
+            if previous is None or previous.shape != tensor.shape or previous.dtype != tensor.dtype:
+                values[placeholder.id] = tensor.clone()
+            elif not torch.equal(tensor, previous):
+                if deltas:
+                    state_deltas[placeholder.id] = tensor - previous
+                else:
+                    values[placeholder.id] = tensor.clone()
+        return values, state_deltas
+
+    def update_(self, values: Dict = None, deltas: Dict = None):
+        """
+        Update the state tensors in place, so that the plans and the pointers using
+        them see the new values.
+
+        Args:
+            values: the new values of tensors, by placeholder id.
+            deltas: the deltas to add to tensors, by placeholder id.
+        """
+        values = values or {}
+        deltas = deltas or {}
+        for placeholder in self.state_placeholders:
+            tensor = placeholder.child
+            if placeholder.id in values:
+                value = values[placeholder.id]
+                if tensor.shape == value.shape and tensor.dtype == value.dtype:
+                    tensor.data.copy_(value)
+                else:
+                    tensor.data = value
+            if placeholder.id in deltas:
+                tensor.data.add_(deltas[placeholder.id])
+
     @staticmethod
     def create_grad_if_missing(tensor):
         if isinstance(tensor, torch.nn.Parameter) and tensor.grad is None:
@@ -199,3 +279,9 @@ class State(object):
 
         state = State(owner=worker, state_placeholders=state_placeholders)
         return state
+
+
+def _is_local(tensor) -> bool:
+    """Returns True for the state tensors holding their values, rather than wrapping
+    pointers or shares, which can be synced with update_."""
+    return isinstance(tensor, torch.Tensor) and not tensor.has_child()
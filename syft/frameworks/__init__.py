@@ -1,5 +1,6 @@
 import logging
 from syft import dependency_check
+from syft.common.lazy_import import lazy_import
 
 logger = logging.getLogger(__name__)
 
@@ -11,8 +12,8 @@ if dependency_check.tensorflow_available:
     __all__.append("tensorflow")
 
 if dependency_check.tfe_available:
-    from syft.frameworks import keras
-
+    # keras is imported on its first access, as importing tf_encrypted is slow
+    lazy_import(__name__, {"keras": "syft.frameworks.keras"})
     __all__.append("keras")
 
 if dependency_check.torch_available:
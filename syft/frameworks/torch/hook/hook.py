@@ -309,9 +309,10 @@ class TorchHook(FrameworkHook):
         """
 
         tensor_type = self.torch.Tensor
+        additive_shared_attrs = set(dir(AdditiveSharingTensor))
         # Use a pre-defined list to select the methods to overload
         for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(AdditiveSharingTensor):
+            if attr not in additive_shared_attrs:
                 new_method = self._get_hooked_additive_shared_method(attr)
                 setattr(AdditiveSharingTensor, attr, new_method)
 
@@ -445,7 +446,10 @@ class TorchHook(FrameworkHook):
         torch_modules = syft.torch.torch_modules
 
         for module_name, torch_module in torch_modules.items():
-            for func in dir(torch_module):
+            # dir() is computed once, as it is slow for modules with many attributes
+            module_attrs = dir(torch_module)
+            module_attrs_set = set(module_attrs)
+            for func in module_attrs:
 
                 # Some functions we want to ignore (not override). Such functions have been hard
                 # coded into the torch_attribute exclude (see TorchAttribute class)
@@ -465,7 +469,7 @@ class TorchHook(FrameworkHook):
                     continue
 
                 # If we haven't already overloaded this function
-                if "native_" in func or f"native_{func}" in dir(torch_module):
+                if "native_" in func or f"native_{func}" in module_attrs_set:
                     continue
 
                 self._perform_function_overloading(module_name, torch_module, func)
@@ -45,8 +45,9 @@ backward_func = {
     PaillierTensor: lambda i, **kwargs: PaillierTensor().on(i, wrap=False),
 }
 
-# Methods or functions whose signature changes a lot and that we don't want to "cache", because
-# they have an arbitrary number of tensors in args which can trigger unexpected behaviour
+# Methods or functions whose signature changes a lot, because they have an arbitrary number of
+# tensors in args which can trigger unexpected behaviour. Their hook functions are cached by the
+# types of all the elements of their args
 ambiguous_methods = {
     "__getitem__",
     "__setitem__",
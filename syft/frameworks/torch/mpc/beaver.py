@@ -1,8 +1,118 @@
+from collections import defaultdict
+from collections import deque
+from contextlib import contextmanager
+import functools
 from typing import Callable
+import weakref
+
 import torch
 
 from syft.workers.abstract import AbstractWorker
 
+# The pools of the triples generated ahead of time by each crypto provider
+_triple_pools = weakref.WeakKeyDictionary()
+
+# The lists recording the triples requested, see record_triple_requests
+_triple_recorders = []
+
+
+class TriplePool:
+    """Multiplication triples generated ahead of time by a crypto provider.
+
+    The triples are already shared between the parties of the multiplications
+    they are meant for, and are stored by (equation, field, shapes, parties) so
+    that request_triple can use them without any interaction with the crypto
+    provider.
+    """
+
+    def __init__(self):
+        self._triples = defaultdict(deque)
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, key: tuple, triple: tuple):
+        """Adds a triple to the pool.
+
+        Args:
+            key: the key of the triple, see triple_key.
+            triple: the shared triple.
+        """
+        self._triples[key].append(triple)
+
+    def pop(self, key: tuple):
+        """Takes a triple out of the pool.
+
+        Args:
+            key: the key of the triple, see triple_key.
+
+        Returns:
+            A shared triple, or None if the pool has no triple for this key.
+        """
+        triples = self._triples.get(key)
+        if not triples:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        triple = triples.popleft()
+        if not triples:
+            del self._triples[key]
+        return triple
+
+    def clear(self):
+        """Removes all the triples from the pool."""
+        self._triples.clear()
+
+    def __len__(self):
+        return sum(len(triples) for triples in self._triples.values())
+
+    @property
+    def stats(self) -> dict:
+        """Returns the number of triples available, and the number of hits and misses."""
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+
+def triple_pool(crypto_provider: AbstractWorker) -> TriplePool:
+    """Returns the pool of the triples generated ahead of time by a crypto provider."""
+    if crypto_provider not in _triple_pools:
+        _triple_pools[crypto_provider] = TriplePool()
+    return _triple_pools[crypto_provider]
+
+
+def equation_key(cmd: Callable) -> object:
+    """Returns a key identifying the equation computed by cmd, parameters included.
+
+    Partials are identified by their function and arguments, and python functions
+    (lambdas included) by their code and the values they capture, so that two
+    equations only share a key if they compute the same thing. Other callables,
+    like torch.mul, are their own key.
+    """
+    if isinstance(cmd, functools.partial):
+        key = (equation_key(cmd.func), cmd.args, tuple(sorted(cmd.keywords.items())))
+    elif hasattr(cmd, "__code__"):
+        closure = tuple(cell.cell_contents for cell in cmd.__closure__ or ())
+        key = (cmd.__code__, cmd.__defaults__, closure)
+    else:
+        return cmd
+
+    try:
+        hash(key)
+    except TypeError:
+        # the parameters can't be compared, the equation only matches itself
+        return cmd
+    return key
+
+
+def triple_key(cmd: Callable, field: int, a_size: tuple, b_size: tuple, locations: list) -> tuple:
+    """Returns the key of the triples matching a multiplication in a TriplePool."""
+    return (
+        equation_key(cmd),
+        field,
+        tuple(a_size),
+        tuple(b_size),
+        tuple(location.id for location in locations),
+    )
+
 
 def request_triple(
     crypto_provider: AbstractWorker,
@@ -11,6 +121,78 @@ def request_triple(
     a_size: tuple,
     b_size: tuple,
     locations: list,
+):
+    """Returns a multiplication triple shared between all locations.
+
+    The triple is taken from the pool of the crypto provider if it has one for
+    this multiplication, otherwise it is generated on demand.
+
+    Args:
+        crypto_provider: worker you would like to request the triple from
+        cmd: An equation in einsum notation.
+        field: An integer representing the field size.
+        a_size: A tuple which is the size that a should be or
+                a torch.Size instance
+        b_size: A tuple which is the size that b should be or
+                a torch.Size intance
+        locations: A list of workers where the triple should be shared between.
+
+    Returns:
+        A triple of AdditiveSharedTensors such that c_shared = cmd(a_shared, b_shared).
+    """
+    for recorder in _triple_recorders:
+        recorder.append((crypto_provider, cmd, field, a_size, b_size, locations))
+
+    triple = triple_pool(crypto_provider).pop(triple_key(cmd, field, a_size, b_size, locations))
+    if triple is None:
+        triple = generate_triple(crypto_provider, cmd, field, a_size, b_size, locations)
+    return triple
+
+
+def request_triples(crypto_provider: AbstractWorker, specs: list, field: int, locations: list):
+    """Returns several multiplication triples shared between all locations.
+
+    The triples are taken from the pool of the crypto provider when it has them,
+    and the other ones are generated together, in a single sharing.
+
+    Args:
+        crypto_provider: worker you would like to request the triples from
+        specs: a list of (cmd, a_size, b_size) with, for each triple, the equation
+            and the sizes of a and b.
+        field: An integer representing the field size.
+        locations: A list of workers where the triples should be shared between.
+
+    Returns:
+        A list of triples of AdditiveSharedTensors such that
+        c_shared = cmd(a_shared, b_shared), in the order of specs.
+    """
+    pool = triple_pool(crypto_provider)
+    triples = []
+    missing = []
+    for cmd, a_size, b_size in specs:
+        for recorder in _triple_recorders:
+            recorder.append((crypto_provider, cmd, field, a_size, b_size, locations))
+
+        triple = pool.pop(triple_key(cmd, field, a_size, b_size, locations))
+        if triple is None:
+            missing.append(len(triples))
+        triples.append(triple)
+
+    if missing:
+        generated = generate_triples(crypto_provider, [specs[i] for i in missing], field, locations)
+        for i, triple in zip(missing, generated):
+            triples[i] = triple
+
+    return triples
+
+
+def generate_triple(
+    crypto_provider: AbstractWorker,
+    cmd: Callable,
+    field: int,
+    a_size: tuple,
+    b_size: tuple,
+    locations: list,
 ):
     """Generates a multiplication triple and sends it to all locations.
 
@@ -27,16 +209,114 @@ def request_triple(
     Returns:
         A triple of AdditiveSharedTensors such that c_shared = cmd(a_shared, b_shared).
     """
-    a = crypto_provider.remote.torch.randint(field, a_size)
-    b = crypto_provider.remote.torch.randint(field, b_size)
-    c = cmd(a, b)
+    return generate_triples(crypto_provider, [(cmd, a_size, b_size)], field, locations)[0]
 
-    res = torch.cat((a.view(-1), b.view(-1), c.view(-1)))
+
+def generate_triples(crypto_provider: AbstractWorker, specs: list, field: int, locations: list):
+    """Generates several multiplication triples and sends them to all locations
+    in a single sharing.
+
+    Args:
+        crypto_provider: worker you would like to request the triples from
+        specs: a list of (cmd, a_size, b_size) with, for each triple, the equation
+            and the sizes of a and b.
+        field: An integer representing the field size.
+        locations: A list of workers where the triples should be shared between.
+
+    Returns:
+        A list of triples of AdditiveSharedTensors such that
+        c_shared = cmd(a_shared, b_shared), in the order of specs.
+    """
+    tensors = []
+    for cmd, a_size, b_size in specs:
+        a = crypto_provider.remote.torch.randint(field, a_size)
+        b = crypto_provider.remote.torch.randint(field, b_size)
+        c = cmd(a, b)
+        tensors.append((a, b, c))
+
+    res = torch.cat([t.view(-1) for triple in tensors for t in triple])
 
     shares = res.share(*locations, field=field, crypto_provider=crypto_provider).get().child
 
-    a_shared = shares[: a.numel()].reshape(a_size)
-    b_shared = shares[a.numel() : -c.numel()].reshape(b_size)
-    c_shared = shares[-c.numel() :].reshape(c.shape)
+    triples = []
+    start = 0
+    for (cmd, a_size, b_size), (a, b, c) in zip(specs, tensors):
+        a_end = start + a.numel()
+        b_end = a_end + b.numel()
+        c_end = b_end + c.numel()
+        a_shared = shares[start:a_end].reshape(a_size)
+        b_shared = shares[a_end:b_end].reshape(b_size)
+        c_shared = shares[b_end:c_end].reshape(c.shape)
+        triples.append((a_shared, b_shared, c_shared))
+        start = c_end
+
+    return triples
+
+
+def prewarm_triples(
+    crypto_provider: AbstractWorker,
+    cmd: Callable,
+    field: int,
+    a_size: tuple,
+    b_size: tuple,
+    locations: list,
+    n: int = 1,
+):
+    """Generates triples ahead of time and adds them to the pool of the crypto provider.
+
+    The n triples are generated together, in a single sharing.
+
+    Args:
+        crypto_provider: the worker generating the triples
+        cmd: An equation in einsum notation.
+        field: An integer representing the field size.
+        a_size: the size of a
+        b_size: the size of b
+        locations: A list of workers where the triples should be shared between.
+        n: the number of triples to generate.
+    """
+    pool = triple_pool(crypto_provider)
+    key = triple_key(cmd, field, a_size, b_size, locations)
+    specs = [(cmd, a_size, b_size)] * n
+    for triple in generate_triples(crypto_provider, specs, field, locations):
+        pool.put(key, triple)
+
+
+@contextmanager
+def record_triple_requests():
+    """Records the triples requested within this context.
+
+    Yields:
+        The list of the arguments of the calls to request_triple, as tuples
+        (crypto_provider, cmd, field, a_size, b_size, locations).
+    """
+    requests = []
+    _triple_recorders.append(requests)
+    try:
+        yield requests
+    finally:
+        _triple_recorders.remove(requests)
+
+
+def prewarm_triples_from_plan(plan, *args, n: int = 1):
+    """Runs a plan on shared tensors and generates ahead of time the triples
+    needed to run it n more times.
+
+    The run records the multiplications of the plan, so the triples generated
+    match its layers shapes, equations and parties.
+
+    Args:
+        plan: the plan to run.
+        *args: the arguments of the plan.
+        n: the number of runs to generate triples for.
+
+    Returns:
+        The result of the run of the plan.
+    """
+    with record_triple_requests() as requests:
+        result = plan(*args)
+
+    for crypto_provider, cmd, field, a_size, b_size, locations in requests:
+        prewarm_triples(crypto_provider, cmd, field, a_size, b_size, locations, n=n)
 
-    return a_shared, b_shared, c_shared
+    return result
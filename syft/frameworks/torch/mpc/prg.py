@@ -0,0 +1,128 @@
+"""
+Pseudo-random generation of additive shares.
+
+Workers exchange pairwise seeds once. Two workers sharing a seed can then derive
+the same pseudo-random tensor locally from the seed and a public nonce, so that
+pseudo-random shares don't need to be sent. A nonce is issued by the worker asking
+for the shares, as its id and a counter, see BaseWorker.new_prg_nonce:
+    - when a worker shares a secret, the shares of all the owners but one are
+      derived from the seeds they share with it, and only the last share
+      (secret - sum of the other shares) is sent.
+    - shares of zero are built by the owners alone: each pair of owners derives
+      the same mask, which one adds to its share and the other subtracts.
+"""
+
+import hashlib
+import random
+from typing import List
+from typing import Tuple
+
+import numpy as np
+import torch
+
+import syft as sy
+
+_system_random = random.SystemRandom()
+
+
+def new_seed() -> int:
+    """Returns a random seed to share with another worker"""
+    return _system_random.getrandbits(63)
+
+
+def prg_tensor(
+    seed: int, nonce: Tuple, shape: tuple, field: int, dtype: torch.dtype
+) -> torch.Tensor:
+    """Derives a pseudo-random tensor of values in the field from a seed and a nonce.
+
+    The values are read from the SHAKE-256 stream of the seed and the nonce, which,
+    unlike torch.Generator, can't be predicted from the values already derived.
+
+    Args:
+        seed: the seed shared by the workers deriving the tensor.
+        nonce: a public (issuer id, counter) pair, which must be different for
+            each tensor derived from the same seed.
+        shape: the shape of the tensor.
+        field: the size of the field of the values, at most 2 ** 63.
+        dtype: the torch dtype of the tensor.
+
+    Returns:
+        A tensor of values in [-field/2, field/2)
+    """
+    n_values = torch.Size(shape).numel()
+    issuer_id, counter = nonce
+    stream = hashlib.shake_256(f"{seed}:{issuer_id}:{counter}".encode()).digest(8 * n_values)
+    values = torch.from_numpy(np.frombuffer(stream, dtype=np.int64).copy())
+
+    tensor = values.remainder(field) - field // 2
+    return tensor.reshape(shape).type(dtype)
+
+
+def zero_share(
+    seeds: List[Tuple[int, int]], nonce: Tuple, shape: tuple, field: int, dtype: torch.dtype
+) -> torch.Tensor:
+    """Derives a worker's share of a zero from the seeds it shares with the other workers.
+
+    Args:
+        seeds: a (seed, sign) pair for each of the other workers, where sign is 1
+            for one worker of the pair and -1 for the other one.
+        nonce: the nonce of the shares.
+        shape: the shape of the share.
+        field: the size of the field of the share.
+        dtype: the torch dtype of the share.
+
+    Returns:
+        The share of zero, in [0, field).
+    """
+    share = torch.zeros(shape, dtype=dtype)
+    for seed, sign in seeds:
+        mask = prg_tensor(seed, nonce, shape, field, dtype)
+        share = share + mask if sign > 0 else share - mask
+    return share % field
+
+
+def shares_of_zero(
+    owner: "sy.workers.BaseWorker",
+    shape: tuple,
+    field: int,
+    dtype: torch.dtype,
+    crypto_provider: "sy.workers.BaseWorker",
+    *workers,
+) -> "sy.AdditiveSharingTensor":
+    """Builds shares of zero without any tensor being sent.
+
+    The workers first share the seeds they don't share yet, then each worker
+    derives its share from the seeds it shares with the other workers, see
+    BaseWorker.prg_zero_share.
+
+    Args:
+        owner: the worker owning the pointers to the shares.
+        shape: the shape of the shares.
+        field: the size of the field of the shares.
+        dtype: the torch dtype of the shares.
+        crypto_provider: the crypto provider of the AdditiveSharingTensor returned.
+        *workers: the workers holding the shares.
+
+    Returns:
+        An AdditiveSharingTensor of value zero.
+    """
+    worker_ids = [worker.id for worker in workers]
+
+    # all the pairwise seeds are set up before any share is derived from them
+    for worker in workers[:-1]:
+        owner.send_msg(
+            owner.create_worker_command_message("share_prg_seeds", None, worker_ids), worker
+        )
+
+    nonce = owner.new_prg_nonce()
+    shares = {}
+    for worker in workers:
+        share = owner.send_worker_command(
+            worker, "prg_zero_share", worker_ids, nonce, shape, field, dtype
+        )
+        share.shape = torch.Size(shape)
+        shares[worker.id] = share
+
+    return sy.AdditiveSharingTensor(
+        shares=shares, owner=owner, field=field, crypto_provider=crypto_provider
+    )
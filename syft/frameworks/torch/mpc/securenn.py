@@ -8,6 +8,7 @@ negative numbers while they are always positive in the paper
 import math
 import torch
 import syft as sy
+from syft.frameworks.torch.mpc import prg
 from syft.generic.utils import memorize
 
 # p is introduced in the SecureNN paper https://eprint.iacr.org/2018/442.pdf
@@ -118,8 +119,16 @@ def _shares_of_zero(size, field, dtype, crypto_provider, *workers):
     """
     Return shares of zeros generated by a worker and sent to all workers,
     in the form of a MultiPointerTensor
+
+    If the local worker has prg_sharing set, the workers derive their shares
+    of zero from the seeds they share instead, and no tensor is sent.
     """
     torch_dtype = get_torch_dtype(field)
+    owner = sy.hook.local_worker
+    if owner.prg_sharing:
+        shape = (size,) if isinstance(size, int) else tuple(size)
+        return prg.shares_of_zero(owner, shape, field, torch_dtype, crypto_provider, *workers)
+
     u = (
         torch.zeros(size, dtype=torch_dtype)
         .send(workers[0])
@@ -564,6 +573,66 @@ def division(x_sh, y_sh, bit_len_max=None):
         return q
 
 
+def max_tournament(x_sh):
+    """ Compute the max value of each row of a 2D private tensor and its index in the row
+
+    The candidates of all the rows are compared at once, pairing adjacent columns:
+    each round halves the number of candidates, so rows of k values take
+    ceil(log2(k)) rounds of comparisons whatever the number of rows.
+    If several values of a row are equal to its max, the first one is selected.
+
+    The tournament itself works with any number of parties, the comparisons being
+    done with relu_deriv and select_share.
+
+    Args:
+        x_sh (AdditiveSharingTensor): the private tensor of shape (n_rows, k)
+
+    Returns:
+        maximum value of each row as an AdditiveSharingTensor of shape (n_rows,)
+        index of this value in its row as an AdditiveSharingTensor of shape (n_rows,)
+    """
+    assert (
+        x_sh.dtype != "custom"
+    ), "`custom` dtype shares are unsupported in SecureNN, use dtype = `long` or `int` instead"
+
+    workers = x_sh.locations
+    crypto_provider = x_sh.crypto_provider
+    L = x_sh.field
+    dtype = get_dtype(L)
+    torch_dtype = get_torch_dtype(L)
+
+    n_rows, k = x_sh.shape
+
+    max_sh = x_sh
+    ind_sh = (
+        torch.arange(k, dtype=torch_dtype)
+        .repeat(n_rows, 1)
+        .share(*workers, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap)
+    )
+
+    while k > 1:
+        n_pairs = k // 2
+        left = slice(0, 2 * n_pairs, 2)
+        right = slice(1, 2 * n_pairs, 2)
+
+        # 1)
+        beta_sh = relu_deriv(max_sh[:, left] - max_sh[:, right])
+
+        # 2)
+        next_max_sh = select_share(beta_sh, max_sh[:, right], max_sh[:, left])
+        next_ind_sh = select_share(beta_sh, ind_sh[:, right], ind_sh[:, left])
+
+        # 3) the last candidate of an odd number of candidates goes to the next round
+        if k % 2 == 1:
+            next_max_sh = torch.cat([next_max_sh.wrap(), max_sh[:, k - 1 :].wrap()], dim=1).child
+            next_ind_sh = torch.cat([next_ind_sh.wrap(), ind_sh[:, k - 1 :].wrap()], dim=1).child
+
+        max_sh, ind_sh = next_max_sh, next_ind_sh
+        k = n_pairs + k % 2
+
+    return max_sh.view(n_rows), ind_sh.view(n_rows)
+
+
 def maxpool(x_sh):
     """ Compute MaxPool: returns fresh shares of the max value in the input tensor
     and the index of this value in the flattened tensor
@@ -586,35 +655,13 @@ def maxpool(x_sh):
     L = x_sh.field
     dtype = get_dtype(L)
 
-    x_sh = x_sh.contiguous().view(-1)
+    x_sh = x_sh.contiguous().view(1, -1)
 
     # Common Randomness
     u_sh = _shares_of_zero(1, L, dtype, crypto_provider, alice, bob)
     v_sh = _shares_of_zero(1, L, dtype, crypto_provider, alice, bob)
 
-    # 1)
-    max_sh = x_sh[0]
-    ind_sh = torch.tensor([0]).share(
-        alice, bob, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap
-    )  # I did not manage to create an AST with 0 and 0 as shares
-
-    for i in range(1, len(x_sh)):
-        # 3)
-        w_sh = x_sh[i] - max_sh
-
-        # 4)
-        beta_sh = relu_deriv(w_sh)
-
-        # 5)
-        max_sh = select_share(beta_sh, max_sh, x_sh[i])
-
-        # 6)
-        k = torch.tensor([i]).share(
-            alice, bob, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap
-        )  # I did not manage to create an AST with 0 and i as shares
-
-        # 7)
-        ind_sh = select_share(beta_sh, ind_sh, k)
+    max_sh, ind_sh = max_tournament(x_sh)
 
     return max_sh + u_sh, ind_sh + v_sh
 
@@ -713,16 +760,11 @@ def maxpool2d(a_sh, kernel_size: int = 1, stride: int = 1, padding: int = 0):
         nb_rows_in += 2 * padding[0]
         nb_cols_in += 2 * padding[1]
 
-    res = []
-    # TODO: make this operation more efficient in order to be used with cnn modules.
-    for batch in range(batch_size):
-        for channel in range(nb_channels):
-            for r_in in range(0, nb_rows_in - (kernel[0] - 1), stride[0]):
-                for c_in in range(0, nb_cols_in - (kernel[1] - 1), stride[1]):
-                    m, _ = maxpool(
-                        a_sh[batch, channel, r_in : r_in + kernel[0], c_in : c_in + kernel[1]].child
-                    )
-                    res.append(m.wrap())
-
-    res = torch.stack(res).reshape(batch_size, nb_channels, nb_rows_out, nb_cols_out)
-    return res
+    # Gather the windows of all the planes at once, each worker unfolding its own
+    # shares, and take their max together
+    planes = a_sh.child.contiguous().view(batch_size * nb_channels, nb_rows_in, nb_cols_in)
+    windows_sh = planes.unfold(1, kernel[0], stride[0]).unfold(2, kernel[1], stride[1])
+    windows_sh = windows_sh.contiguous().view(-1, kernel[0] * kernel[1])
+    res, _ = max_tournament(windows_sh)
+
+    return res.view(batch_size, nb_channels, nb_rows_out, nb_cols_out).wrap()
@@ -1,17 +1,33 @@
+import functools
 from typing import Callable
+from typing import List
+import threading
 
 import torch
 
 import syft as sy
-from syft.frameworks.torch.mpc.beaver import request_triple
+from syft.frameworks.torch.mpc.beaver import request_triples
+from syft.workers import tracing
 from syft.workers.abstract import AbstractWorker
 
 no_wrap = {"no_wrap": True}
 
+# The _Runner running the current thread, if any, see run_in_rounds
+_local = threading.local()
+
+# The _Runner threads waiting for a function to run, at most MAX_IDLE_RUNNERS of
+# them are kept for the next calls of run_in_rounds
+MAX_IDLE_RUNNERS = 16
+_idle_runners = []
+_idle_runners_lock = threading.Lock()
+
 
 def spdz_mul(cmd: Callable, x_sh, y_sh, crypto_provider: AbstractWorker, field: int):
     """Abstractly multiplies two tensors (mul or matmul)
 
+    When called from a function run by run_in_rounds, the multiplication is done
+    together with the multiplications of the other functions.
+
     Args:
         cmd: a callable of the equation to be computed (mul or matmul)
         x_sh (AdditiveSharingTensor): the left part of the operation
@@ -25,28 +41,268 @@ def spdz_mul(cmd: Callable, x_sh, y_sh, crypto_provider: AbstractWorker, field:
     assert isinstance(x_sh, sy.AdditiveSharingTensor)
     assert isinstance(y_sh, sy.AdditiveSharingTensor)
 
-    locations = x_sh.locations
+    runner = getattr(_local, "runner", None)
+    if runner is not None:
+        return runner.multiply(cmd, x_sh, y_sh, crypto_provider, field)
+
+    return spdz_mul_batch([(cmd, x_sh, y_sh)], crypto_provider, field)[0]
+
+
+def spdz_mul_batch(multiplications: List[tuple], crypto_provider: AbstractWorker, field: int):
+    """Abstractly multiplies several pairs of tensors, with a single request of
+    triples, all the deltas and epsilons being opened together with a single
+    open_shares message (see AdditiveSharingTensor.reconstruct_all).
+
+    Args:
+        multiplications: a list of (cmd, x_sh, y_sh), shared between the same
+            workers, see spdz_mul.
+        crypto_provider (AbstractWorker): an AbstractWorker which is used to generate triples
+        field (int): an integer denoting the size of the field
+
+    Return:
+        a list of AdditiveSharingTensors, the products in the order of multiplications
+    """
+    locations = multiplications[0][1].locations
 
     # Get triples
-    a, b, a_mul_b = request_triple(crypto_provider, cmd, field, x_sh.shape, y_sh.shape, locations)
+    triples = request_triples(
+        crypto_provider,
+        [(cmd, x_sh.shape, y_sh.shape) for cmd, x_sh, y_sh in multiplications],
+        field,
+        locations,
+    )
 
-    delta = x_sh - a
-    epsilon = y_sh - b
+    deltas = [x_sh - a for (_, x_sh, _), (a, _, _) in zip(multiplications, triples)]
+    epsilons = [y_sh - b for (_, _, y_sh), (_, b, _) in zip(multiplications, triples)]
     # Reconstruct and send to all workers
-    delta = delta.reconstruct()
-    epsilon = epsilon.reconstruct()
+    opened = sy.AdditiveSharingTensor.reconstruct_all(*deltas, *epsilons)
+    deltas, epsilons = opened[: len(deltas)], opened[len(deltas) :]
+
+    products = []
+    for (cmd, _, _), (a, b, a_mul_b), delta, epsilon in zip(
+        multiplications, triples, deltas, epsilons
+    ):
+        delta_epsilon = cmd(delta, epsilon)
+
+        # Trick to keep only one child in the MultiPointerTensor (like in SNN)
+        j1 = torch.ones(delta_epsilon.shape).long().send(locations[0], **no_wrap)
+        j0 = torch.zeros(delta_epsilon.shape).long().send(*locations[1:], **no_wrap)
+        if len(locations) == 2:
+            j = sy.MultiPointerTensor(children=[j1, j0])
+        else:
+            j = sy.MultiPointerTensor(children=[j1] + list(j0.child.values()))
+
+        delta_b = cmd(delta, b)
+        a_epsilon = cmd(a, epsilon)
+
+        products.append(delta_epsilon * j + delta_b + a_epsilon + a_mul_b)
+
+    return products
+
+
+class _Runner(threading.Thread):
+    """A thread running the functions of run_in_rounds, which hands over to the
+    calling thread at each secure multiplication.
+
+    Only one of the runner threads and the calling thread runs at a time, so the
+    functions run as if they were called one after the other. Threads are used
+    as coroutines because the multiplications are made deep in the call stack of
+    the functions, from the hooked torch methods of the shared tensors: with
+    generators, every function between run_in_rounds and spdz_mul would have to
+    yield, and python has no stackful coroutines without extra dependencies.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.function = None
+        self.result = None
+        self.error = None
+        self.done = True
+        # The (cmd, x_sh, y_sh, crypto_provider, field) multiplication waiting
+        self.multiplication = None
+        self.product = None
+        self._resume = threading.Event()
+        self._paused = threading.Event()
+
+    def run(self):
+        _local.runner = self
+        while True:
+            self._wait_resume()
+            if self.function is None:
+                # stopped, see stop
+                break
+            try:
+                self.result = self.function()
+            except BaseException as e:
+                self.error = e
+            self.function = None
+            self.done = True
+            self._paused.set()
+
+    def _wait_resume(self):
+        self._resume.wait()
+        self._resume.clear()
+
+    @property
+    def reusable(self) -> bool:
+        """Whether the runner can run another function: it isn't running one and
+        its thread is idle or not started yet."""
+        return self.done and (self.is_alive() or self.ident is None)
+
+    def stop(self):
+        """Ends the thread of an idle runner."""
+        self.function = None
+        self._resume.set()
+
+    def start_function(self, function: Callable):
+        self.function = function
+        self.result = self.error = None
+        self.done = False
+        if not self.is_alive():
+            self.start()
+
+    def step(self):
+        """Runs the function until it ends or waits for a multiplication."""
+        self._resume.set()
+        self._paused.wait()
+        self._paused.clear()
+
+    def multiply(self, cmd, x_sh, y_sh, crypto_provider, field):
+        self.multiplication = (cmd, x_sh, y_sh, crypto_provider, field)
+        self._paused.set()
+        self._wait_resume()
+
+        product, self.product = self.product, None
+        if isinstance(product, Exception):
+            raise product
+        return product
+
+
+def _acquire_runners(n: int) -> List[_Runner]:
+    with _idle_runners_lock:
+        runners = _idle_runners[:n]
+        del _idle_runners[:n]
+    return runners + [_Runner() for _ in range(n - len(runners))]
+
+
+def _release_runners(runners: List[_Runner]):
+    """Keeps the idle runners for the next calls of run_in_rounds, up to
+    MAX_IDLE_RUNNERS, and stops and joins the others."""
+    reusable = [runner for runner in runners if runner.reusable]
+    with _idle_runners_lock:
+        n_kept = max(0, MAX_IDLE_RUNNERS - len(_idle_runners))
+        _idle_runners.extend(reusable[:n_kept])
+    kept = set(reusable[:n_kept])
+
+    for runner in runners:
+        if runner in kept or runner.ident is None:
+            continue
+        if runner.is_alive():
+            runner.stop()
+        runner.join()
+
+
+def run_in_rounds(functions: List[Callable]) -> list:
+    """Runs functions which are independent of each other, such that their secure
+    multiplications are done together.
+
+    The functions run one after the other until each one ends or needs the product
+    of a secure multiplication. Then the multiplications waiting, grouped by crypto
+    provider, field and workers, are done with a single request of triples and
+    their deltas and epsilons reconstructed together (see spdz_mul_batch), and the
+    functions resume. The number of rounds is the largest number of multiplications
+    done in a row by one of the functions, rather than the total number of
+    multiplications.
+
+    Args:
+        functions: functions without arguments, none of which uses the results of
+            the others.
+
+    Returns:
+        The list of the results of the functions.
+    """
+    if len(functions) <= 1:
+        return [function() for function in functions]
+
+    # the functions are run in the state of the calling thread
+    in_calling_thread_state = _calling_thread_state()
+
+    runners = _acquire_runners(len(functions))
+    try:
+        for runner, function in zip(runners, functions):
+            runner.start_function(functools.partial(in_calling_thread_state, function))
+
+        waiting = runners
+        while waiting:
+            for runner in waiting:
+                runner.step()
+            waiting = [runner for runner in runners if not runner.done]
+            _multiply_waiting(waiting)
+    finally:
+        # resume the functions still waiting, which then fail, if the products
+        # couldn't be computed
+        for runner in runners:
+            while not runner.done and runner.is_alive():
+                runner.product = RuntimeError("The secure multiplications failed")
+                runner.step()
+        _release_runners(runners)
+
+    for runner in runners:
+        if runner.error is not None:
+            raise runner.error
+    return [runner.result for runner in runners]
+
+
+def _calling_thread_state() -> Callable:
+    """Captures the state of the calling thread which the functions of run_in_rounds
+    must see: its trace, its grad mode, and the workers simplifying a message
+    in-process (see VirtualWorker.serializer).
+
+    The message metrics need no state, as MessageMetrics.summary sums the metrics
+    of all the threads.
+
+    Returns:
+        A function which runs a function in this state.
+    """
+    trace_id, span_id = tracing.current_context()
+    grad_enabled = torch.is_grad_enabled()
+    local_worker = sy.local_worker
+    workers = [local_worker] + list(local_worker._known_workers.values())
+    in_process_workers = [
+        worker
+        for worker in workers
+        if getattr(getattr(worker, "_in_process_serialization", None), "enabled", False)
+    ]
+
+    def run(function: Callable):
+        previously_enabled = [
+            getattr(worker._in_process_serialization, "enabled", False)
+            for worker in in_process_workers
+        ]
+        for worker in in_process_workers:
+            worker._in_process_serialization.enabled = True
+        try:
+            with tracing.context(trace_id, span_id), torch.set_grad_enabled(grad_enabled):
+                return function()
+        finally:
+            for worker, enabled in zip(in_process_workers, previously_enabled):
+                worker._in_process_serialization.enabled = enabled
 
-    delta_epsilon = cmd(delta, epsilon)
+    return run
 
-    # Trick to keep only one child in the MultiPointerTensor (like in SNN)
-    j1 = torch.ones(delta_epsilon.shape).long().send(locations[0], **no_wrap)
-    j0 = torch.zeros(delta_epsilon.shape).long().send(*locations[1:], **no_wrap)
-    if len(locations) == 2:
-        j = sy.MultiPointerTensor(children=[j1, j0])
-    else:
-        j = sy.MultiPointerTensor(children=[j1] + list(j0.child.values()))
 
-    delta_b = cmd(delta, b)
-    a_epsilon = cmd(a, epsilon)
+def _multiply_waiting(runners: List[_Runner]):
+    """Computes the products of the multiplications waiting in the runners."""
+    groups = {}
+    for runner in runners:
+        cmd, x_sh, y_sh, crypto_provider, field = runner.multiplication
+        key = (id(crypto_provider), field, tuple(location.id for location in x_sh.locations))
+        groups.setdefault(key, (crypto_provider, field, []))[2].append(runner)
 
-    return delta_epsilon * j + delta_b + a_epsilon + a_mul_b
+    for crypto_provider, field, group in groups.values():
+        products = spdz_mul_batch(
+            [runner.multiplication[:3] for runner in group], crypto_provider, field
+        )
+        for runner, product in zip(group, products):
+            runner.multiplication = None
+            runner.product = product
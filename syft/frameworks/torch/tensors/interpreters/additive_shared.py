@@ -4,6 +4,7 @@ import torch
 import syft as sy
 from syft.frameworks.torch.mpc import spdz
 from syft.frameworks.torch.mpc import securenn
+from syft.frameworks.torch.mpc import prg
 from syft.generic.tensor import AbstractTensor
 from syft.generic.frameworks.hook import hook_args
 from syft.generic.frameworks.overload import overloaded
@@ -156,10 +157,20 @@ class AdditiveSharingTensor(AbstractTensor):
             else:
                 shares.append(share)
 
-        res_field = sum(shares) % self.field
+        return self.combine_shares(shares, self.field)
 
-        gate = res_field.native_gt(self.field / 2).long()
-        neg_nums = (res_field - self.field) * gate
+    @staticmethod
+    def combine_shares(shares, field):
+        """Sums shares in the field and returns the signed value they represent
+
+        Args:
+            shares: the shares of all the shareholders.
+            field: the size of the field of the shares.
+        """
+        res_field = sum(shares) % field
+
+        gate = res_field.native_gt(field / 2).long()
+        neg_nums = (res_field - field) * gate
         pos_nums = res_field * (1 - gate)
         result = neg_nums + pos_nums
 
@@ -175,14 +186,7 @@ class AdditiveSharingTensor(AbstractTensor):
             share = v.location._objects[v.id_at_location]
             shares.append(share)
 
-        res_field = sum(shares) % self.field
-
-        gate = res_field.native_gt(self.field / 2).long()
-        neg_nums = (res_field - self.field) * gate
-        pos_nums = res_field * (1 - gate)
-        result = neg_nums + pos_nums
-
-        return result
+        return self.combine_shares(shares, self.field)
 
     def init_shares(self, *owners):
         """Initializes shares and distributes them amongst their respective owners
@@ -191,6 +195,9 @@ class AdditiveSharingTensor(AbstractTensor):
             *owners the list of shareholders. Can be of any length.
 
             """
+        if getattr(self.owner, "prg_sharing", False):
+            return self._init_prg_shares(*owners)
+
         shares = self.generate_shares(
             self.child, n_workers=len(owners), field=self.field, random_type=torch.LongTensor
         )
@@ -203,6 +210,51 @@ class AdditiveSharingTensor(AbstractTensor):
         self.child = shares_dict
         return self
 
+    def _init_prg_shares(self, *owners):
+        """Initializes shares from the seeds shared with the shareholders.
+
+        The shares of all the shareholders but the last one are derived from the
+        seeds they share with the owner of this tensor, so only the last share is
+        sent.
+
+        Args:
+            *owners the list of shareholders. Can be of any length.
+        """
+        secret = self.child
+        if not isinstance(secret, torch.LongTensor):
+            secret = secret.type(torch.LongTensor)
+
+        shares_dict = {}
+        last_share = secret
+        for owner in owners[:-1]:
+            owner = self.owner.get_worker(owner)
+            self.owner.share_prg_seed(owner)
+            nonce = self.owner.new_prg_nonce()
+
+            share = prg.prg_tensor(
+                self.owner._prg_seeds[owner.id], nonce, secret.shape, self.field, torch.int64
+            )
+            last_share = last_share - share
+
+            share_ptr = self.owner.send_worker_command(
+                owner,
+                "prg_share",
+                self.owner.id,
+                nonce,
+                tuple(secret.shape),
+                self.field,
+                torch.int64,
+            )
+            share_ptr.shape = secret.shape
+            shares_dict[share_ptr.location.id] = share_ptr
+
+        last_share %= self.field
+        share_ptr = last_share.send(owners[-1], **no_wrap)
+        shares_dict[share_ptr.location.id] = share_ptr
+
+        self.child = shares_dict
+        return self
+
     @staticmethod
     def generate_shares(secret, n_workers, field, random_type):
         """The cryptographic method for generating shares given a secret tensor.
@@ -245,16 +297,65 @@ class AdditiveSharingTensor(AbstractTensor):
         Returns:
             A MultiPointerTensor where all workers hold the reconstructed value
         """
-        workers = self.locations
+        return AdditiveSharingTensor.reconstruct_all(self)[0]
+
+    @staticmethod
+    def reconstruct_all(*tensors):
+        """
+        Reconstruct several AdditiveSharingTensors remotely in a single round,
+        without their owner being able to see any sensitive value
+
+        The first location requests the shares of all the tensors from each other
+        shareholder in a single message, which is only answered if it is allowed
+        to get the shares, combines them with its own shares and sends the
+        reconstructed values to the other shareholders in a single message, see
+        BaseWorker.open_shares. The owner only sends one message, whatever the
+        number of tensors.
+
+        Args:
+            *tensors: AdditiveSharingTensors shared between the same workers.
+
+        Returns:
+            A list with, for each tensor, a MultiPointerTensor where all workers
+            hold its reconstructed value
+        """
+        owner = tensors[0].owner
+        workers = tensors[0].locations
+        worker_ids = [worker.id for worker in workers]
+
+        for tensor in tensors[1:]:
+            if set(tensor.child.keys()) != set(worker_ids):
+                raise ValueError(
+                    "Tensors reconstructed together must be shared between the same workers"
+                )
 
-        ptr_to_sh = self.wrap().send(workers[0], **no_wrap)
-        pointer = ptr_to_sh.remote_get()
+        share_ids = {
+            worker_id: [tensor.child[worker_id].id_at_location for tensor in tensors]
+            for worker_id in worker_ids
+        }
+        fields = [tensor.field for tensor in tensors]
+        result_ids = [sy.ID_PROVIDER.pop() for _ in tensors]
 
-        pointers = [pointer]
-        for worker in workers[1:]:
-            pointers.append(pointer.copy().move(worker))
+        owner.send_msg(
+            owner.create_worker_command_message("open_shares", None, share_ids, fields, result_ids),
+            workers[0],
+        )
+
+        reconstructed = []
+        for tensor, result_id in zip(tensors, result_ids):
+            pointers = [
+                sy.PointerTensor(
+                    location=worker,
+                    id_at_location=result_id,
+                    owner=owner,
+                    id=sy.ID_PROVIDER.pop(),
+                    shape=tensor.child[worker.id]._shape,
+                )
+                for worker in workers
+            ]
+            reconstructed.append(sy.MultiPointerTensor(children=pointers))
 
-        return sy.MultiPointerTensor(children=pointers)
+        return reconstructed
 
     def zero(self, shape=None):
         """
@@ -885,6 +986,9 @@ class AdditiveSharingTensor(AbstractTensor):
         """
         Return the maximum value of an additive shared tensor
 
+        The values are compared with a tournament, see securenn.max_tournament,
+        which takes a logarithmic number of rounds in the size of the dimension.
+
         Args:
             dim (None or int): if not None, the dimension on which
                 the comparison should be done
@@ -896,30 +1000,26 @@ class AdditiveSharingTensor(AbstractTensor):
             the maximum value (possibly across an axis)
             and optionally the index of the maximum value (possibly across an axis)
         """
-        values = self
         n_dim = self.dim()
 
         # Make checks and transformation
         assert dim is None or (0 <= dim < n_dim), f"Dim overflow  0 <= {dim} < {n_dim}"
-        # FIXME make it cleaner and robust for more options
-        if n_dim == 2:
-            if dim == None:
-                values = values.view(-1)
-            elif dim == 1:
-                values = values.t()
-        assert n_dim <= 2, "Max on tensor with len(shape) > 2 is not supported."
-
-        # Init max vals and idx to the first element
-        max_value = values[0]
-        max_index = torch.tensor([0]).share(
-            *self.locations, field=self.field, crypto_provider=self.crypto_provider, **no_wrap
-        )
-
-        for i in range(1, len(values)):
-            a = values[i]
-            beta = a >= max_value
-            max_index = max_index + beta * (-max_index + i)  # TODO i - max_index doesn't work
-            max_value = max_value + beta * (a - max_value)
+        if dim is None:
+            values = self.contiguous().view(1, -1)
+            shape = ()
+        else:
+            values = self.transpose(dim, n_dim - 1).contiguous()
+            shape = tuple(values.shape[:-1])
+            values = values.view(-1, values.shape[-1])
+
+        max_value, max_index = securenn.max_tournament(values)
+        if shape:
+            max_value = max_value.view(*shape)
+            max_index = max_index.view(*shape)
+        else:
+            # a single max is a scalar, like with torch.max
+            max_value = max_value[0]
+            max_index = max_index[0]
 
         if dim is None and return_idx is False:
             return max_value
@@ -95,10 +95,12 @@ class FrameworkHook(ABC):
         Args:
             tensor_type: the tensor_type which holds the methods
         """
+        # dir() is computed once, as it is slow for types with many attributes
+        tensor_type_attrs = set(dir(tensor_type))
         # Use a pre-defined list to select the methods to overload
         for attr in self.to_auto_overload[tensor_type]:
             # if we haven't already overloaded this function
-            if f"native_{attr}" not in dir(tensor_type):
+            if f"native_{attr}" not in tensor_type_attrs:
                 native_method = getattr(tensor_type, attr)
                 setattr(tensor_type, f"native_{attr}", native_method)
                 new_method = self._get_hooked_method(tensor_type, attr)
@@ -191,6 +193,7 @@ class FrameworkHook(ABC):
         to_overload = self.boolean_comparators.copy()
 
         native_pattern = re.compile("native*")
+        base_attrs = set(dir(object))
 
         for attr in dir(tensor_type):
 
@@ -202,7 +205,7 @@ class FrameworkHook(ABC):
                 continue
 
             lit = getattr(tensor_type, attr)
-            is_base = attr in dir(object)
+            is_base = attr in base_attrs
             is_desc = inspect.ismethoddescriptor(lit)
             is_func = isinstance(lit, types.FunctionType)
             is_overloaded = native_pattern.match(attr) is not None
@@ -224,9 +227,10 @@ class FrameworkHook(ABC):
             syft_type: the syft_type which holds the methods
         """
 
+        syft_type_attrs = set(dir(syft_type))
         # Use a pre-defined list to select the methods to overload
         for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(syft_type):
+            if attr not in syft_type_attrs:
                 new_method = self._get_hooked_syft_method(attr)
                 setattr(syft_type, attr, new_method)
 
@@ -236,9 +240,10 @@ class FrameworkHook(ABC):
         comparators to the hooking
         """
 
+        syft_type_attrs = set(dir(syft_type))
         # Use a pre-defined list to select the methods to overload
         for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(syft_type) or attr in self.boolean_comparators:
+            if attr not in syft_type_attrs or attr in self.boolean_comparators:
                 new_method = self._get_hooked_syft_method(attr)
                 setattr(syft_type, attr, new_method)
 
@@ -248,9 +253,10 @@ class FrameworkHook(ABC):
         Private Tensor: It'll add references to its parents and save
         command/actions history.
         """
+        syft_type_attrs = set(dir(syft_type))
         # Use a pre-defined list to select the methods to overload
         for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(syft_type):
+            if attr not in syft_type_attrs:
                 new_method = self._get_hooked_private_method(attr)
                 setattr(syft_type, attr, new_method)
 
@@ -262,9 +268,10 @@ class FrameworkHook(ABC):
         is pointing at.
         """
 
+        pointer_attrs = set(dir(PointerTensor))
         # Use a pre-defined list to select the methods to overload
         for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(PointerTensor) or attr in self.boolean_comparators:
+            if attr not in pointer_attrs or attr in self.boolean_comparators:
                 new_method = self._get_hooked_pointer_method(attr)
                 setattr(PointerTensor, attr, new_method)
 
@@ -289,9 +296,10 @@ class FrameworkHook(ABC):
         location it is pointing at.
         """
 
+        multi_pointer_attrs = set(dir(MultiPointerTensor))
         # Use a pre-defined list to select the methods to overload
         for attr in self.to_auto_overload[tensor_type]:
-            if attr not in dir(MultiPointerTensor):
+            if attr not in multi_pointer_attrs:
                 new_method = self._get_hooked_multi_pointer_method(attr)
                 setattr(MultiPointerTensor, attr, new_method)
 
@@ -386,10 +394,49 @@ class FrameworkHook(ABC):
         Return:
             the hooked method
         """
+        native_method_name = f"native_{method_name}"
+        # The unbound native method of each type of tensor, resolved on its first call.
+        # It is None for the types where it isn't a plain method and must be got on self.
+        native_methods = {}
+
+        def resolve_native_method(self_type):
+            static_method = inspect.getattr_static(self_type, native_method_name, None)
+            if isinstance(static_method, (staticmethod, classmethod, property)):
+                method = None
+            else:
+                method = getattr(self_type, native_method_name)
+            native_methods[self_type] = method
+            return method
 
-        @tracer(method_name=method_name)
         @wraps(getattr(tensor_type, method_name))
         def overloaded_native_method(self, *args, **kwargs):
+            """
+            Run the native method directly for native tensors when no action is
+            being traced, or operate the hooking
+            """
+            trace = syft.hook.trace
+            if (
+                (trace.active and trace.out_of_action)
+                or hasattr(self, "child")
+                or (len(args) > 0 and hasattr(args[0], "child"))
+            ):
+                return hooked_method(self, *args, **kwargs)
+
+            try:
+                method = native_methods[type(self)]
+            except KeyError:
+                method = resolve_native_method(type(self))
+
+            try:
+                if method is None:
+                    return getattr(self, native_method_name)(*args, **kwargs)
+                return method(self, *args, **kwargs)
+            except BaseException as e:
+                # we can make some errors more descriptive with this method
+                raise route_method_exception(e, self, args, kwargs)
+
+        @tracer(method_name=method_name)
+        def hooked_method(self, *args, **kwargs):
             """
             Operate the hooking
             """
@@ -408,7 +455,7 @@ class FrameworkHook(ABC):
                         args = [args[0]]
                         return overloaded_native_method(self, *args, **kwargs)
 
-                method = getattr(self, f"native_{method_name}")
+                method = getattr(self, native_method_name)
                 # Run the native function with the new args
 
                 try:
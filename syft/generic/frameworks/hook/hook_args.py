@@ -45,11 +45,15 @@ backward_func = {
     "my_syft_tensor_type": lambda i, **kwargs: "my_syft_tensor_type(**kwargs).on(i, wrap=False)"
 }
 
-# Methods or functions whose signature changes a lot and that we don't want to "cache", because
-# they have an arbitrary number of tensors in args which can trigger unexpected behaviour
+# Methods or functions whose signature changes a lot, because they have an arbitrary number of
+# tensors in args which can trigger unexpected behaviour. Their hook functions are cached by the
+# types of all the elements of their args, see args_signature
 ambiguous_methods = set()
 ambiguous_functions = {"run"}
 
+# The number of signatures for which the hook functions of a method or function are cached
+MAX_CACHED_SIGNATURES = 16
+
 
 ### Registration logic ###
 def register_type_rule(new_type_rules: Dict):
@@ -100,8 +104,9 @@ def unwrap_args_from_method(attr, method_self, args, kwargs):
     hook_method_args_functions. However, sometimes a method (an attr) has multiple
     different argument signatures, such that sometimes arguments have .child objects
     and other times they don't (such as x.div(), which can accept either a tensor or a
-    float as an argument). This invalidates the cache, so we need to have a try/except
-    which refreshes the cache if the signature triggers an error.
+    float as an argument). So the functions are cached for each signature of the
+    arguments (see args_signature), and we have a try/except which refreshes the cache
+    if the signature still triggers an error.
 
     Args:
         attr (str): the name of the method being called
@@ -113,18 +118,17 @@ def unwrap_args_from_method(attr, method_self, args, kwargs):
     # Specify an id to distinguish methods from different classes
     # As they won't be used with the same arg types
     attr_id = type(method_self).__name__ + "." + attr
+    signature = args_signature(args, deep=attr in ambiguous_methods)
     try:
-        assert attr not in ambiguous_methods
-
         # Load the utility function to transform the args
-        hook_args = hook_method_args_functions[attr_id]
+        hook_args = hook_method_args_functions[attr_id][signature]
         # Try running it
         new_self, new_args = hook_args((method_self, args))
 
     except (IndexError, KeyError, AssertionError):  # Update the function in case of an error
         args_hook_function, _ = build_unwrap_args_from_function((method_self, args))
         # Store this utility function in the registry
-        hook_method_args_functions[attr_id] = args_hook_function
+        cache_hook_function(hook_method_args_functions, attr_id, signature, args_hook_function)
         # Run it
         new_self, new_args = args_hook_function((method_self, args))
 
@@ -147,12 +151,12 @@ def unwrap_args_from_function(attr, args, kwargs, return_args_type=False):
         - the type of this new child
         (- the type of the tensors in the arguments)
     """
+    signature = args_signature(args, deep=attr in ambiguous_functions)
     try:
-        assert attr not in ambiguous_functions
         # Load the utility function to transform the args
         # TODO rename registry or use another one than for methods
-        hook_args = hook_method_args_functions[attr]
-        get_tensor_type_function = get_tensor_type_functions[attr]
+        hook_args = hook_method_args_functions[attr][signature]
+        get_tensor_type_function = get_tensor_type_functions[attr][signature]
         # Try running it
         new_args = hook_args(args)
 
@@ -161,8 +165,8 @@ def unwrap_args_from_function(attr, args, kwargs, return_args_type=False):
             args, return_tuple=True
         )
         # Store the utility functions in registries
-        hook_method_args_functions[attr] = args_hook_function
-        get_tensor_type_functions[attr] = get_tensor_type_function
+        cache_hook_function(hook_method_args_functions, attr, signature, args_hook_function)
+        cache_hook_function(get_tensor_type_functions, attr, signature, get_tensor_type_function)
         # Run it
         new_args = args_hook_function(args)
 
@@ -174,6 +178,44 @@ def unwrap_args_from_function(attr, args, kwargs, return_args_type=False):
         return new_args, kwargs, new_type
 
 
+def args_signature(args, deep: bool = False) -> tuple:
+    """
+    Return the signature of the args object, for which the hook functions built
+    are cached: the types of its elements. With deep, the types of the elements of
+    the lists and tuples it holds are included too, so that the signature fully
+    determines the rule built by build_rule.
+
+    Args which are not a list or a tuple, like a single tensor, have their type
+    as signature.
+
+    Example:
+        in: ([tensor(1, 2), Pointer@bob], 42)
+        out: (list, int)
+        out (deep): ((list, (Tensor, PointerTensor)), int)
+    """
+    if not isinstance(args, (list, tuple)):
+        return type(args)
+    if not deep:
+        return tuple(map(type, args))
+    return tuple(
+        (type(a), args_signature(a, deep=True)) if isinstance(a, (list, tuple)) else type(a)
+        for a in args
+    )
+
+
+def cache_hook_function(registry: Dict, attr_id: str, signature: tuple, function: Callable):
+    """
+    Store a hook function built for a signature of attr_id in a registry, which
+    keeps the functions of up to MAX_CACHED_SIGNATURES signatures per attr_id by
+    forgetting the oldest ones.
+    """
+    functions = registry.setdefault(attr_id, {})
+    if signature not in functions:
+        while functions and len(functions) >= MAX_CACHED_SIGNATURES:
+            del functions[next(iter(functions))]
+    functions[signature] = function
+
+
 def build_unwrap_args_from_function(args, return_tuple=False):
     """
     Build the function f that hook the arguments:
@@ -203,8 +245,9 @@ def hook_response(attr, response, wrap_type, wrap_args={}, new_self=None):
     To make this efficient, we cache which elements of the response (which can be more
     complicated with nested tuples for example) need to be wrapped in a dictionary called
     hook_method_response_functions. However, sometimes a method (an attr) has multiple
-    different response signatures. This invalidates the cache, so we need to have a
-    try/except which refreshes the cache if the signature triggers an error.
+    different response signatures. So the functions are cached for each signature of
+    the response (see args_signature), and we have a try/except which refreshes the
+    cache if the signature still triggers an error.
 
     Args:
         attr (str): the name of the method being called
@@ -229,18 +272,19 @@ def hook_response(attr, response, wrap_type, wrap_args={}, new_self=None):
     hash_wrap_args = hash(frozenset(wrap_args.items()))
     attr_id = f"{attr}@{wrap_type.__name__}.{response_is_tuple}.{hash_wrap_args}"
 
+    signature = args_signature(response, deep=attr in ambiguous_functions)
     try:
-        assert attr not in ambiguous_functions
-
         # Load the utility function to transform the args
-        response_hook_function = hook_method_response_functions[attr_id]
+        response_hook_function = hook_method_response_functions[attr_id][signature]
         # Try running it
         new_response = response_hook_function(response)
 
     except (IndexError, KeyError, AssertionError):  # Update the function in case of an error
         response_hook_function = build_wrap_reponse_from_function(response, wrap_type, wrap_args)
         # Store this utility function in the registry
-        hook_method_response_functions[attr_id] = response_hook_function
+        cache_hook_function(
+            hook_method_response_functions, attr_id, signature, response_hook_function
+        )
         # Run it
         new_response = response_hook_function(response)
 
@@ -638,8 +682,9 @@ def register_response(
     complicated with nested tuples for example) in the dict register_response_functions
 
     However, sometimes a function  (an attr) has multiple different response signatures.
-    This invalidates the cache, so we need to have a try/except which refreshes the
-    cache if the signature triggers an error.
+    So the functions are cached for each signature of the response (see args_signature),
+    and we have a try/except which refreshes the cache if the signature still triggers
+    an error.
 
     Args:
         attr (str): the name of the function being called
@@ -655,20 +700,22 @@ def register_response(
         response = (response, 1)
 
     attr_id = f"{attr}"
+    signature = args_signature(
+        response, deep=attr in ambiguous_functions or attr in ambiguous_methods
+    )
 
     try:
-        assert attr not in ambiguous_functions
-        assert attr not in ambiguous_methods
-
         # Load the utility function to register the response and transform tensors with pointers
-        register_response_function = register_response_functions[attr_id]
+        register_response_function = register_response_functions[attr_id][signature]
         # Try running it
         new_response = register_response_function(response, response_ids=response_ids, owner=owner)
 
     except (IndexError, KeyError, AssertionError):  # Update the function in cas of an error
         register_response_function = build_register_response_function(response)
         # Store this utility function in the registry
-        register_response_functions[attr_id] = register_response_function
+        cache_hook_function(
+            register_response_functions, attr_id, signature, register_response_function
+        )
         # Run it
         new_response = register_response_function(response, response_ids=response_ids, owner=owner)
 
@@ -82,3 +82,68 @@ class IdProvider:
             self.record_ids = False
             self.recorded_ids = list()
         return ret_val
+
+
+class CounterIdProvider(IdProvider):
+    """Provides ids made of a random prefix and a counter, without storing them.
+
+    The ids are 63-bit integers: a random prefix of PREFIX_BITS bits drawn by the
+    provider, followed by a counter of COUNTER_BITS bits. They are unique for a
+    provider without any memory per id, and different providers draw different
+    prefixes with high probability. As a prefix is never 0, these ids don't collide
+    with the ids of create_random_id, which are lower than 2 ** COUNTER_BITS.
+
+    To use it instead of the default IdProvider: sy.ID_PROVIDER = CounterIdProvider()
+
+    As the ids generated are not stored, set_next_ids only checks the given ids
+    against the ids generated by the counter, and not against the ids given before.
+    """
+
+    PREFIX_BITS = 24
+    COUNTER_BITS = 39
+
+    def __init__(self, given_ids=None):
+        super().__init__(given_ids)
+        self._new_prefix()
+
+    def _new_prefix(self):
+        self.prefix = random.randrange(1, 2 ** self.PREFIX_BITS)
+        self.counter = 0
+        self._base_id = self.prefix << self.COUNTER_BITS
+
+    def pop(self, *args) -> int:
+        """Provides the given ids if any, and ids made of the prefix and the counter otherwise.
+
+        Returns:
+            Id.
+        """
+        if len(self.given_ids):
+            new_id = self.given_ids.pop(-1)
+        else:
+            if self.counter >> self.COUNTER_BITS:
+                # the counter overflowed
+                self._new_prefix()
+            new_id = self._base_id | self.counter
+            self.counter += 1
+        if self.record_ids:
+            self.recorded_ids.append(new_id)
+
+        return new_id
+
+    def is_generated(self, id_) -> bool:
+        """Returns whether an id was generated by the counter of this provider."""
+        return (
+            isinstance(id_, int)
+            and id_ >> self.COUNTER_BITS == self.prefix
+            and id_ & (2 ** self.COUNTER_BITS - 1) < self.counter
+        )
+
+    def set_next_ids(self, given_ids: List, check_ids: bool = True):
+        """Sets the next ids returned by the id provider, see IdProvider.set_next_ids."""
+        if check_ids:
+            intersect = {id_ for id_ in given_ids if self.is_generated(id_)}
+            if len(intersect) > 0:
+                message = f"Provided IDs {intersect} are contained in already generated IDs"
+                raise exceptions.IdNotUniqueError(message)
+
+        self.given_ids += given_ids
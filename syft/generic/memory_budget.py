@@ -0,0 +1,281 @@
+"""
+Memory budget of the tensors of an ObjectStorage.
+
+When the tensors stored exceed the budget, the least recently (or least
+frequently) used ones are spilled: their data is written to a file on local
+disk and replaced by a memory-mapped view of this file, so that the operating
+system can drop it from memory. Spilled tensors stay usable as they are, and
+ObjectStorage.get_obj loads them back in memory before returning them.
+
+Only PyTorch tensors are spilled for now, the other objects are always resident.
+"""
+from collections import OrderedDict
+import heapq
+import itertools
+import os
+import shutil
+import tempfile
+import time
+from typing import Union
+import weakref
+
+import numpy
+
+from syft import dependency_check
+
+if dependency_check.torch_available:
+    import torch
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+class MemoryBudget:
+    """Keeps the tensors of an ObjectStorage resident in memory under a number of bytes.
+
+    Only plain CPU tensors are accounted for and spilled. Tensors with tags, such
+    as the tensors of datasets, and tensors pinned with pin are always resident.
+
+    Args:
+        max_bytes: the number of bytes of the resident tensors over which tensors
+            are spilled.
+        spill_dir: the directory of the files of the spilled tensors. By default, a
+            temporary directory created on the first spill, and removed by clear()
+            and when the budget is garbage collected.
+        eviction: "lru" to spill the least recently used tensors first, or "lfu"
+            to spill the least frequently used ones first.
+    """
+
+    def __init__(self, max_bytes: int, spill_dir: str = None, eviction: str = "lru"):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"eviction should be one of {EVICTION_POLICIES}, not {eviction}")
+
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        # Removes the temporary spill directory when called or when the budget is
+        # garbage collected, None when spill_dir was given or isn't created yet
+        self._remove_spill_dir = None
+        self.eviction = eviction
+        self.pinned = set()
+
+        # The tensors resident in memory which may be spilled, by id, ordered from
+        # the least recently used
+        self._resident = OrderedDict()
+        # The tensors resident in memory which are never spilled (pinned, tagged, or
+        # which numpy can't write to disk), by id
+        self._held = {}
+        self._uses = {}
+        # With lfu eviction, a heap of (uses, order, id) of the tensors which may be
+        # spilled. Entries whose uses are out of date are skipped when popped.
+        self._lfu_heap = []
+        self._lfu_order = itertools.count()
+        # The spilled tensors and their file, by id
+        self._spilled = {}
+        # The tensors which numpy can't write to disk
+        self._unspillable = set()
+        self._file_ids = itertools.count()
+
+        self.resident_bytes = 0
+        self.spilled_bytes = 0
+        self.faults = 0
+        self.fault_time = 0.0
+
+    def pin(self, obj_id: Union[str, int]):
+        """Keeps an object resident in memory, loading it back if it is spilled."""
+        self.pinned.add(obj_id)
+        if obj_id in self._spilled:
+            self._fault(self._spilled[obj_id][0])
+        if obj_id in self._resident:
+            self._held[obj_id] = self._resident.pop(obj_id)
+
+    def unpin(self, obj_id: Union[str, int]):
+        """Allows a pinned object to be spilled again."""
+        self.pinned.discard(obj_id)
+        if obj_id in self._held and self._may_spill(self._held[obj_id]):
+            self._make_evictable(self._held.pop(obj_id))
+            self._evict(keep=obj_id)
+
+    def track(self, obj: object):
+        """Accounts for an object added to the storage, and spills tensors if over budget."""
+        self.forget(obj.id)
+        if not _is_plain_tensor(obj):
+            return
+
+        self._uses[obj.id] = 1
+        self.resident_bytes += _nbytes(obj)
+        if self._may_spill(obj):
+            self._make_evictable(obj)
+        else:
+            self._held[obj.id] = obj
+        self._evict(keep=obj.id)
+
+    def touch(self, obj: object):
+        """Records a use of an object of the storage, and loads it back in memory if spilled."""
+        obj_id = getattr(obj, "id", None)
+        if obj_id in self._spilled:
+            self._fault(obj)
+        elif obj_id in self._resident:
+            self._uses[obj_id] += 1
+            self._make_evictable(obj)
+        elif obj_id in self._held:
+            self._uses[obj_id] += 1
+            return
+        else:
+            return
+
+        self._evict(keep=obj_id)
+
+    def forget(self, obj_id: Union[str, int]):
+        """Stops accounting for an object removed from the storage."""
+        if obj_id in self._resident:
+            self.resident_bytes -= _nbytes(self._resident.pop(obj_id))
+        elif obj_id in self._held:
+            self.resident_bytes -= _nbytes(self._held.pop(obj_id))
+        elif obj_id in self._spilled:
+            obj, path = self._spilled.pop(obj_id)
+            self.spilled_bytes -= _nbytes(obj)
+            _remove_file(path)
+        self._uses.pop(obj_id, None)
+        self._unspillable.discard(obj_id)
+
+    def clear(self):
+        """Stops accounting for all the objects of the storage."""
+        for obj_id in list(self._resident) + list(self._held) + list(self._spilled):
+            self.forget(obj_id)
+        self._lfu_heap = []
+
+        if self._remove_spill_dir is not None:
+            self._remove_spill_dir()
+            self._remove_spill_dir = None
+            self.spill_dir = None
+
+    @property
+    def stats(self) -> dict:
+        """Returns the bytes of the tensors resident in memory and spilled to disk, the
+        number of spilled tensors loaded back, and the time taken to load them back."""
+        return {
+            "resident_bytes": self.resident_bytes,
+            "spilled_bytes": self.spilled_bytes,
+            "faults": self.faults,
+            "fault_time": self.fault_time,
+            "mean_fault_time": self.fault_time / self.faults if self.faults else 0.0,
+        }
+
+    def _may_spill(self, obj: object) -> bool:
+        return obj.id not in self.pinned and obj.id not in self._unspillable and not obj.tags
+
+    def _make_evictable(self, obj: object):
+        """Marks a resident tensor as the most recently used one which may be spilled."""
+        self._resident[obj.id] = obj
+        self._resident.move_to_end(obj.id)
+        if self.eviction == "lfu":
+            if len(self._lfu_heap) > 2 * len(self._resident) + 64:
+                # drop the out of date entries
+                self._lfu_heap = [
+                    entry
+                    for entry in self._lfu_heap
+                    if entry[2] in self._resident and entry[0] == self._uses[entry[2]]
+                ]
+                heapq.heapify(self._lfu_heap)
+            heapq.heappush(self._lfu_heap, (self._uses[obj.id], next(self._lfu_order), obj.id))
+
+    def _next_victim(self, keep: Union[str, int]):
+        """Returns the id of the next tensor to spill other than keep, or None."""
+        if self.eviction == "lfu":
+            kept = None
+            victim = None
+            while self._lfu_heap:
+                entry = heapq.heappop(self._lfu_heap)
+                uses, _, obj_id = entry
+                if obj_id not in self._resident or uses != self._uses[obj_id]:
+                    continue
+                if obj_id == keep:
+                    kept = entry
+                    continue
+                victim = obj_id
+                break
+            if kept is not None:
+                heapq.heappush(self._lfu_heap, kept)
+            return victim
+
+        # keep is the most recently used tensor, at the end of _resident
+        for obj_id in self._resident:
+            return obj_id if obj_id != keep else None
+        return None
+
+    def _evict(self, keep: Union[str, int]):
+        """Spills tensors until the resident tensors fit in the budget, except keep."""
+        while self.resident_bytes > self.max_bytes:
+            obj_id = self._next_victim(keep)
+            if obj_id is None:
+                return
+
+            obj = self._resident[obj_id]
+            if obj.tags:
+                # the tensor was tagged after being stored
+                self._held[obj_id] = self._resident.pop(obj_id)
+            else:
+                self._spill(obj_id)
+
+    def _spill(self, obj_id: Union[str, int]):
+        obj = self._resident.pop(obj_id)
+        try:
+            array = obj.native_data.contiguous().numpy()
+        except TypeError:
+            # numpy doesn't support the dtype of this tensor
+            self._unspillable.add(obj_id)
+            self._held[obj_id] = obj
+            return
+
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="syft-spill-")
+            self._remove_spill_dir = weakref.finalize(
+                self, shutil.rmtree, self.spill_dir, ignore_errors=True
+            )
+
+        path = os.path.join(self.spill_dir, f"{next(self._file_ids)}.spill")
+        mapped = numpy.memmap(path, dtype=array.dtype, mode="w+", shape=array.shape)
+        mapped[...] = array
+        mapped.flush()
+        obj.native_data = torch.from_numpy(mapped)
+
+        self._spilled[obj_id] = (obj, path)
+        self.resident_bytes -= _nbytes(obj)
+        self.spilled_bytes += _nbytes(obj)
+
+    def _fault(self, obj: object):
+        t0 = time.time()
+        _, path = self._spilled.pop(obj.id)
+        obj.native_data = obj.native_data.clone()
+        _remove_file(path)
+
+        self._uses[obj.id] += 1
+        self.spilled_bytes -= _nbytes(obj)
+        self.resident_bytes += _nbytes(obj)
+        if self._may_spill(obj):
+            self._make_evictable(obj)
+        else:
+            self._held[obj.id] = obj
+        self.faults += 1
+        self.fault_time += time.time() - t0
+
+
+def _is_plain_tensor(obj: object) -> bool:
+    return (
+        dependency_check.torch_available
+        and isinstance(obj, torch.Tensor)
+        and not hasattr(obj, "child")
+        and obj.device.type == "cpu"
+        and obj.layout == torch.strided
+        and obj.numel() > 0
+    )
+
+
+def _nbytes(tensor: torch.Tensor) -> int:
+    return tensor.numel() * tensor.element_size()
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
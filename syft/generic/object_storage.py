@@ -20,6 +20,9 @@ class ObjectStorage:
         self._objects = {}
         # This is an index to retrieve objects from their tags in an efficient way
         self._tag_to_object_ids = defaultdict(set)
+        # When set, the tensors stored over this budget are spilled to disk, see
+        # syft.generic.memory_budget.MemoryBudget
+        self.memory_budget = None
 
     def register_obj(self, obj: object, obj_id: Union[str, int] = None):
         """Registers the specified object with the current worker node.
@@ -73,6 +76,9 @@ class ObjectStorage:
             else:
                 raise e
 
+        if self.memory_budget is not None:
+            self.memory_budget.touch(obj)
+
         return obj
 
     def set_obj(self, obj: Union[FrameworkTensorType, AbstractTensor]) -> None:
@@ -82,6 +88,8 @@ class ObjectStorage:
             obj: A torch or syft tensor with an id.
         """
         self._objects[obj.id] = obj
+        if self.memory_budget is not None:
+            self.memory_budget.track(obj)
         # Add entry in the tag index
         if obj.tags:
             for tag in obj.tags:
@@ -112,6 +120,8 @@ class ObjectStorage:
                 obj.child.garbage_collect_data = True
 
             del self._objects[remote_key]
+            if self.memory_budget is not None:
+                self.memory_budget.forget(remote_key)
 
     def force_rm_obj(self, remote_key: Union[str, int]):
         self.rm_obj(remote_key, force=True)
@@ -129,8 +139,19 @@ class ObjectStorage:
 
         """
         self._objects.clear()
+        if self.memory_budget is not None:
+            self.memory_budget.clear()
         return self if return_self else None
 
+    def pin_obj(self, obj_id: Union[str, int]):
+        """Keeps an object resident in memory when the storage has a memory budget.
+
+        Args:
+            obj_id: A string or integer id of the object.
+        """
+        if self.memory_budget is not None:
+            self.memory_budget.pin(obj_id)
+
     def current_objects(self):
         """Returns a copy of the objects in the object storage."""
         return self._objects.copy()
@@ -5,7 +5,6 @@ import syft as sy
 from syft.generic.frameworks.hook import hook_args
 from syft.generic.pointers.object_pointer import ObjectPointer
 from syft.generic.frameworks.types import FrameworkTensor
-from syft.messaging.message import ForceObjectDeleteMessage
 from syft.workers.abstract import AbstractWorker
 
 
@@ -267,4 +266,4 @@ class PointerPlan(ObjectPointer):
         """
         if self.garbage_collect_data:
             for id_at_location, location in zip(self._ids_at_location, self._locations):
-                self.owner.send_msg(ForceObjectDeleteMessage(id_at_location), location)
+                self.owner.garbage_collect_remote(id_at_location, location)
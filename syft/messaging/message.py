@@ -202,6 +202,73 @@ class TensorCommandMessage(Message):
         return TensorCommandMessage(detailed_action)
 
 
+class BatchCommandMessage(Message):
+    """Send several actions to a worker in a single message
+
+    Remote operations on pointers generate many small TensorCommandMessages. When
+    their results are not needed right away, the actions can be buffered and sent
+    together with this message type, so that they only cost a single round-trip.
+    The worker executes the actions in order and returns all their results.
+
+    As an action may use the results of the previous ones, which don't exist yet
+    when the message is received, the actions are only detailed by the worker right
+    before executing each of them.
+    """
+
+    def __init__(self, actions: List[ComputationAction], simplified: bool = False):
+        """Initialize the message.
+
+        Args:
+            actions (List[ComputationAction]): the actions to execute, in order.
+            simplified (bool): whether the actions are still in their simplified form,
+                which is the case of the messages received.
+        """
+
+        self.actions = actions
+        self.simplified = simplified
+
+    def __str__(self):
+        """Return a human readable version of this message"""
+        return f"({type(self).__name__} {self.actions})"
+
+    @staticmethod
+    def simplify(worker: AbstractWorker, msg: "BatchCommandMessage") -> tuple:
+        """
+        This function takes the attributes of a BatchCommandMessage and saves them in a tuple
+        Args:
+            worker (AbstractWorker): a reference to the worker doing the serialization
+            msg (BatchCommandMessage): a Message
+        Returns:
+            tuple: a tuple holding the unique attributes of the message
+        Examples:
+            data = simplify(msg)
+        """
+        if msg.simplified:
+            return (tuple(msg.actions),)
+        return (
+            tuple(sy.serde.msgpack.serde._simplify(worker, action) for action in msg.actions),
+        )
+
+    @staticmethod
+    def detail(worker: AbstractWorker, msg_tuple: tuple) -> "BatchCommandMessage":
+        """
+        This function takes the simplified tuple version of this message and converts
+        it into a BatchCommandMessage. The simplify() method runs the inverse of this method.
+
+        The actions are left simplified, see BaseWorker.execute_batch_command.
+
+        Args:
+            worker (AbstractWorker): a reference to the worker necessary for detailing. Read
+                syft/serde/serde.py for more information on why this is necessary.
+            msg_tuple (Tuple): the raw information being detailed.
+        Returns:
+            msg (BatchCommandMessage): a BatchCommandMessage.
+        Examples:
+            message = detail(sy.local_worker, msg_tuple)
+        """
+        return BatchCommandMessage(list(msg_tuple[0]), simplified=True)
+
+
 class ObjectMessage(Message):
     """Send an object to another worker using this message type.
 
@@ -499,6 +566,61 @@ class ForceObjectDeleteMessage(Message):
         return ForceObjectDeleteMessage(sy.serde.msgpack.serde._detail(worker, msg_tuple[0]))
 
 
+class ForceObjectDeleteBatchMessage(Message):
+    """Garbage collect several remote objects at once
+
+    When the deletions of remote objects are deferred by their owner (see
+    BaseWorker.deferred_gc), the ids of the objects to delete are queued and sent
+    together with this message type, instead of one ForceObjectDeleteMessage each.
+    """
+
+    def __init__(self, obj_ids: List[Union[str, int]]):
+        """Initialize the message.
+
+        Args:
+            obj_ids (List[Union[str, int]]): the ids of the objects to delete.
+        """
+
+        self.object_ids = obj_ids
+
+    def __str__(self):
+        """Return a human readable version of this message"""
+        return f"({type(self).__name__} {self.object_ids})"
+
+    @staticmethod
+    def simplify(worker: AbstractWorker, msg: "ForceObjectDeleteBatchMessage") -> tuple:
+        """
+        This function takes the attributes of a Message and saves them in a tuple.
+        The detail() method runs the inverse of this method.
+        Args:
+            worker (AbstractWorker): a reference to the worker doing the serialization
+            msg (Message): a Message
+        Returns:
+            tuple: a tuple holding the unique attributes of the message
+        Examples:
+            data = simplify(msg)
+        """
+        return (sy.serde.msgpack.serde._simplify(worker, msg.object_ids),)
+
+    @staticmethod
+    def detail(worker: AbstractWorker, msg_tuple: tuple) -> "ForceObjectDeleteBatchMessage":
+        """
+        This function takes the simplified tuple version of this message and converts
+        it into an ForceObjectDeleteBatchMessage. The simplify() method runs the inverse
+        of this method.
+
+        Args:
+            worker (AbstractWorker): a reference to the worker necessary for detailing. Read
+                syft/serde/serde.py for more information on why this is necessary.
+            msg_tuple (Tuple): the raw information being detailed.
+        Returns:
+            msg (ForceObjectDeleteBatchMessage): a ForceObjectDeleteBatchMessage.
+        Examples:
+            message = detail(sy.local_worker, msg_tuple)
+        """
+        return ForceObjectDeleteBatchMessage(sy.serde.msgpack.serde._detail(worker, msg_tuple[0]))
+
+
 class SearchMessage(Message):
     """A client queries for a subset of the tensors on a remote worker using this type
 
@@ -676,3 +798,62 @@ class WorkerCommandMessage(Message):
             sy.serde.msgpack.serde._detail(worker, command_name),
             sy.serde.msgpack.serde._detail(worker, message),
         )
+
+
+class TracedMessage(Message):
+    """Carries a message along with the trace context of the worker sending it.
+
+    Workers tracing their messages (see syft.workers.tracing) send them wrapped in
+    this message type, so that the spans recorded by the receiving worker while
+    executing the message are attached to the span of the sender.
+    """
+
+    def __init__(self, trace_id: int, parent_id: int, message: Message):
+        """Initialize the message.
+
+        Args:
+            trace_id (int): the id of the trace the message belongs to.
+            parent_id (int): the id of the span of the sender sending the message.
+            message (Message): the message carried.
+        """
+
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.message = message
+
+    def __str__(self):
+        """Return a human readable version of this message"""
+        return f"({type(self).__name__} {(self.trace_id, self.parent_id)} {self.message})"
+
+    @property
+    def contents(self):
+        """Returns the contents of the message carried."""
+        return self.message.contents
+
+    @staticmethod
+    def simplify(worker: AbstractWorker, msg: "TracedMessage") -> tuple:
+        """
+        This function takes the attributes of a TracedMessage and saves them in a tuple
+        Args:
+            worker (AbstractWorker): a reference to the worker doing the serialization
+            msg (TracedMessage): a Message
+        Returns:
+            tuple: a tuple holding the unique attributes of the message
+        """
+        return (msg.trace_id, msg.parent_id, sy.serde.msgpack.serde._simplify(worker, msg.message))
+
+    @staticmethod
+    def detail(worker: AbstractWorker, msg_tuple: tuple) -> "TracedMessage":
+        """
+        This function takes the simplified tuple version of this message and converts
+        it into a TracedMessage. The simplify() method runs the inverse of this method.
+
+        Args:
+            worker (AbstractWorker): a reference to the worker necessary for detailing. Read
+                syft/serde/serde.py for more information on why this is necessary.
+            msg_tuple (Tuple): the raw information being detailed.
+        Returns:
+            msg (TracedMessage): a TracedMessage.
+        """
+        trace_id, parent_id, message = msg_tuple
+        return TracedMessage(trace_id, parent_id, sy.serde.msgpack.serde._detail(worker, message))
@@ -1 +1,5 @@
+from syft.common.lazy_import import lazy_import
 from syft.serde.serde import *
+
+# The protobuf serde is imported on its first access, as most workers only use msgpack
+lazy_import(__name__, {"protobuf": "syft.serde.protobuf"})
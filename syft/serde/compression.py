@@ -2,7 +2,12 @@
 This file exists to provide one common place for all compression methods used in
 simplifying and serializing PySyft objects.
 """
+import threading
+import time
 import zlib
+from typing import Callable
+from typing import Dict
+
 import lz4
 from lz4 import (  # noqa: F401
     frame,
@@ -34,18 +39,20 @@ def _apply_compress_scheme(decompressed_input_bin) -> tuple:
     return apply_lz4_compression(decompressed_input_bin)
 
 
-def apply_zlib_compression(uncompressed_input_bin) -> tuple:
+def apply_zlib_compression(uncompressed_input_bin, level: int = -1) -> tuple:
     """
     Apply zlib compression to the input
 
     Args:
         decompressed_input_bin: the binary to be compressed
+        level: the zlib compression level, from 0 (none) to 9 (best).
+            The default level of zlib is used by default.
 
     Returns:
         a tuple (compressed_result, ZLIB)
     """
 
-    return zlib.compress(uncompressed_input_bin), ZLIB
+    return zlib.compress(uncompressed_input_bin, level), ZLIB
 
 
 def apply_lz4_compression(decompressed_input_bin) -> tuple:
@@ -75,19 +82,125 @@ def apply_no_compression(decompressed_input_bin) -> tuple:
     return decompressed_input_bin, NO_COMPRESSION
 
 
-def _compress(decompressed_input_bin: bin) -> bin:
+## SECTION: Compression policy
+
+
+class CompressionPolicy:
+    """Decides how each binary is compressed, and records compression statistics.
+
+    Binaries smaller than min_size are not compressed. For larger binaries, a
+    prefix of sample_size bytes is compressed first to estimate how compressible
+    they are, and they are not compressed if the prefix doesn't shrink below
+    max_sample_ratio of its size (which is typical of random shares). Binaries
+    whose compressed form isn't smaller are sent uncompressed.
+
+    The compression scheme is _apply_compress_scheme unless the type of the
+    serialized object has an override.
+
+    Args:
+        min_size: the size in bytes below which binaries are not compressed.
+        sample_size: the size in bytes of the prefix compressed to estimate
+            compressibility. Binaries up to this size are compressed as a whole.
+        max_sample_ratio: the compression ratio (compressed size over size) of the
+            prefix above which binaries are not compressed.
+        overrides: compression functions, like apply_zlib_compression, by type of
+            serialized object.
     """
-    This function compresses a binary using the function _apply_compress_scheme
-    if the input has been already compressed in some step, it will return it as it is
+
+    def __init__(
+        self,
+        min_size: int = 128,
+        sample_size: int = 4096,
+        max_sample_ratio: float = 0.9,
+        overrides: Dict[type, Callable[[bin], tuple]] = None,
+    ):
+        self.min_size = min_size
+        self.sample_size = sample_size
+        self.max_sample_ratio = max_sample_ratio
+        self.overrides = overrides if overrides is not None else {}
+        self._stats = {}
+        # binaries may be compressed by several threads, see WebsocketServerWorker
+        self._stats_lock = threading.Lock()
+
+    def compress(self, decompressed_input_bin: bin, obj_type: type = None) -> tuple:
+        """Compresses a binary following this policy.
+
+        Args:
+            decompressed_input_bin: the binary to be compressed
+            obj_type: the type of the object serialized in the binary, if known
+
+        Returns:
+            a tuple (compressed_result, scheme)
+        """
+        t0 = time.time()
+        apply_compression = self.overrides.get(obj_type, _apply_compress_scheme)
+
+        if len(decompressed_input_bin) < self.min_size:
+            result = apply_no_compression(decompressed_input_bin)
+        elif len(decompressed_input_bin) > self.sample_size and not self._is_compressible(
+            decompressed_input_bin, apply_compression
+        ):
+            result = apply_no_compression(decompressed_input_bin)
+        else:
+            result = apply_compression(decompressed_input_bin)
+            if len(result[0]) >= len(decompressed_input_bin):
+                result = apply_no_compression(decompressed_input_bin)
+
+        self._record(result[1], len(decompressed_input_bin), len(result[0]), time.time() - t0)
+        return result
+
+    def _is_compressible(self, decompressed_input_bin: bin, apply_compression: Callable) -> bool:
+        sample = decompressed_input_bin[: self.sample_size]
+        compressed_sample, _ = apply_compression(sample)
+        return len(compressed_sample) < self.max_sample_ratio * len(sample)
+
+    def _record(self, scheme: int, bytes_in: int, bytes_out: int, duration: float):
+        with self._stats_lock:
+            stats = self._stats.setdefault(
+                scheme, {"count": 0, "bytes_in": 0, "bytes_out": 0, "time": 0.0}
+            )
+            stats["count"] += 1
+            stats["bytes_in"] += bytes_in
+            stats["bytes_out"] += bytes_out
+            stats["time"] += duration
+
+    @property
+    def stats(self) -> dict:
+        """Returns, by compression scheme, the number of binaries, the bytes before and
+        after compression, the time spent, and the compression ratio (bytes out over
+        bytes in)."""
+        return {
+            scheme: dict(
+                stats, ratio=stats["bytes_out"] / stats["bytes_in"] if stats["bytes_in"] else 1.0
+            )
+            for scheme, stats in self._stats.items()
+        }
+
+    def reset_stats(self):
+        """Clears the compression statistics."""
+        self._stats = {}
+
+
+def _compress(
+    decompressed_input_bin: bin, policy: CompressionPolicy = None, obj_type: type = None
+) -> bin:
+    """
+    This function compresses a binary using the function _apply_compress_scheme,
+    or following a compression policy if one is given
 
     Args:
         decompressed_input_bin (bin): binary to be compressed
+        policy (CompressionPolicy): the compression policy, if any
+        obj_type (type): the type of the object serialized in the binary, if known
 
     Returns:
         bin: a compressed binary
 
     """
-    compress_stream, compress_scheme = _apply_compress_scheme(decompressed_input_bin)
+    if policy is None:
+        compress_stream, compress_scheme = _apply_compress_scheme(decompressed_input_bin)
+    else:
+        compress_stream, compress_scheme = policy.compress(decompressed_input_bin, obj_type)
     try:
         z = scheme_to_bytes[compress_scheme] + compress_stream
         return z
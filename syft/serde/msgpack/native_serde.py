@@ -45,9 +45,14 @@ def _simplify_collection(
     # Step 0: initialize empty list
     pieces = list()
 
-    # Step 1: serialize each part of the collection
+    # Step 1: serialize each part of the collection. The parts which are
+    # simple python objects are kept as they are, without calling _simplify
+    simplifier_cache = serde._simplifier_cache
     for part in my_collection:
-        pieces.append(serde._simplify(worker, part))
+        if simplifier_cache.get(type(part), True) is None:
+            pieces.append(part)
+        else:
+            pieces.append(serde._simplify(worker, part))
 
     # Step 2: return serialization as tuple of simplified items
     return tuple(pieces)
@@ -78,10 +83,12 @@ def _detail_collection_list(
 
     pieces = list()
 
-    # Step 1: deserialize each part of the collection
+    # Step 1: deserialize each part of the collection. The parts which are
+    # not simplified objects are kept as they are, without calling _detail
     for part in my_collection:
-        detailed = serde._detail(worker, part)
-        pieces.append(detailed)
+        if type(part) in (list, tuple):
+            part = serde._detail(worker, part)
+        pieces.append(part)
 
     return pieces
 
@@ -111,10 +118,12 @@ def _detail_collection_set(
 
     pieces = list()
 
-    # Step 1: deserialize each part of the collection
+    # Step 1: deserialize each part of the collection. The parts which are
+    # not simplified objects are kept as they are, without calling _detail
     for part in my_collection:
-        detailed = serde._detail(worker, part)
-        pieces.append(detailed)
+        if type(part) in (list, tuple):
+            part = serde._detail(worker, part)
+        pieces.append(part)
     return set(pieces)
 
 
@@ -145,9 +154,12 @@ def _detail_collection_tuple(
 
     pieces = list()
 
-    # Step 1: deserialize each part of the collection
+    # Step 1: deserialize each part of the collection. The parts which are
+    # not simplified objects are kept as they are, without calling _detail
     for part in my_tuple:
-        pieces.append(serde._detail(worker, part))
+        if type(part) in (list, tuple):
+            part = serde._detail(worker, part)
+        pieces.append(part)
 
     return tuple(pieces)
 
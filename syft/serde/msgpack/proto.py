@@ -18,6 +18,16 @@ from syft.exceptions import UndefinedProtocolTypePropertyError
 if proto_info is None:
     raise InvalidProtocolFileError("Failed to load syft protocol data")
 
+# Types only serialized with msgpack between PySyft workers, which are not part of
+# `proto.json` nor of the Protobuf serde (see syft.serde.protobuf.proto). Their codes
+# are taken above the range used by `proto.json` so that they can't clash with
+# upstream constants. They are moved to `proto.json` once syft-proto defines them.
+MSGPACK_ONLY_TYPES = {
+    "syft.messaging.message.BatchCommandMessage": {"code": 100},
+    "syft.messaging.message.ForceObjectDeleteBatchMessage": {"code": 101},
+    "syft.messaging.message.TracedMessage": {"code": 102},
+}
+
 
 class TypeInfo:
     """Convenience wrapper for type info defined in `proto_info`.
@@ -67,5 +77,7 @@ def proto_type_info(cls):
 
     if type_name in proto_info["TYPES"]:
         return TypeInfo(name=type_name, obj=proto_info["TYPES"][type_name])
+    elif type_name in MSGPACK_ONLY_TYPES:
+        return TypeInfo(name=type_name, obj=MSGPACK_ONLY_TYPES[type_name])
     else:
         raise UndefinedProtocolTypeError(f"{type_name} is not defined in the protocol file")
@@ -60,14 +60,17 @@ from syft.execution.computation import ComputationAction
 from syft.execution.communication import CommunicationAction
 from syft.execution.protocol import Protocol
 from syft.messaging.message import TensorCommandMessage
+from syft.messaging.message import BatchCommandMessage
 from syft.messaging.message import ObjectMessage
 from syft.messaging.message import ObjectRequestMessage
 from syft.messaging.message import IsNoneMessage
 from syft.messaging.message import GetShapeMessage
 from syft.messaging.message import ForceObjectDeleteMessage
+from syft.messaging.message import ForceObjectDeleteBatchMessage
 from syft.messaging.message import SearchMessage
 from syft.messaging.message import PlanCommandMessage
 from syft.messaging.message import WorkerCommandMessage
+from syft.messaging.message import TracedMessage
 from syft.serde import compression
 from syft.serde.msgpack.native_serde import MAP_NATIVE_SIMPLIFIERS_AND_DETAILERS
 from syft.workers.abstract import AbstractWorker
@@ -125,14 +128,17 @@ OBJ_SIMPLIFIER_AND_DETAILERS = [
     BaseWorker,
     AutogradTensor,
     TensorCommandMessage,
+    BatchCommandMessage,
     ObjectMessage,
     ObjectRequestMessage,
     IsNoneMessage,
     GetShapeMessage,
     ForceObjectDeleteMessage,
+    ForceObjectDeleteBatchMessage,
     SearchMessage,
     PlanCommandMessage,
     WorkerCommandMessage,
+    TracedMessage,
     GradFunc,
     String,
     BaseDataset,
@@ -251,6 +257,10 @@ no_simplifiers_found, no_full_simplifiers_found = set(), set()
 # Store types that use simplifiers from their ancestors so we
 # can look them up quickly during serialization.
 inherited_simplifiers_found = OrderedDict()
+# The simplifier resolved for each type seen during serialization, or None
+# for types which are not simplified, see _simplify. This only caches the
+# dispatch by type: the simplifiers themselves and the wire format are unchanged.
+_simplifier_cache = {}
 
 
 def _serialize_msgpack_simple(
@@ -283,6 +293,7 @@ def _serialize_msgpack_binary(
     worker: AbstractWorker = None,
     simplified: bool = False,
     force_full_simplification: bool = False,
+    obj_type: type = None,
 ) -> bin:
     # 2) Serialize
     # serialize into a binary
@@ -297,7 +308,9 @@ def _serialize_msgpack_binary(
     # otherwise we output the compressed stream with header set to '1'
     # even if compressed flag is set to false by the caller we
     # output the input stream as it is with header set to '0'
-    return compression._compress(binary)
+    # the compression policy of the worker, if any, decides whether and how to compress
+    policy = getattr(worker, "compression_policy", None)
+    return compression._compress(binary, policy, obj_type)
 
 
 def serialize(
@@ -332,13 +345,12 @@ def serialize(
         worker = syft.framework.hook.local_worker
 
     simple_objects = _serialize_msgpack_simple(obj, worker, simplified, force_full_simplification)
-    return _serialize_msgpack_binary(simple_objects)
+    return _serialize_msgpack_binary(simple_objects, worker, obj_type=type(obj))
 
 
 def _deserialize_msgpack_binary(binary: bin, worker: AbstractWorker = None) -> object:
-    if worker is None:
-        # TODO[jvmancuso]: This might be worth a standalone function.
-        worker = syft.framework.hook.local_worker
+    # the worker isn't needed to decode the binary, which can thus be done
+    # in another process, see WebsocketServerWorker
 
     # 1) Decompress the binary if needed
     binary = compression._decompress(binary)
@@ -398,52 +410,61 @@ def _simplify(worker: AbstractWorker, obj: object, **kwargs) -> object:
         characters.
     """
 
-    # Check to see if there is a simplifier
-    # for this type. If there is, return the simplified object.
-    # breakpoint()
+    # Look up how objects of this type are simplified. The lookup through the
+    # class hierarchy is only done the first time a type is seen, see
+    # _resolve_simplifier.
     current_type = type(obj)
-    # print(current_type, current_type in simplifiers)
+    try:
+        simplifier = _simplifier_cache[current_type]
+    except KeyError:
+        simplifier = _simplifier_cache[current_type] = _resolve_simplifier(current_type)
+
+    # If there is not a simplifier for this type, the object
+    # is already a simple python object
+    if simplifier is None:
+        return obj
+
+    return (simplifier[0], simplifier[1](worker, obj, **kwargs))
+
+
+def _resolve_simplifier(current_type: type):
+    """Finds the simplifier of a type, see _simplify.
+
+    Args:
+        current_type: the type of the objects to simplify.
+
+    Returns:
+        The (code, simplifier) pair registered for this type or for the closest
+        type it inherits from, or None if objects of this type are simple
+        python objects which don't need to be simplified.
+    """
     if current_type in simplifiers:
-        result = (simplifiers[current_type][0], simplifiers[current_type][1](worker, obj, **kwargs))
-        return result
-    elif current_type in inherited_simplifiers_found:
-        result = (
-            inherited_simplifiers_found[current_type][0],
-            inherited_simplifiers_found[current_type][1](worker, obj, **kwargs),
-        )
-        return result
+        return simplifiers[current_type]
 
-    # If we already tried to find a simplifier for this type but failed, we should
-    # just return the object as it is.
-    elif current_type in no_simplifiers_found:
-        return obj
+    # If the object type is not in simplifiers,
+    # we check the classes that this object inherits from.
+    # `inspect.getmro` give us all types this object inherits
+    # from, including `type(obj)`. We can skip the type of the
+    # object because we already tried this in the
+    # previous step.
+    for inheritance_type in inspect.getmro(current_type)[1:]:
+        if inheritance_type in simplifiers:
+            inherited_simplifiers_found[current_type] = simplifiers[inheritance_type]
+            return simplifiers[inheritance_type]
 
-    else:
-        # If the object type is not in simplifiers,
-        # we check the classes that this object inherits from.
-        # `inspect.getmro` give us all types this object inherits
-        # from, including `type(obj)`. We can skip the type of the
-        # object because we already tried this in the
-        # previous step.
-        classes_inheritance = inspect.getmro(type(obj))[1:]
+    no_simplifiers_found.add(current_type)
+    return None
 
-        for inheritance_type in classes_inheritance:
-            if inheritance_type in simplifiers:
-                # Store the inheritance_type in simplifiers so next time we see this type
-                # serde will be faster.
-                inherited_simplifiers_found[current_type] = simplifiers[inheritance_type]
-                result = (
-                    inherited_simplifiers_found[current_type][0],
-                    inherited_simplifiers_found[current_type][1](worker, obj, **kwargs),
-                )
-                return result
 
-        # if there is not a simplifier for this
-        # object, then the object is already a
-        # simple python object and we can just
-        # return it.
-        no_simplifiers_found.add(current_type)
-        return obj
+def clear_simplifier_cache():
+    """Forgets the simplifiers resolved for the types seen so far.
+
+    This must be called when simplifiers are registered after objects have
+    been serialized, for the new simplifiers to be used.
+    """
+    _simplifier_cache.clear()
+    inherited_simplifiers_found.clear()
+    no_simplifiers_found.clear()
 
 
 def _detail(worker: AbstractWorker, obj: object, **kwargs) -> object:
@@ -28,6 +28,10 @@ from syft.serde.torch.serde import torch_tensor_serializer
 from syft.serde.torch.serde import torch_tensor_deserializer
 from syft.serde.torch.serde import numpy_tensor_serializer
 from syft.serde.torch.serde import numpy_tensor_deserializer
+from syft.serde.torch.serde import in_process_tensor_serializer
+from syft.serde.torch.serde import in_process_tensor_deserializer
+from syft.serde.torch.serde import raw_tensor_serializer
+from syft.serde.torch.serde import raw_tensor_deserializer
 
 
 def _serialize_tensor(worker: AbstractWorker, tensor) -> bin:
@@ -45,6 +49,8 @@ def _serialize_tensor(worker: AbstractWorker, tensor) -> bin:
         TENSOR_SERIALIZATION.TORCH: torch_tensor_serializer,
         TENSOR_SERIALIZATION.NUMPY: numpy_tensor_serializer,
         TENSOR_SERIALIZATION.ALL: simplified_tensor_serializer,
+        TENSOR_SERIALIZATION.IN_PROCESS: in_process_tensor_serializer,
+        TENSOR_SERIALIZATION.RAW: raw_tensor_serializer,
     }
     if worker.serializer not in serializers:
         raise NotImplementedError(
@@ -60,7 +66,7 @@ def _deserialize_tensor(worker: AbstractWorker, serializer: str, tensor_bin) ->
 
     Args
         worker: Worker
-        serializer: Strategy used for tensor deserialization (e.g.: torch, numpy, all)
+        serializer: Strategy used for tensor deserialization (e.g.: torch, numpy, all, raw)
         tensor_bin: A simplified representation of a tensor
 
     Returns
@@ -68,8 +74,10 @@ def _deserialize_tensor(worker: AbstractWorker, serializer: str, tensor_bin) ->
     """
     deserializers = {
         TENSOR_SERIALIZATION.TORCH: torch_tensor_deserializer,
-        TENSOR_SERIALIZATION.NUMPY: numpy_tensor_serializer,
+        TENSOR_SERIALIZATION.NUMPY: numpy_tensor_deserializer,
         TENSOR_SERIALIZATION.ALL: simplified_tensor_deserializer,
+        TENSOR_SERIALIZATION.IN_PROCESS: in_process_tensor_deserializer,
+        TENSOR_SERIALIZATION.RAW: raw_tensor_deserializer,
     }
     if serializer not in deserializers:
         raise NotImplementedError(
@@ -260,7 +260,8 @@ def serialize(
     if force_no_compression:
         return binary
     else:
-        return compression._compress(binary)
+        policy = getattr(worker, "compression_policy", None)
+        return compression._compress(binary, policy, obj_type)
 
 
 def deserialize(binary: bin, worker: AbstractWorker = None, unbufferizes=True) -> object:
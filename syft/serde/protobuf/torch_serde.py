@@ -26,6 +26,9 @@ from syft.serde.torch.serde import torch_tensor_serializer
 from syft.serde.torch.serde import torch_tensor_deserializer
 from syft.serde.torch.serde import numpy_tensor_serializer
 from syft.serde.torch.serde import numpy_tensor_deserializer
+from syft.serde.torch.serde import raw_tensor_serializer
+from syft.serde.torch.serde import raw_tensor_deserializer
+from syft.serde.torch.serde import is_raw_tensor
 
 from syft_proto.types.syft.v1.shape_pb2 import Shape as ShapePB
 from syft_proto.types.torch.v1.script_function_pb2 import ScriptFunction as ScriptFunctionPB
@@ -45,6 +48,10 @@ SERIALIZERS_SYFT_TO_PROTOBUF = {
 }
 SERIALIZERS_PROTOBUF_TO_SYFT = {value: key for key, value in SERIALIZERS_SYFT_TO_PROTOBUF.items()}
 
+# syft-proto has no serializer value for raw tensors: they are sent as binary
+# contents of the torch serializer, and told apart by the header of their binary
+SERIALIZERS_SYFT_TO_PROTOBUF[TENSOR_SERIALIZATION.RAW] = TorchTensorPB.Serializer.SERIALIZER_TORCH
+
 
 def _serialize_tensor(worker: AbstractWorker, tensor) -> bin:
     """Serialize the tensor using as default Torch serialization strategy
@@ -61,6 +68,7 @@ def _serialize_tensor(worker: AbstractWorker, tensor) -> bin:
         TENSOR_SERIALIZATION.TORCH: torch_tensor_serializer,
         TENSOR_SERIALIZATION.NUMPY: numpy_tensor_serializer,
         TENSOR_SERIALIZATION.ALL: protobuf_tensor_serializer,
+        TENSOR_SERIALIZATION.RAW: raw_tensor_serializer,
     }
     if worker.serializer not in serializers:
         raise NotImplementedError(
@@ -86,6 +94,7 @@ def _deserialize_tensor(worker: AbstractWorker, serializer: str, tensor_bin) ->
         TENSOR_SERIALIZATION.TORCH: torch_tensor_deserializer,
         TENSOR_SERIALIZATION.NUMPY: numpy_tensor_deserializer,
         TENSOR_SERIALIZATION.ALL: protobuf_tensor_deserializer,
+        TENSOR_SERIALIZATION.RAW: raw_tensor_deserializer,
     }
     if serializer not in deserializers:
         raise NotImplementedError(
@@ -215,6 +224,8 @@ def _unbufferize_torch_tensor(
     contents_type = protobuf_tensor.WhichOneof("contents")
     serialized_tensor = getattr(protobuf_tensor, contents_type)
     serializer = SERIALIZERS_PROTOBUF_TO_SYFT[protobuf_tensor.serializer]
+    if serializer == TENSOR_SERIALIZATION.TORCH and is_raw_tensor(serialized_tensor):
+        serializer = TENSOR_SERIALIZATION.RAW
 
     tensor = _deserialize_tensor(worker, (serializer), serialized_tensor)
 
@@ -2,7 +2,8 @@
 This file exists to provide one common place for all serialization to occur
 regardless of framework. By default, we serialize using msgpack and compress
 using lz4. If different compressions are required, the worker can override
-the function apply_compress_scheme.
+the function apply_compress_scheme, or set its own compression_policy (see
+syft.serde.compression.CompressionPolicy).
 """
 
 from typing import Callable
@@ -1,4 +1,5 @@
 import io
+import struct
 from tempfile import TemporaryFile
 import warnings
 
@@ -33,6 +34,28 @@ TORCH_MFORMAT_ID = {torch.channels_last: 1, torch.contiguous_format: 2, torch.pr
 
 TORCH_ID_MFORMAT = {i: cls for cls, i in TORCH_MFORMAT_ID.items()}
 
+# Torch dtypes which can be serialized as raw bytes, and their numpy equivalent.
+# The position of a dtype in this list is its code in the raw tensor header.
+RAW_TENSOR_DTYPES = [
+    (torch.uint8, numpy.uint8),
+    (torch.int8, numpy.int8),
+    (torch.int16, numpy.int16),
+    (torch.int32, numpy.int32),
+    (torch.int64, numpy.int64),
+    (torch.float16, numpy.float16),
+    (torch.float32, numpy.float32),
+    (torch.float64, numpy.float64),
+    (torch.bool, numpy.bool_),
+]
+RAW_TENSOR_DTYPE_ID = {dtype: i for i, (dtype, _) in enumerate(RAW_TENSOR_DTYPES)}
+
+# Raw tensors start with a header made of this magic, the dtype code, flags and the
+# number of dimensions, followed by the size of each dimension
+RAW_TENSOR_MAGIC = b"SYRT"
+RAW_TENSOR_HEADER = struct.Struct("<4sBBB")
+RAW_TENSOR_REQUIRES_GRAD = 1
+RAW_TENSOR_CHANNELS_LAST = 2
+
 
 def torch_tensor_serializer(worker: AbstractWorker, tensor) -> bin:
     """Strategy to serialize a tensor using Torch saver"""
@@ -62,7 +85,7 @@ def numpy_tensor_serializer(worker: AbstractWorker, tensor: torch.Tensor) -> bin
             "Torch to Numpy serializer can only be used with tensors that do not require grad. "
             "Detaching tensor to continue"
         )
-        tensor = torch.detach()
+        tensor = tensor.detach()
 
     np_tensor = tensor.numpy()
     outfile = io.BytesIO()
@@ -70,7 +93,7 @@ def numpy_tensor_serializer(worker: AbstractWorker, tensor: torch.Tensor) -> bin
     return outfile.getvalue()
 
 
-def numpy_tensor_deserializer(tensor_bin) -> torch.Tensor:
+def numpy_tensor_deserializer(worker: AbstractWorker, tensor_bin) -> torch.Tensor:
     """Strategy to deserialize a binary input in npy format into Torch tensor
 
     Args
@@ -81,3 +104,150 @@ def numpy_tensor_deserializer(tensor_bin) -> torch.Tensor:
     """
     bin_tensor_stream = io.BytesIO(tensor_bin)
     return torch.from_numpy(numpy.load(bin_tensor_stream))
+
+
+def in_process_tensor_serializer(worker: AbstractWorker, tensor: torch.Tensor) -> torch.Tensor:
+    """Strategy to pass a tensor to a worker living in the same process.
+    The tensor is not serialized: the receiver gets a reference to it.
+    """
+    return tensor
+
+
+def in_process_tensor_deserializer(worker: AbstractWorker, tensor: torch.Tensor) -> torch.Tensor:
+    """Strategy to receive a tensor from a worker living in the same process.
+    The tensor is cloned on receive so that the sender and the receiver don't
+    share memory, as if it had been serialized.
+    """
+    with torch.no_grad():
+        clone = tensor.native_clone()
+    clone.requires_grad = tensor.requires_grad
+    return clone
+
+
+def is_raw_tensor(tensor_bin) -> bool:
+    """Returns whether a binary holds a tensor serialized by raw_tensor_serializer"""
+    return bytes(tensor_bin[: len(RAW_TENSOR_MAGIC)]) == RAW_TENSOR_MAGIC
+
+
+def raw_tensor_serializer(worker: AbstractWorker, tensor: torch.Tensor) -> bin:
+    """Strategy to serialize a tensor as a short header followed by the raw bytes of its storage.
+
+    The header holds the dtype, shape and memory format of the tensor, so that
+    raw_tensor_deserializer can rebuild it as a view of the received bytes.
+    Tensors with a dtype numpy doesn't support are serialized with torch.save.
+    """
+    if tensor.dtype not in RAW_TENSOR_DTYPE_ID:
+        return torch_tensor_serializer(worker, tensor)
+
+    # the data of the tensor itself, without its chain if it is a wrapper
+    data = tensor.native_data
+
+    flags = 0
+    if tensor.requires_grad:
+        flags |= RAW_TENSOR_REQUIRES_GRAD
+
+    # channels last tensors are sent in their memory order, as NHWC contiguous tensors
+    if (
+        data.dim() == 4
+        and not data.is_contiguous()
+        and data.is_contiguous(memory_format=torch.channels_last)
+    ):
+        flags |= RAW_TENSOR_CHANNELS_LAST
+        data = data.permute(0, 2, 3, 1)
+
+    data = data.contiguous()
+    header = RAW_TENSOR_HEADER.pack(
+        RAW_TENSOR_MAGIC, RAW_TENSOR_DTYPE_ID[tensor.dtype], flags, data.dim()
+    ) + struct.pack(f"<{data.dim()}q", *data.shape)
+
+    return b"".join((header, data.numpy().data))
+
+
+def raw_tensor_deserializer(worker: AbstractWorker, tensor_bin) -> torch.Tensor:
+    """Strategy to deserialize a binary produced by raw_tensor_serializer.
+
+    If tensor_bin is a writable buffer (e.g. a bytearray), the tensor is a view
+    of its bytes, otherwise the bytes are copied once. msgpack hands read-only
+    bytes to the detailers, so the tensors of received messages are always copied.
+    """
+    if not is_raw_tensor(tensor_bin):
+        return torch_tensor_deserializer(worker, tensor_bin)
+
+    _, dtype_id, flags, n_dim = RAW_TENSOR_HEADER.unpack_from(tensor_bin)
+    shape = struct.unpack_from(f"<{n_dim}q", tensor_bin, RAW_TENSOR_HEADER.size)
+    offset = RAW_TENSOR_HEADER.size + 8 * n_dim
+
+    dtype = RAW_TENSOR_DTYPES[dtype_id][1]
+    numel = int(numpy.prod(shape))
+    if numel == 0:
+        array = numpy.empty(0, dtype=dtype)
+    else:
+        array = numpy.frombuffer(tensor_bin, dtype=dtype, count=numel, offset=offset)
+        if memoryview(tensor_bin).readonly:
+            array = array.copy()
+
+    tensor = torch.from_numpy(array).reshape(shape)
+    if flags & RAW_TENSOR_CHANNELS_LAST:
+        tensor = tensor.permute(0, 3, 1, 2)
+    if flags & RAW_TENSOR_REQUIRES_GRAD:
+        tensor.requires_grad = True
+
+    return tensor
+
+
+def can_send_in_chunks(tensor) -> bool:
+    """Returns whether a tensor can be streamed in chunks of raw bytes, see
+    BaseWorker.send_obj_in_chunks.
+
+    Only plain CPU tensors whose dtype numpy supports, which have no gradient
+    and no origin to report gradients to, are streamed.
+    """
+    return (
+        isinstance(tensor, torch.Tensor)
+        and not hasattr(tensor, "child")
+        and tensor.dtype in RAW_TENSOR_DTYPE_ID
+        and tensor.layout == torch.strided
+        and tensor.device.type == "cpu"
+        and tensor.grad is None
+        and getattr(tensor, "origin", None) is None
+    )
+
+
+def tensor_chunk_numel(element_size: int, chunk_size: int) -> int:
+    """Returns the number of elements of the chunks of at most chunk_size bytes of a tensor."""
+    return max(1, chunk_size // element_size)
+
+
+def tensor_chunks(tensor: torch.Tensor, chunk_size: int, start_chunk: int = 0):
+    """Yields the raw bytes of a tensor in chunks of at most chunk_size bytes.
+
+    Only one chunk is copied at a time, so that the chunks can be sent while
+    they are generated without holding a serialized copy of the whole tensor.
+
+    Args:
+        tensor: the tensor, see can_send_in_chunks.
+        chunk_size: the maximum number of bytes of a chunk.
+        start_chunk: the index of the first chunk yielded.
+
+    Yields:
+        The bytes of each chunk, following the row-major order of the elements.
+    """
+    array = tensor.native_data.contiguous().numpy().reshape(-1)
+    chunk_numel = tensor_chunk_numel(tensor.element_size(), chunk_size)
+    for start in range(start_chunk * chunk_numel, array.size, chunk_numel):
+        yield array[start : start + chunk_numel].tobytes()
+
+
+def write_tensor_chunk(tensor: torch.Tensor, index: int, chunk_size: int, chunk_bin: bin):
+    """Copies a chunk yielded by tensor_chunks into a preallocated contiguous tensor.
+
+    Args:
+        tensor: the tensor being received.
+        index: the index of the chunk.
+        chunk_size: the maximum number of bytes of a chunk.
+        chunk_bin: the bytes of the chunk.
+    """
+    array = tensor.numpy().reshape(-1)
+    chunk = numpy.frombuffer(chunk_bin, dtype=array.dtype)
+    start = index * tensor_chunk_numel(tensor.element_size(), chunk_size)
+    array[start : start + chunk.size] = chunk
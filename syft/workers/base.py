@@ -1,8 +1,11 @@
 from abc import abstractmethod
 from contextlib import contextmanager
 
+import itertools
 import logging
+import time
 from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Tuple
 from typing import Union
@@ -24,8 +27,10 @@ from syft.generic.tensor import AbstractTensor
 from syft.generic.pointers.object_pointer import ObjectPointer
 from syft.generic.pointers.pointer_tensor import PointerTensor
 from syft.messaging.message import TensorCommandMessage
+from syft.messaging.message import BatchCommandMessage
 from syft.messaging.message import WorkerCommandMessage
 from syft.messaging.message import ForceObjectDeleteMessage
+from syft.messaging.message import ForceObjectDeleteBatchMessage
 from syft.messaging.message import GetShapeMessage
 from syft.messaging.message import IsNoneMessage
 from syft.messaging.message import Message
@@ -33,7 +38,10 @@ from syft.messaging.message import ObjectMessage
 from syft.messaging.message import ObjectRequestMessage
 from syft.messaging.message import PlanCommandMessage
 from syft.messaging.message import SearchMessage
+from syft.messaging.message import TracedMessage
 from syft.workers.abstract import AbstractWorker
+from syft.workers import message_metrics
+from syft.workers import tracing
 
 from syft.exceptions import GetNotPermittedError
 from syft.exceptions import ObjectNotFoundError
@@ -93,6 +101,10 @@ class BaseWorker(AbstractWorker, ObjectStorage):
             precision.
     """
 
+    # The exceptions raised by send_msg when the connection to the location is
+    # lost, after which interrupted chunked transfers are resumed
+    connection_errors = (ConnectionError,)
+
     def __init__(
         self,
         hook: "FrameworkHook",
@@ -119,22 +131,89 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         # For performance, we cache all possible message types
         self._message_router = {
             TensorCommandMessage: self.execute_tensor_command,
+            BatchCommandMessage: self.execute_batch_command,
             PlanCommandMessage: self.execute_plan_command,
             WorkerCommandMessage: self.execute_worker_command,
             ObjectMessage: self.handle_object_msg,
             ObjectRequestMessage: self.respond_to_obj_req,
             ForceObjectDeleteMessage: self.handle_delete_object_msg,  # FIXME: there is no ObjectDeleteMessage
             ForceObjectDeleteMessage: self.handle_force_delete_object_msg,
+            ForceObjectDeleteBatchMessage: self.handle_force_delete_object_batch_msg,
             IsNoneMessage: self.is_object_none,
             GetShapeMessage: self.handle_get_shape_message,
             SearchMessage: self.respond_to_search,
+            TracedMessage: self.handle_traced_msg,
         }
 
         self._plan_command_router = {
             codes.PLAN_CMDS.FETCH_PLAN: self._fetch_plan_remote,
             codes.PLAN_CMDS.FETCH_PROTOCOL: self._fetch_protocol_remote,
+            codes.PLAN_CMDS.UPDATE_PLAN_STATE: self._update_plan_state_remote,
         }
 
+        # Commands buffered while this worker is batched(), and the worker sending them
+        self._command_batch = None
+        self._command_batch_sender = None
+        self._command_batch_max_size = None
+
+        # When deferred_gc is set, the deletions of remote objects requested by the
+        # pointers owned by this worker are queued per location and sent in batches
+        # of up to gc_batch_size ids, or in a separate message before the next message
+        # sent to the location. Once the oldest one is gc_flush_interval seconds old,
+        # all the queues are flushed by the next deletion or message of this worker.
+        # There is no timer: messages aren't thread-safe, so deletions only go out
+        # while this worker is active or when flush_gc() is called.
+        self.deferred_gc = False
+        self.gc_batch_size = 100
+        self.gc_flush_interval = 1.0
+        self._gc_queue = {}
+        self._gc_oldest_time = None
+        self._gc_flushed = 0
+        self._gc_flushes = 0
+
+        # Seeds shared with other workers, used to derive pseudo-random shares. When
+        # prg_sharing is set, the shares of the tensors shared by this worker are
+        # derived from these seeds, see AdditiveSharingTensor.init_shares
+        self.prg_sharing = False
+        self._prg_seeds = {}
+        # The counter of the nonces issued by this worker, see new_prg_nonce, and the
+        # last counter of each issuer used with the seed shared with each worker, by
+        # (worker id, issuer id): counters must increase so that a share can't be
+        # derived again
+        self._prg_nonce_counter = itertools.count()
+        self._prg_last_nonces = {}
+
+        # The tensor serialization strategy used when all the workers support PyTorch
+        self.torch_serialization = codes.TENSOR_SERIALIZATION.TORCH
+
+        # The CompressionPolicy of the messages serialized by this worker, see
+        # syft.serde.compression. When None, every message is compressed with
+        # _apply_compress_scheme.
+        self.compression_policy = None
+
+        # Tensors larger than transfer_chunk_size bytes are streamed in chunks of
+        # this size by send_obj, see send_obj_in_chunks. They are sent in a single
+        # message when None. transfer_progress is called after each chunk sent.
+        # Transfers interrupted by a lost connection are resumed up to
+        # transfer_resumes times.
+        self.transfer_chunk_size = None
+        self.transfer_progress = None
+        self.transfer_resumes = 3
+        # The tensors being received in chunks, by id. A transfer which received no
+        # chunk for transfer_expiry seconds is released, and beginning a transfer
+        # releases the least recently updated ones beyond max_chunked_transfers.
+        self._chunked_transfers = {}
+        self.transfer_expiry = 600.0
+        self.max_chunked_transfers = 16
+
+        # The MessageMetrics of the messages sent and received, see
+        # syft.workers.message_metrics. Messages are not recorded when None.
+        self.metrics = None
+
+        # The Tracer recording the spans of the messages sent and received, see
+        # syft.workers.tracing. Messages are not traced when None.
+        self.tracer = None
+
         self.load_data(data)
 
         # Declare workers as appropriate
@@ -280,16 +359,100 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         if self.verbose:
             print(f"worker {self} sending {message} to {location}")
 
-        # Step 1: serialize the message to a binary
-        bin_message = sy.serde.serialize(message, worker=self)
+        # Step 0: send what is pending for the location first, to keep the order
+        self._send_pending_msgs(message, location)
+
+        # Messages to workers of this process may skip the binary serialization
+        in_process = self._sends_in_process(location)
+
+        # Step 1: serialize the message to a binary, or only simplify it in-process
+        t0 = time.perf_counter()
+        sent_message = self._traced(message)
+        if in_process:
+            request = self._simplify_in_process(sent_message)
+        else:
+            request = sy.serde.serialize(sent_message, worker=self)
 
         # Step 2: send the message and wait for a response
-        bin_response = self._send_msg(bin_message, location)
+        t1 = time.perf_counter()
+        if in_process:
+            response = self._send_msg_in_process(request, location)
+        else:
+            response = self._send_msg(request, location)
 
-        # Step 3: deserialize the response
-        response = sy.serde.deserialize(bin_response, worker=self)
+        # Step 3: deserialize (or detail) the response
+        t2 = time.perf_counter()
+        if in_process:
+            detailed_response = sy.serde.msgpack.serde._deserialize_msgpack_simple(response, self)
+        else:
+            detailed_response = sy.serde.deserialize(response, worker=self)
 
-        return response
+        self._record_sent(
+            message, sent_message, 0 if in_process else len(request) + len(response), t0, t1, t2
+        )
+
+        return detailed_response
+
+    def _record_sent(
+        self,
+        message: Message,
+        sent_message: Message,
+        n_bytes: int,
+        t0: float,
+        t1: float,
+        t2: float,
+    ):
+        """Records a message sent in the metrics and the spans of this worker.
+
+        Args:
+            message: the message sent.
+            sent_message: the message as it was sent, a TracedMessage if it is traced.
+            n_bytes: the number of bytes of the serialized message and response, 0
+                for the messages sent in-process.
+            t0, t1, t2: the time.perf_counter() before serializing the message, before
+                sending it, and before deserializing the response.
+        """
+        if self.metrics is not None:
+            self.metrics.record(
+                message_metrics.SENT,
+                message,
+                n_bytes,
+                serialize_time=t1 - t0,
+                transport_time=t2 - t1,
+                deserialize_time=time.perf_counter() - t2,
+            )
+
+        if sent_message is not message:
+            self.tracer.record_send(sent_message, t0, t1, t2, time.perf_counter())
+
+    def _traced(self, message: Message) -> Message:
+        """Wraps a message about to be sent in a TracedMessage if this worker traces
+        its messages, see syft.workers.tracing."""
+        if self.tracer is None:
+            return message
+        trace_id, span_id = self.tracer.trace_message(message)
+        return TracedMessage(trace_id, span_id, message)
+
+    def _send_pending_msgs(self, message: Message, location: "BaseWorker"):
+        """Sends the commands buffered for location and then the deletions queued
+        for it, or all the queued deletions if they are too old, before message is sent."""
+        if getattr(location, "_command_batch", None):
+            location.flush_commands()
+
+        if not self._gc_queue or isinstance(
+            message, (BatchCommandMessage, ForceObjectDeleteBatchMessage)
+        ):
+            # Buffered commands may still use the objects deleted, so deletions
+            # are not sent ahead of a BatchCommandMessage
+            return
+
+        if (
+            self._gc_oldest_time is not None
+            and time.time() - self._gc_oldest_time >= self.gc_flush_interval
+        ):
+            self.flush_gc()
+        elif location.id in self._gc_queue:
+            self.flush_gc(location)
 
     def recv_msg(self, bin_message: bin) -> bin:
         """Implements the logic to receive messages.
@@ -310,19 +473,110 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         if self.log_msgs:
             self.msg_history.append(bin_message)
 
+        return self._handle_msg(bin_message, in_process=False)
+
+    def _recv_msg_in_process(self, simple_message: object) -> object:
+        """Receives a simplified message from a worker of this process, see recv_msg
+        and _sends_in_process.
+
+        Args:
+            simple_message: A simplified message.
+
+        Returns:
+            The simplified response.
+        """
+        return self._handle_msg(simple_message, in_process=True)
+
+    def _handle_msg(self, request: object, in_process: bool) -> object:
+        """Deserializes a message, routes it to the appropriate function and serializes
+        the response. In-process messages are only detailed and simplified.
+
+        Args:
+            request: the binary message, or the simplified message if in_process.
+            in_process: whether the message comes from a worker of this process.
+
+        Returns:
+            The binary response, or the simplified response if in_process.
+        """
         # Step 0: deserialize message
-        msg = sy.serde.deserialize(bin_message, worker=self)
+        t0 = time.perf_counter()
+        if in_process:
+            msg = sy.serde.msgpack.serde._deserialize_msgpack_simple(request, self)
+        else:
+            msg = sy.serde.deserialize(request, worker=self)
+
+        # Step 1: route message to appropriate function
+        t1 = time.perf_counter()
+        response = self._execute_msg(msg)
+
+        # Step 2: Serialize the message to simple python objects
+        t2 = time.perf_counter()
+        if in_process:
+            serialized_response = self._simplify_in_process(response)
+            # in-process messages are not serialized to bytes
+            n_bytes = 0
+        else:
+            serialized_response = sy.serde.serialize(response, worker=self)
+            n_bytes = len(request) + len(serialized_response)
+
+        self._record_received(msg, n_bytes, t0, t1, t2)
 
+        return serialized_response
+
+    def _execute_msg(self, msg: Message) -> object:
+        """Routes a detailed message to the appropriate function and returns its response."""
         if self.verbose:
             print(f"worker {self} received {type(msg).__name__} {msg.contents}")
 
-        # Step 1: route message to appropriate function
-        response = self._message_router[type(msg)](msg)
+        return self._message_router[type(msg)](msg)
 
-        # Step 2: Serialize the message to simple python objects
-        bin_response = sy.serde.serialize(response, worker=self)
+    def _sends_in_process(self, location: "BaseWorker") -> bool:
+        """Returns whether messages to location are handed over in their simplified form,
+        without the binary serialization and compression steps. Only workers of this
+        process can receive such messages, see VirtualWorker."""
+        return False
 
-        return bin_response
+    def _send_msg_in_process(self, simple_message: object, location: "BaseWorker") -> object:
+        """Sends a simplified message to a worker of this process, see _sends_in_process.
+
+        Args:
+            simple_message: A simplified message.
+            location: the worker of this process to send the message to.
+
+        Returns:
+            The simplified response.
+        """
+        return location._recv_msg_in_process(simple_message)
+
+    def _simplify_in_process(self, obj: object) -> object:
+        """Simplifies a message or a response exchanged with a worker of this process."""
+        return sy.serde.msgpack.serde._serialize_msgpack_simple(obj, self)
+
+    def _record_received(self, msg: Message, n_bytes: int, t0: float, t1: float, t2: float):
+        """Records a message received in the metrics and the spans of this worker.
+
+        Args:
+            msg: the message received.
+            n_bytes: the number of bytes of the serialized message and response, 0
+                for the messages received in-process.
+            t0, t1, t2: the time.perf_counter() before deserializing the message,
+                before executing it, and before serializing the response.
+        """
+        t3 = time.perf_counter()
+        traced = type(msg) is TracedMessage
+
+        if self.metrics is not None:
+            self.metrics.record(
+                message_metrics.RECEIVED,
+                msg.message if traced else msg,
+                n_bytes,
+                serialize_time=t3 - t2,
+                execute_time=t2 - t1,
+                deserialize_time=t1 - t0,
+            )
+
+        if traced and self.tracer is not None:
+            self.tracer.record_receive(msg, t0, t1, t2, t3)
 
         # SECTION:recv_msg() uses self._message_router to route to these methods
 
@@ -458,12 +712,48 @@ class BaseWorker(AbstractWorker, ObjectStorage):
     def handle_force_delete_object_msg(self, msg: ForceObjectDeleteMessage):
         self.force_rm_obj(msg.object_id)
 
+    def handle_force_delete_object_batch_msg(self, msg: ForceObjectDeleteBatchMessage):
+        for obj_id in msg.object_ids:
+            self.force_rm_obj(obj_id)
+
+    def handle_traced_msg(self, msg: TracedMessage) -> object:
+        """Routes the message carried by a TracedMessage in a new span of its trace,
+        which becomes the parent of the messages sent meanwhile."""
+        msg.span_id = tracing.new_id()
+        with tracing.context(msg.trace_id, msg.span_id):
+            return self._message_router[type(msg.message)](msg.message)
+
     def execute_tensor_command(self, cmd: TensorCommandMessage) -> PointerTensor:
         if isinstance(cmd.action, ComputationAction):
             return self.execute_computation_action(cmd.action)
         else:
             return self.execute_communication_action(cmd.action)
 
+    def execute_batch_command(self, msg: BatchCommandMessage) -> tuple:
+        """Executes the actions of a BatchCommandMessage in order.
+
+        Args:
+            msg: A BatchCommandMessage holding the actions to execute.
+
+        Returns:
+            A tuple (responses, ids_generated) where responses holds the response
+            of each action and ids_generated maps the index of the actions whose
+            results didn't match their return ids to the ids actually used.
+        """
+        responses = []
+        ids_generated = {}
+        for i, action in enumerate(msg.actions):
+            try:
+                # detailing an action fetches the objects it uses, which may be
+                # the results of the previous actions of the batch
+                if msg.simplified:
+                    action = sy.serde.msgpack.serde._detail(self, action)
+                responses.append(self.execute_computation_action(action))
+            except ResponseSignatureError as e:
+                responses.append(None)
+                ids_generated[i] = e.ids_generated
+        return responses, ids_generated
+
     def execute_computation_action(self, action: ComputationAction) -> PointerTensor:
         """
         Executes commands received from other workers.
@@ -611,6 +901,14 @@ class BaseWorker(AbstractWorker, ObjectStorage):
 
         name, target, args_, kwargs_ = message
 
+        if getattr(recipient, "_command_batch", None) is not None:
+            # The recipient is batched: the command is buffered and pointers to its
+            # results are returned right away, as if it had returned nothing
+            recipient.buffer_command(
+                self, ComputationAction(name, target, args_, kwargs_, return_ids)
+            )
+            return self.build_command_response(recipient, None, return_ids)
+
         try:
             message = TensorCommandMessage.computation(name, target, args_, kwargs_, return_ids)
             ret_val = self.send_msg(message, location=recipient)
@@ -618,6 +916,22 @@ class BaseWorker(AbstractWorker, ObjectStorage):
             ret_val = None
             return_ids = e.ids_generated
 
+        return self.build_command_response(recipient, ret_val, return_ids)
+
+    def build_command_response(
+        self, recipient: "BaseWorker", ret_val: object, return_ids: Tuple[Union[str, int]]
+    ) -> Union[List[PointerTensor], PointerTensor]:
+        """
+        Builds the value returned by a command from the response of the recipient.
+
+        Args:
+            recipient: The worker which executed the command.
+            ret_val: The deserialized response of the recipient.
+            return_ids: The ids of the results of the command on the recipient.
+
+        Returns:
+            A list of PointerTensors or a single PointerTensor if just one response is expected.
+        """
         if ret_val is None or type(ret_val) == bytes:
             responses = []
             for return_id in return_ids:
@@ -635,6 +949,139 @@ class BaseWorker(AbstractWorker, ObjectStorage):
             responses = ret_val
         return responses
 
+    @contextmanager
+    def batched(self, max_size: int = 100):
+        """Buffers the commands sent to this worker and sends them in BatchCommandMessages.
+
+        Within this context, remote operations on pointers to this worker return
+        pointers to their results right away, without sending anything. The buffered
+        commands are sent in a single message when another message is sent to this
+        worker (for example by .get()), when max_size commands are buffered, and
+        when leaving the context.
+
+        Args:
+            max_size: the maximum number of commands to buffer before sending them.
+
+        Example:
+            >>> with bob.batched():
+            ...     z = (x + y) * 2
+            >>> z.get()
+        """
+        self._command_batch = []
+        self._command_batch_max_size = max_size
+        try:
+            yield self
+        finally:
+            self.flush_commands()
+            self._command_batch = None
+
+    def buffer_command(self, sender: "BaseWorker", action: ComputationAction):
+        """Buffers a command sent to this worker while it is batched().
+
+        Args:
+            sender: The worker sending the command.
+            action: The ComputationAction to buffer.
+        """
+        if self._command_batch and sender is not self._command_batch_sender:
+            self.flush_commands()
+
+        self._command_batch_sender = sender
+        self._command_batch.append(action)
+
+        if len(self._command_batch) >= self._command_batch_max_size:
+            self.flush_commands()
+
+    def flush_commands(self) -> List[object]:
+        """Sends the commands buffered for this worker in a single BatchCommandMessage.
+
+        Returns:
+            The list of the responses of the commands.
+
+        Raises:
+            ResponseSignatureError: if the results of a command didn't match the
+                pointers returned when it was buffered.
+        """
+        if not self._command_batch:
+            return []
+
+        actions = self._command_batch
+        self._command_batch = []
+
+        responses, ids_generated = self._command_batch_sender.send_msg(
+            BatchCommandMessage(actions), location=self
+        )
+
+        if ids_generated:
+            # The pointers returned for these commands don't match their results
+            raise ResponseSignatureError(ids_generated[min(ids_generated)])
+
+        return responses
+
+    def garbage_collect_remote(self, obj_id: Union[str, int], location: "BaseWorker"):
+        """Deletes a remote object whose pointer owned by this worker was garbage collected.
+
+        The deletion is sent right away unless deferred_gc is set, in which case it is
+        queued and sent later with the other deletions queued for the same location.
+
+        Args:
+            obj_id: The id of the object to delete.
+            location: The worker holding the object.
+        """
+        if not self.deferred_gc:
+            self.send_msg(ForceObjectDeleteMessage(obj_id), location)
+            return
+
+        if location.id not in self._gc_queue:
+            self._gc_queue[location.id] = (location, [])
+        self._gc_queue[location.id][1].append(obj_id)
+
+        now = time.time()
+        if self._gc_oldest_time is None:
+            self._gc_oldest_time = now
+
+        if len(self._gc_queue[location.id][1]) >= self.gc_batch_size:
+            self.flush_gc(location)
+        elif now - self._gc_oldest_time >= self.gc_flush_interval:
+            self.flush_gc()
+
+    def flush_gc(self, location: "BaseWorker" = None):
+        """Sends the deletions of remote objects queued by this worker.
+
+        Args:
+            location: If provided, only the deletions queued for this worker are sent.
+        """
+        if location is None:
+            locations = list(self._gc_queue)
+            # every queue is flushed, the messages sent meanwhile don't need to
+            self._gc_oldest_time = None
+        else:
+            locations = [location.id]
+
+        for location_id in locations:
+            if location_id not in self._gc_queue:
+                continue
+            location, obj_ids = self._gc_queue.pop(location_id)
+            self.send_msg(ForceObjectDeleteBatchMessage(obj_ids), location)
+            self._gc_flushed += len(obj_ids)
+            self._gc_flushes += 1
+
+        if not self._gc_queue:
+            self._gc_oldest_time = None
+
+    @property
+    def gc_stats(self) -> dict:
+        """Returns statistics about the deletions of remote objects requested by this worker.
+
+        Returns:
+            A dict with the number of deletions pending, the number of deletions
+            flushed and the number of ForceObjectDeleteBatchMessages sent.
+        """
+        return {
+            "pending": sum(len(obj_ids) for _, obj_ids in self._gc_queue.values()),
+            "flushed": self._gc_flushed,
+            "flushes": self._gc_flushes,
+        }
+
     def get_obj(self, obj_id: Union[str, int]) -> object:
         """Returns the object from registry.
 
@@ -705,13 +1152,239 @@ class BaseWorker(AbstractWorker, ObjectStorage):
     def send_obj(self, obj: object, location: "BaseWorker"):
         """Send a torch object to a worker.
 
+        Tensors larger than transfer_chunk_size bytes are streamed in chunks,
+        see send_obj_in_chunks. Other objects, including Plans and States whose
+        tensors are serialized with them, are sent in a single message.
+
         Args:
             obj: A torch Tensor or Variable object to be sent.
             location: A BaseWorker instance indicating the worker which should
                 receive the object.
         """
+        if (
+            self.transfer_chunk_size is not None
+            and sy.serde.torch.serde.can_send_in_chunks(obj)
+            and obj.numel() * obj.element_size() > self.transfer_chunk_size
+        ):
+            return self.send_obj_in_chunks(obj, location)
+
         return self.send_msg(ObjectMessage(obj), location)
 
+    def send_obj_in_chunks(
+        self,
+        tensor: FrameworkTensorType,
+        location: "BaseWorker",
+        chunk_size: int = None,
+        progress: Callable = None,
+    ) -> None:
+        """Streams a tensor to a worker in chunks of raw bytes.
+
+        The location preallocates the tensor and copies each chunk into it when
+        it is received, so that neither worker holds a serialized copy of the
+        whole tensor. Each chunk is sent once the previous one is acknowledged,
+        which bounds the memory used by the transfer to a few chunks, and is
+        compressed on its own by the compression policy of this worker.
+
+        If the connection to the location is lost (see connection_errors), the
+        transfer is resumed from the first chunk not received, up to
+        transfer_resumes times. Sending the same tensor again after any other
+        interruption also resumes it, as long as the location didn't release the
+        transfer, see abort_obj_in_chunks and begin_chunked_transfer.
+
+        Args:
+            tensor: The tensor to send, see syft.serde.torch.serde.can_send_in_chunks.
+            location: The worker receiving the tensor.
+            chunk_size: The maximum number of bytes of a chunk, transfer_chunk_size
+                by default.
+            progress: Called after each chunk with the number of bytes sent and the
+                size of the tensor in bytes, transfer_progress by default.
+        """
+        torch_serde = sy.serde.torch.serde
+        chunk_size = chunk_size or self.transfer_chunk_size
+        progress = progress or self.transfer_progress
+
+        total_size = tensor.numel() * tensor.element_size()
+        chunk_bytes = torch_serde.tensor_chunk_numel(tensor.element_size(), chunk_size) * (
+            tensor.element_size()
+        )
+
+        resumes = 0
+        chunks = None
+        while True:
+            try:
+                if chunks is None:
+                    index = self.send_msg(
+                        self.create_worker_command_message(
+                            "begin_chunked_transfer",
+                            None,
+                            tensor.id,
+                            tuple(tensor.shape),
+                            tensor.dtype,
+                            chunk_size,
+                            tensor.requires_grad,
+                            tensor.tags,
+                            tensor.description,
+                        ),
+                        location,
+                    )
+                    chunks = torch_serde.tensor_chunks(tensor, chunk_size, index)
+
+                chunk_bin = next(chunks, None)
+                if chunk_bin is None:
+                    self.send_msg(
+                        self.create_worker_command_message("end_chunked_transfer", None, tensor.id),
+                        location,
+                    )
+                    return
+
+                self.send_msg(
+                    self.create_worker_command_message(
+                        "receive_chunk", None, tensor.id, index, chunk_bin
+                    ),
+                    location,
+                )
+            except location.connection_errors:
+                if resumes >= self.transfer_resumes:
+                    raise
+                resumes += 1
+                logger.warning(
+                    "Resuming the transfer of object %s to worker %s", tensor.id, location.id
+                )
+                # the location tells which chunk it expects next
+                chunks = None
+                continue
+
+            index += 1
+            if progress is not None:
+                progress(min(index * chunk_bytes, total_size), total_size)
+
+    def begin_chunked_transfer(
+        self,
+        obj_id: Union[str, int],
+        shape: tuple,
+        dtype,
+        chunk_size: int,
+        requires_grad: bool = False,
+        tags: set = None,
+        description: str = None,
+    ) -> int:
+        """Prepares the reception of a tensor streamed in chunks, see send_obj_in_chunks.
+
+        Args:
+            obj_id: The id of the tensor.
+            shape: The shape of the tensor.
+            dtype: The dtype of the tensor.
+            chunk_size: The maximum number of bytes of a chunk.
+            requires_grad: Whether the tensor requires grad.
+            tags: The tags of the tensor.
+            description: The description of the tensor.
+
+        The transfers which received no chunk for transfer_expiry seconds are
+        released first, and so are the least recently updated ones if more than
+        max_chunked_transfers transfers would be in progress.
+
+        Returns:
+            The index of the first chunk to send: the number of chunks already received
+            if an interrupted transfer of the same tensor is resumed, 0 otherwise.
+        """
+        self._release_chunked_transfers(keep=obj_id)
+
+        transfer = self._chunked_transfers.get(obj_id)
+        if (
+            transfer is None
+            or tuple(transfer["tensor"].shape) != tuple(shape)
+            or transfer["tensor"].dtype != dtype
+            or transfer["chunk_size"] != chunk_size
+        ):
+            transfer = {"tensor": self.framework.empty(shape, dtype=dtype), "next_chunk": 0}
+            self._chunked_transfers[obj_id] = transfer
+
+        transfer.update(
+            chunk_size=chunk_size,
+            requires_grad=requires_grad,
+            tags=tags,
+            description=description,
+            updated=time.time(),
+        )
+        return transfer["next_chunk"]
+
+    def _release_chunked_transfers(self, keep: Union[str, int] = None) -> None:
+        """Releases the expired transfers, and the least recently updated ones beyond
+        max_chunked_transfers - 1 so that another transfer can begin.
+
+        Args:
+            keep: The id of a transfer being resumed, which is not released.
+        """
+        now = time.time()
+        for obj_id, transfer in list(self._chunked_transfers.items()):
+            if obj_id != keep and now - transfer["updated"] >= self.transfer_expiry:
+                self.abort_chunked_transfer(obj_id)
+
+        others = sorted(
+            (transfer["updated"], obj_id)
+            for obj_id, transfer in self._chunked_transfers.items()
+            if obj_id != keep
+        )
+        for _, obj_id in others[: max(0, len(others) - self.max_chunked_transfers + 1)]:
+            self.abort_chunked_transfer(obj_id)
+
+    def abort_chunked_transfer(self, obj_id: Union[str, int]) -> None:
+        """Releases the tensor being received in chunks under obj_id, if any."""
+        if self._chunked_transfers.pop(obj_id, None) is not None:
+            logger.warning("Released the unfinished chunked transfer of object %s", obj_id)
+
+    def abort_obj_in_chunks(self, obj_id: Union[str, int], location: "BaseWorker") -> None:
+        """Aborts the transfer of a tensor in chunks to a worker, which releases the
+        chunks it received, see send_obj_in_chunks.
+
+        Args:
+            obj_id: The id of the tensor.
+            location: The worker receiving the tensor.
+        """
+        self.send_msg(
+            self.create_worker_command_message("abort_chunked_transfer", None, obj_id), location
+        )
+
+    def receive_chunk(self, obj_id: Union[str, int], index: int, chunk_bin: bin) -> None:
+        """Copies a chunk of a tensor streamed in chunks into the tensor, see send_obj_in_chunks."""
+        transfer = self._chunked_transfers[obj_id]
+        if index < transfer["next_chunk"]:
+            # a chunk resent after its acknowledgement was lost
+            return
+        if index != transfer["next_chunk"]:
+            raise ValueError(
+                f"Expected chunk {transfer['next_chunk']} of object {obj_id}, received {index}"
+            )
+
+        sy.serde.torch.serde.write_tensor_chunk(
+            transfer["tensor"], index, transfer["chunk_size"], chunk_bin
+        )
+        transfer["next_chunk"] += 1
+        transfer["updated"] = time.time()
+
+    def end_chunked_transfer(self, obj_id: Union[str, int]) -> None:
+        """Registers a tensor once all its chunks are received, see send_obj_in_chunks."""
+        transfer = self._chunked_transfers[obj_id]
+        tensor = transfer["tensor"]
+        n_chunks = -(
+            -tensor.numel()
+            // sy.serde.torch.serde.tensor_chunk_numel(
+                tensor.element_size(), transfer["chunk_size"]
+            )
+        )
+        if transfer["next_chunk"] < n_chunks:
+            raise ValueError(
+                f"Received {transfer['next_chunk']} chunks of object {obj_id} out of {n_chunks}"
+            )
+
+        del self._chunked_transfers[obj_id]
+        tensor.id = obj_id
+        tensor.tags = transfer["tags"]
+        tensor.description = transfer["description"]
+        if transfer["requires_grad"]:
+            tensor.requires_grad_()
+        self.set_obj(tensor)
+
     def request_obj(
         self, obj_id: Union[str, int], location: "BaseWorker", user=None, reason: str = ""
     ) -> object:
@@ -983,6 +1656,43 @@ class BaseWorker(AbstractWorker, ObjectStorage):
 
         return None
 
+    def update_plan_state(
+        self, plan_id: Union[str, int], location: "BaseWorker", values: Dict, deltas: Dict
+    ):
+        """Updates in place the state of the plan with the given `plan_id` held by a
+        worker, see Plan.sync_state.
+
+        This method is executed for local execution.
+
+        Args:
+            plan_id: A string indicating the plan id.
+            location: The worker holding the plan.
+            values: The new values of state tensors, by placeholder id.
+            deltas: The deltas to add to state tensors, by placeholder id.
+        """
+        message = PlanCommandMessage("update_plan_state", (plan_id, values, deltas))
+        self.send_msg(message, location=location)
+
+    def _update_plan_state_remote(self, plan_id: Union[str, int], values: Dict, deltas: Dict):
+        """Updates in place the state of the plan with the given `plan_id` from the
+        worker registry.
+
+        This method is executed for remote execution.
+
+        Args:
+            plan_id: A string indicating the plan id.
+            values: The new values of state tensors, by placeholder id.
+            deltas: The deltas to add to state tensors, by placeholder id.
+
+        Raises:
+            ObjectNotFoundError: If there is no plan with the given `plan_id`.
+        """
+        candidate = self._objects.get(plan_id)
+        if not isinstance(candidate, sy.Plan):
+            raise ObjectNotFoundError(plan_id, self)
+
+        candidate.state.update_(values, deltas)
+
     def fetch_protocol(
         self, protocol_id: Union[str, int], location: "BaseWorker", copy: bool = False
     ) -> "Plan":  # noqa: F821
@@ -1160,6 +1870,196 @@ class BaseWorker(AbstractWorker, ObjectStorage):
             return_ids = []
         return WorkerCommandMessage(command_name, (args, kwargs, return_ids))
 
+    def send_worker_command(
+        self, recipient: "BaseWorker", command_name: str, *args, **kwargs
+    ) -> object:
+        """Calls a method of a worker and returns its response.
+
+        Args:
+            recipient: The worker whose method is called.
+            command_name: The name of the method.
+            *args: will be passed to the call of command_name
+            **kwargs: will be passed to the call of command_name
+
+        Returns:
+            A PointerTensor to the result if it is a tensor, the result otherwise.
+        """
+        return_ids = [sy.ID_PROVIDER.pop()]
+        message = self.create_worker_command_message(command_name, return_ids, *args, **kwargs)
+        ret_val = self.send_msg(message, location=recipient)
+        return self.build_command_response(recipient, ret_val, return_ids)
+
+    def share_prg_seed(self, worker: Union[str, int, "BaseWorker"]) -> None:
+        """Shares a seed with another worker, unless they already share one.
+
+        Args:
+            worker: The worker (or its id) to share a seed with.
+        """
+        worker = self.get_worker(worker)
+        if worker.id not in self._prg_seeds:
+            seed = sy.frameworks.torch.mpc.prg.new_seed()
+            self.send_msg(
+                self.create_worker_command_message("set_prg_seed", None, self.id, seed), worker
+            )
+            self._prg_seeds[worker.id] = seed
+
+    def set_prg_seed(self, worker_id: Union[str, int], seed: int) -> None:
+        """Stores the seed shared with another worker.
+
+        The seed shared with a worker can't be replaced, so that a peer can't
+        substitute a seed it knows for it.
+        """
+        if worker_id in self._prg_seeds:
+            raise GetNotPermittedError(f"A seed is already shared with worker {worker_id}")
+        self._prg_seeds[worker_id] = seed
+
+    def share_prg_seeds(self, worker_ids: List[Union[str, int]]) -> None:
+        """Shares a seed with each of the workers following this one in worker_ids,
+        unless they already share one, see prg_zero_share."""
+        position = worker_ids.index(self.id)
+        for worker_id in worker_ids[position + 1 :]:
+            self.share_prg_seed(worker_id)
+
+    def new_prg_nonce(self) -> Tuple[Union[str, int], int]:
+        """Returns a new nonce issued by this worker, to derive fresh shares from the
+        seeds of other workers, see prg_share and prg_zero_share.
+
+        A nonce is the id of this worker and the next value of its counter, so that
+        the nonces of different issuers can't collide and don't depend on clocks.
+        """
+        return self.id, next(self._prg_nonce_counter)
+
+    def _use_prg_nonce(self, worker_ids: List[Union[str, int]], nonce: Tuple) -> None:
+        """Checks that the counter of a nonce is greater than the last counter of its
+        issuer used with the seeds shared with the given workers and records it, so
+        that the shares derived from a nonce can't be derived again by another
+        request naming it."""
+        issuer_id, counter = nonce
+        for worker_id in worker_ids:
+            if counter <= self._prg_last_nonces.get((worker_id, issuer_id), -1):
+                raise GetNotPermittedError(
+                    f"The nonce {nonce} isn't greater than the last nonce of worker "
+                    f"{issuer_id} used with the seed shared with worker {worker_id}"
+                )
+        for worker_id in worker_ids:
+            self._prg_last_nonces[(worker_id, issuer_id)] = counter
+
+    def prg_share(
+        self, worker_id: Union[str, int], nonce: Tuple, shape: tuple, field: int, dtype
+    ) -> FrameworkTensorType:
+        """Derives a share from the seed shared with the worker sharing a secret.
+
+        Args:
+            worker_id: The id of the worker sharing the secret.
+            nonce: The nonce of the share, greater than the last nonce of its issuer
+                used with the seed, see new_prg_nonce.
+            shape: The shape of the share.
+            field: The size of the field of the share.
+            dtype: The dtype of the share.
+        """
+        self._use_prg_nonce([worker_id], nonce)
+        return sy.frameworks.torch.mpc.prg.prg_tensor(
+            self._prg_seeds[worker_id], nonce, shape, field, dtype
+        )
+
+    def prg_zero_share(
+        self, worker_ids: List[Union[str, int]], nonce: Tuple, shape: tuple, field: int, dtype
+    ) -> FrameworkTensorType:
+        """Derives this worker's share of a zero shared between workers.
+
+        Each pair of workers derives the same mask from the seed they share: the
+        first one in worker_ids adds it to its share and the second one subtracts
+        it, so that the shares of all the workers sum to zero. The seeds must be
+        shared beforehand, see share_prg_seeds.
+
+        Args:
+            worker_ids: The ids of the workers holding the shares, in the same order
+                for all of them.
+            nonce: The nonce of the shares, greater than the last nonce of its
+                issuer used with each of the seeds, see new_prg_nonce.
+            shape: The shape of the share.
+            field: The size of the field of the share.
+            dtype: The dtype of the share.
+        """
+        self._use_prg_nonce([worker_id for worker_id in worker_ids if worker_id != self.id], nonce)
+        position = worker_ids.index(self.id)
+
+        seeds = []
+        for i, worker_id in enumerate(worker_ids):
+            if i > position:
+                seeds.append((self._prg_seeds[worker_id], 1))
+            elif i < position:
+                seeds.append((self._prg_seeds[worker_id], -1))
+
+        return sy.frameworks.torch.mpc.prg.zero_share(seeds, nonce, shape, field, dtype)
+
+    def get_shares(self, share_ids: List[Union[str, int]], user=None) -> list:
+        """Returns the shares held by this worker, to open them, see open_shares.
+
+        Like respond_to_obj_req, a share is only returned if the user is allowed to
+        get it, but the shares stay registered: they are removed with the shared
+        tensor by its owner.
+
+        Args:
+            share_ids: The ids of the shares.
+            user (object, optional): user credentials to perform user authentication.
+
+        Returns:
+            The shares, in the order of share_ids.
+        """
+        shares = []
+        for share_id in share_ids:
+            share = self.get_obj(share_id)
+            if hasattr(share, "allow") and not share.allow(user):
+                raise GetNotPermittedError()
+            shares.append(share)
+        return shares
+
+    def open_shares(
+        self,
+        share_ids: Dict[Union[str, int], List[Union[str, int]]],
+        fields: List[int],
+        result_ids: List[Union[str, int]],
+    ) -> None:
+        """Reconstructs shared tensors held by this worker and the other shareholders.
+
+        The shares of all the tensors are requested from each other shareholder in
+        a single message, see get_shares, and combined here. The reconstructed
+        tensors are then sent to each other shareholder in a single message, and
+        stored under result_ids on every shareholder.
+
+        Args:
+            share_ids: The ids of the shares of each shareholder, by shareholder id,
+                in the same order for all the shareholders.
+            fields: The size of the field of each shared tensor.
+            result_ids: The ids of the reconstructed tensors.
+        """
+        shares = [[] for _ in fields]
+        for worker_id, ids in share_ids.items():
+            if worker_id == self.id:
+                worker_shares = self.get_shares(ids)
+            else:
+                worker_shares = self.send_msg(
+                    self.create_worker_command_message("get_shares", None, ids),
+                    self.get_worker(worker_id),
+                )
+            for tensor_shares, share in zip(shares, worker_shares):
+                tensor_shares.append(share)
+
+        results = []
+        for tensor_shares, field, result_id in zip(shares, fields, result_ids):
+            result = sy.AdditiveSharingTensor.combine_shares(tensor_shares, field)
+            result.id = result_id
+            results.append(result)
+
+        for worker_id in share_ids:
+            if worker_id != self.id:
+                self.send_msg(
+                    self.create_worker_command_message("load_data", None, results),
+                    self.get_worker(worker_id),
+                )
+        self.load_data(results)
+
     @property
     def serializer(self, workers=None) -> codes.TENSOR_SERIALIZATION:
         """
@@ -1176,6 +2076,7 @@ class BaseWorker(AbstractWorker, ObjectStorage):
             A str code:
                 'all': serialization must be compatible with all kinds of workers
                 'torch': serialization will only work between workers that support PyTorch
+                'raw': same as 'torch' with the raw tensor format, if set as torch_serialization
                 (more to come: 'tensorflow', 'numpy', etc)
         """
         if workers is not None:
@@ -1197,7 +2098,7 @@ class BaseWorker(AbstractWorker, ObjectStorage):
             frameworks.add(framework)
 
         if len(frameworks) == 1 and frameworks == {"torch"}:
-            return codes.TENSOR_SERIALIZATION.TORCH
+            return self.torch_serialization
         else:
             return codes.TENSOR_SERIALIZATION.ALL
 
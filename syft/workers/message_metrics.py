@@ -0,0 +1,253 @@
+"""
+Metrics of the messages sent and received by a worker.
+
+For each message type and operation, the metrics count the messages and the
+bytes serialized, and sum the time spent in each phase of their processing:
+
+- serialize: simplifying and serializing the message (or the response)
+- transport: waiting for the response of the remote worker, for messages sent
+- execute: running the message, for messages received
+- deserialize: deserializing and detailing the response (or the message)
+
+The total latency of the messages is also kept as a histogram.
+
+The messages exchanged in-process between VirtualWorkers are never serialized
+to bytes (see BaseWorker._sends_in_process): they are counted and timed, but
+recorded with 0 bytes.
+
+Workers don't record metrics by default. To record them:
+worker.metrics = MessageMetrics()
+"""
+from bisect import bisect_left
+import threading
+import weakref
+
+SENT = "sent"
+RECEIVED = "received"
+
+PHASES = ("serialize", "transport", "execute", "deserialize")
+
+# The upper bounds in seconds of the buckets of the latency histograms
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def message_op(message: object) -> str:
+    """Returns the operation of a message: the name of the action of a command,
+    the name of a worker or plan command, or an empty string for other messages."""
+    attributes = getattr(message, "__dict__", {})
+    if "action" in attributes:
+        return getattr(attributes["action"], "name", "")
+    return attributes.get("command_name", "")
+
+
+class MessageMetrics:
+    """Metrics of the messages sent and received by a worker, by message type and operation.
+
+    Each thread records its messages in its own dict without any lock, so that
+    recording a message only takes a dict lookup and a few additions, and the
+    metrics can stay enabled on production workers. When a thread exits, its
+    metrics are merged into the metrics of the exited threads.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        # The metrics recorded by each live thread, by id of the dict, see
+        # _new_thread_metrics, and the metrics merged from the exited threads
+        self._threads_metrics = {}
+        self._exited_metrics = {}
+        # reentrant, as a thread may exit while the lock is held by a garbage collection
+        self._lock = threading.RLock()
+
+    def _new_thread_metrics(self) -> dict:
+        """Returns the dict where the current thread records its messages, which holds
+        [count, bytes, time of each phase, latency histogram] by
+        (direction, message type, operation)."""
+        holder = self._local.holder = _ThreadMetrics()
+        with self._lock:
+            self._threads_metrics[id(holder.metrics)] = holder.metrics
+        # the thread-local holder is collected when the thread exits
+        weakref.finalize(
+            holder,
+            _merge_exited_metrics,
+            self._lock,
+            self._threads_metrics,
+            self._exited_metrics,
+            holder.metrics,
+        )
+        return holder.metrics
+
+    def record(
+        self,
+        direction: str,
+        message: object,
+        n_bytes: int,
+        serialize_time: float = 0.0,
+        transport_time: float = 0.0,
+        execute_time: float = 0.0,
+        deserialize_time: float = 0.0,
+    ):
+        """Records a message sent or received.
+
+        Args:
+            direction: SENT or RECEIVED.
+            message: the message.
+            n_bytes: the number of bytes of the serialized message and response, 0
+                for the messages exchanged in-process.
+            serialize_time: the time spent serializing, in seconds.
+            transport_time: the time spent waiting for the response, in seconds.
+            execute_time: the time spent running the message, in seconds.
+            deserialize_time: the time spent deserializing, in seconds.
+        """
+        try:
+            thread_metrics = self._local.holder.metrics
+        except AttributeError:
+            thread_metrics = self._new_thread_metrics()
+
+        key = (direction, type(message), message_op(message))
+        metrics = thread_metrics.get(key)
+        if metrics is None:
+            histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+            metrics = thread_metrics[key] = [0, 0, 0.0, 0.0, 0.0, 0.0, histogram]
+
+        metrics[0] += 1
+        metrics[1] += n_bytes
+        metrics[2] += serialize_time
+        metrics[3] += transport_time
+        metrics[4] += execute_time
+        metrics[5] += deserialize_time
+        latency = serialize_time + transport_time + execute_time + deserialize_time
+        metrics[6][bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def summary(self) -> dict:
+        """Returns the metrics recorded.
+
+        Returns:
+            A dict of metrics by (direction, message type name, operation). The
+            metrics are the number of messages, the number of bytes, the time spent
+            in each phase in seconds, and the number of messages whose latency is
+            lower than or equal to each bound of LATENCY_BUCKETS (and to infinity).
+        """
+        # sum the metrics of all the threads, by message type name
+        totals = {}
+        with self._lock:
+            for thread_metrics in [self._exited_metrics, *self._threads_metrics.values()]:
+                _add_metrics(totals, thread_metrics, by_type_name=True)
+
+        summary = {}
+        for key, total in totals.items():
+            cumulated = 0
+            buckets = {}
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), total[6]):
+                cumulated += count
+                buckets[bound] = cumulated
+
+            summary[key] = {"count": total[0], "bytes": total[1], "latency_buckets": buckets}
+            for phase, phase_time in zip(PHASES, total[2:6]):
+                summary[key][f"{phase}_time"] = phase_time
+        return summary
+
+    def reset(self):
+        """Forgets the metrics recorded."""
+        with self._lock:
+            self._exited_metrics.clear()
+            for thread_metrics in self._threads_metrics.values():
+                thread_metrics.clear()
+
+    def to_prometheus(self, worker_id=None, prefix: str = "syft") -> str:
+        """Returns the metrics in the Prometheus text exposition format.
+
+        Args:
+            worker_id: if provided, added to the metrics as a "worker" label.
+            prefix: the prefix of the names of the metrics.
+        """
+        summary = self.summary()
+
+        def labels(key, **extra):
+            direction, message_type, op = key
+            pairs = [("direction", direction), ("message_type", message_type), ("op", op)]
+            if worker_id is not None:
+                pairs.insert(0, ("worker", worker_id))
+            pairs.extend(extra.items())
+            return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+        lines = [
+            f"# HELP {prefix}_messages_total Number of messages sent or received.",
+            f"# TYPE {prefix}_messages_total counter",
+        ]
+        lines += [
+            f"{prefix}_messages_total{{{labels(key)}}} {metrics['count']}"
+            for key, metrics in summary.items()
+        ]
+
+        lines += [
+            f"# HELP {prefix}_message_bytes_total Bytes of the messages and of their responses "
+            "(0 for in-process messages).",
+            f"# TYPE {prefix}_message_bytes_total counter",
+        ]
+        lines += [
+            f"{prefix}_message_bytes_total{{{labels(key)}}} {metrics['bytes']}"
+            for key, metrics in summary.items()
+        ]
+
+        lines += [
+            f"# HELP {prefix}_message_phase_seconds_total Time spent in each phase of the messages.",
+            f"# TYPE {prefix}_message_phase_seconds_total counter",
+        ]
+        lines += [
+            f"{prefix}_message_phase_seconds_total{{{labels(key, phase=phase)}}} "
+            f"{metrics[f'{phase}_time']}"
+            for key, metrics in summary.items()
+            for phase in PHASES
+        ]
+
+        lines += [
+            f"# HELP {prefix}_message_latency_seconds Latency of the messages.",
+            f"# TYPE {prefix}_message_latency_seconds histogram",
+        ]
+        for key, metrics in summary.items():
+            for bound, count in metrics["latency_buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{prefix}_message_latency_seconds_bucket{{{labels(key, le=le)}}} {count}"
+                )
+            total_time = sum(metrics[f"{phase}_time"] for phase in PHASES)
+            lines.append(f"{prefix}_message_latency_seconds_sum{{{labels(key)}}} {total_time}")
+            lines.append(
+                f"{prefix}_message_latency_seconds_count{{{labels(key)}}} {metrics['count']}"
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _ThreadMetrics:
+    """Holds the metrics of a thread in its thread-local storage, see
+    MessageMetrics._new_thread_metrics."""
+
+    def __init__(self):
+        self.metrics = {}
+
+
+def _add_metrics(totals: dict, metrics_by_key: dict, by_type_name: bool = False):
+    """Adds metrics to totals, by key, or by key with the name of the message type."""
+    for key, metrics in list(metrics_by_key.items()):
+        if by_type_name:
+            direction, message_type, op = key
+            key = (direction, message_type.__name__, op)
+        if key not in totals:
+            totals[key] = [0, 0, 0.0, 0.0, 0.0, 0.0, [0] * (len(LATENCY_BUCKETS) + 1)]
+        total = totals[key]
+        for i in range(6):
+            total[i] += metrics[i]
+        for i, count in enumerate(metrics[6]):
+            total[6][i] += count
+
+
+def _merge_exited_metrics(lock, threads_metrics: dict, exited_metrics: dict, metrics: dict):
+    """Merges the metrics of an exited thread into the metrics of the exited threads."""
+    with lock:
+        threads_metrics.pop(id(metrics), None)
+        _add_metrics(exited_metrics, metrics)
@@ -154,16 +154,19 @@ class NodeClient(WebsocketClientWorker, FederatedClient):
         self.ws.send(json.dumps(message))
         return json.loads(self.ws.recv())
 
-    def _forward_to_websocket_server_worker(self, message: bin) -> bin:
-        """ Send a bin message to a remote node and receive the response.
+    def _send_to_websocket_server_worker(self, message: bin):
+        """ Send a bin message to a remote node.
             Args:
                 message (bytes) : message payload.
+        """
+        self.ws.send_binary(message)
+
+    def _receive_from_websocket_server_worker(self) -> bin:
+        """ Receive the response of a remote node to the bin message sent last.
             Returns:
                 node_response (bytes) : response payload.
         """
-        self.ws.send_binary(message)
-        response = self.ws.recv()
-        return response
+        return self.ws.recv()
 
     def _return_bool_result(self, result, return_key=None):
         if result.get(RESPONSE_MSG.SUCCESS):
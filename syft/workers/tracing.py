@@ -0,0 +1,214 @@
+"""
+Tracing of the messages exchanged by workers.
+
+A worker with a Tracer records a span for each message it sends and receives,
+with the time spent in each phase of their processing:
+
+- send: serialize, transport (waiting for the response) and deserialize
+- receive: deserialize, execute and serialize
+
+The messages sent by a worker with a Tracer carry the id of their trace and of
+the span of the sender (see syft.messaging.message.TracedMessage), so that the
+spans recorded by the receiving workers, and the messages they send in turn,
+belong to the same trace.
+
+The spans are Chrome trace events, which chrome_trace merges across workers to
+be viewed in chrome://tracing or https://ui.perfetto.dev.
+"""
+from contextlib import contextmanager
+import json
+import random
+import threading
+import time
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import TYPE_CHECKING
+
+from syft.workers.message_metrics import message_op
+
+# this if statement avoids circular imports between base.py and tracing.py
+if TYPE_CHECKING:
+    from syft.workers.base import BaseWorker
+
+# The trace and span ids of the current thread, see context
+_context = threading.local()
+
+# Offset from time.perf_counter() to the time since the epoch, so that the spans
+# of the workers of different processes can be merged
+_PERF_COUNTER_OFFSET = time.time() - time.perf_counter()
+
+
+def new_id() -> int:
+    """Returns a random trace or span id, which fits in a signed 64 bits integer."""
+    return random.getrandbits(63)
+
+
+def current_context() -> Tuple[int, int]:
+    """Returns the trace id and the span id of the span being run by this
+    thread, or (None, None) outside of any span."""
+    return getattr(_context, "trace_id", None), getattr(_context, "span_id", None)
+
+
+@contextmanager
+def context(trace_id: int, span_id: int):
+    """Sets the span being run by this thread, which becomes the parent of the spans
+    recorded and of the messages sent meanwhile."""
+    previous = current_context()
+    _context.trace_id, _context.span_id = trace_id, span_id
+    try:
+        yield
+    finally:
+        _context.trace_id, _context.span_id = previous
+
+
+class Tracer:
+    """Records the spans of a worker.
+
+    Args:
+        worker_id: the id of the worker, used as the process of its spans.
+    """
+
+    def __init__(self, worker_id: Union[str, int]):
+        self.worker_id = worker_id
+        self.spans = []
+
+    def clear(self):
+        """Forgets the spans recorded."""
+        self.spans = []
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """Records a span around a block of code, in the current trace or in a new one.
+
+        Example:
+            >>> with worker.tracer.span("training step"):
+            ...     loss = model(x.send(bob))
+        """
+        trace_id, parent_id = current_context()
+        if trace_id is None:
+            trace_id = new_id()
+        span_id = new_id()
+
+        start = time.perf_counter()
+        try:
+            with context(trace_id, span_id):
+                yield span_id
+        finally:
+            self._record(name, start, time.perf_counter(), trace_id, span_id, parent_id, **args)
+
+    def trace_message(self, message: object) -> Tuple[int, int]:
+        """Returns the trace id and the span id of a message about to be sent."""
+        trace_id, _ = current_context()
+        if trace_id is None:
+            trace_id = new_id()
+        return trace_id, new_id()
+
+    def record_send(self, traced_message: object, t0: float, t1: float, t2: float, t3: float):
+        """Records the span of a message sent.
+
+        Args:
+            traced_message: the TracedMessage sent.
+            t0, t1, t2, t3: the time.perf_counter() before serializing the message,
+                before sending it, before deserializing the response, and at the end.
+        """
+        _, parent_id = current_context()
+        trace_id, span_id = traced_message.trace_id, traced_message.parent_id
+        message = traced_message.message
+        self._record("send", t0, t3, trace_id, span_id, parent_id, **_message_args(message))
+        self._record_phases(
+            trace_id, span_id, ("serialize", "transport", "deserialize"), t0, t1, t2, t3
+        )
+
+    def record_receive(self, traced_message: object, t0: float, t1: float, t2: float, t3: float):
+        """Records the span of a message received.
+
+        Args:
+            traced_message: the TracedMessage received, with the span_id set while
+                executing it.
+            t0, t1, t2, t3: the time.perf_counter() before deserializing the message,
+                before executing it, before serializing the response, and at the end.
+        """
+        trace_id, span_id = traced_message.trace_id, traced_message.span_id
+        message = traced_message.message
+        self._record(
+            "receive", t0, t3, trace_id, span_id, traced_message.parent_id, **_message_args(message)
+        )
+        self._record_phases(
+            trace_id, span_id, ("deserialize", "execute", "serialize"), t0, t1, t2, t3
+        )
+
+    def _record_phases(self, trace_id: int, span_id: int, phases: tuple, *times: float):
+        for phase, start, end in zip(phases, times, times[1:]):
+            self._record(phase, start, end, trace_id, new_id(), span_id)
+
+    def _record(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        trace_id: int,
+        span_id: int,
+        parent_id: int,
+        **args,
+    ):
+        self.spans.append(
+            {
+                "name": name,
+                "cat": "syft",
+                "ph": "X",
+                # Chrome trace events are timed in microseconds
+                "ts": (start + _PERF_COUNTER_OFFSET) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self.worker_id,
+                "tid": threading.get_ident(),
+                "args": dict(trace_id=trace_id, span_id=span_id, parent_id=parent_id, **args),
+            }
+        )
+
+
+def _message_args(message: object) -> dict:
+    return {"message_type": type(message).__name__, "op": message_op(message)}
+
+
+def chrome_trace(*sources: Union["BaseWorker", List[dict]]) -> dict:
+    """Merges the spans of workers in a Chrome trace.
+
+    Args:
+        sources: workers with a Tracer, or lists of spans, such as the spans of a
+            remote worker returned by WebsocketClientWorker.trace_spans_remote.
+
+    Returns:
+        A dict in the Chrome trace event format, where each worker is a process.
+    """
+    spans = []
+    for source in sources:
+        if isinstance(source, list):
+            spans.extend(source)
+        elif getattr(source, "tracer", None) is not None:
+            spans.extend(source.tracer.spans)
+
+    # Chrome traces identify processes by numbers, and name them with metadata events
+    pids = {}
+    events = []
+    for span in sorted(spans, key=lambda span: span["ts"]):
+        worker_id = span["pid"]
+        if worker_id not in pids:
+            pids[worker_id] = len(pids) + 1
+            events.append(
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": pids[worker_id],
+                    "args": {"name": str(worker_id)},
+                }
+            )
+        events.append(dict(span, pid=pids[worker_id]))
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path: str, *sources: Union["BaseWorker", List[dict]]):
+    """Writes the spans of workers to a Chrome trace JSON file, see chrome_trace."""
+    with open(path, "w") as trace_file:
+        json.dump(chrome_trace(*sources), trace_file)
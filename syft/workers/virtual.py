@@ -1,19 +1,102 @@
+import threading
 from time import sleep
+from typing import List
+from typing import Union
+from typing import TYPE_CHECKING
 
+import syft as sy
+from syft import codes
 from syft.workers.base import BaseWorker
 from syft.federated.federated_client import FederatedClient
 
+# this if statement avoids circular imports between virtual.py and hook.py
+if TYPE_CHECKING:
+    from syft.generic.frameworks.hook.hook import FrameworkHook
+
 
 class VirtualWorker(BaseWorker, FederatedClient):
+    # When True, messages are always serialized, even between in-process workers.
+    # This is useful to check that everything sent between workers is serializable.
+    strict_serde = False
+
+    def __init__(
+        self,
+        hook: "FrameworkHook",
+        id: Union[int, str] = 0,
+        data: Union[List, tuple] = None,
+        is_client_worker: bool = False,
+        log_msgs: bool = False,
+        verbose: bool = False,
+        auto_add: bool = True,
+        message_pending_time: Union[int, float] = 0,
+        in_process: bool = False,
+    ):
+        """Initializes a VirtualWorker.
+
+        Args:
+            in_process: if True, the messages sent to this worker by workers of the
+                same process skip the binary serialization and compression steps.
+                Messages are still simplified and detailed, but tensors are passed
+                by reference and cloned on receive instead of being serialized.
+                This is disabled when VirtualWorker.strict_serde is set, or when
+                this worker logs the messages it receives.
+        """
+        self.in_process = in_process
+        self._in_process_serialization = threading.local()
+
+        super().__init__(
+            hook=hook,
+            id=id,
+            data=data,
+            is_client_worker=is_client_worker,
+            log_msgs=log_msgs,
+            verbose=verbose,
+            auto_add=auto_add,
+            message_pending_time=message_pending_time,
+        )
+
+    @property
+    def serializer(self, workers=None) -> codes.TENSOR_SERIALIZATION:
+        """Passes tensors by reference while simplifying a message for an in-process
+        worker, see BaseWorker.serializer otherwise."""
+        if getattr(self._in_process_serialization, "enabled", False):
+            return codes.TENSOR_SERIALIZATION.IN_PROCESS
+        return super().serializer
+
     def _send_msg(self, message: bin, location: BaseWorker) -> bin:
         """send message to worker location"""
-        if self.message_pending_time > 0:
-            if self.verbose:
-                print(f"pending time of {self.message_pending_time} seconds to send message...")
-            sleep(self.message_pending_time)
-
+        self._wait_pending_time()
         return location._recv_msg(message)
 
     def _recv_msg(self, message: bin) -> bin:
         """receive message"""
         return self.recv_msg(message)
+
+    def _send_msg_in_process(self, simple_message: object, location: BaseWorker) -> object:
+        """send a simplified message to the in-process worker location"""
+        self._wait_pending_time()
+        return location._recv_msg_in_process(simple_message)
+
+    def _sends_in_process(self, location: BaseWorker) -> bool:
+        """Messages to workers of this process which accept in-process messages skip the
+        binary serialization, see BaseWorker._sends_in_process."""
+        return (
+            not VirtualWorker.strict_serde
+            and isinstance(location, VirtualWorker)
+            and location.in_process
+            and not location.log_msgs
+        )
+
+    def _simplify_in_process(self, obj: object) -> object:
+        """Simplifies obj passing its tensors by reference, see serializer."""
+        self._in_process_serialization.enabled = True
+        try:
+            return sy.serde.msgpack.serde._serialize_msgpack_simple(obj, self)
+        finally:
+            self._in_process_serialization.enabled = False
+
+    def _wait_pending_time(self):
+        if self.message_pending_time > 0:
+            if self.verbose:
+                print(f"pending time of {self.message_pending_time} seconds to send message...")
+            sleep(self.message_pending_time)
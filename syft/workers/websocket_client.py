@@ -1,4 +1,9 @@
 import binascii
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Callable
+from typing import Tuple
 from typing import Union
 from typing import List
 
@@ -10,17 +15,63 @@ import ssl
 import time
 
 import syft as sy
+from syft.codes import WEBSOCKET_FRAMES
+from syft.execution.computation import ComputationAction
+from syft.messaging.message import Message
 from syft.messaging.message import ObjectRequestMessage
 from syft.messaging.message import SearchMessage
+from syft.messaging.message import TensorCommandMessage
 from syft.generic.tensor import AbstractTensor
 from syft.workers.base import BaseWorker
 
+from syft.exceptions import ResponseSignatureError
+
 logger = logging.getLogger(__name__)
 
 TIMEOUT_INTERVAL = 60
 
+# The errors after which the connection to the server is considered lost. Timeouts
+# are not among them: the server may still be executing the message.
+CONNECTION_ERRORS = (websocket.WebSocketConnectionClosedException, ConnectionError)
+
+
+class ResponseFuture:
+    """The response of a message sent without waiting for the responses of the
+    previous messages (see WebsocketClientWorker.send_msg_async).
+
+    The response is deserialized by the first call to result(), in the calling
+    thread, as deserialization may register objects on the local worker.
+    """
+
+    def __init__(self, bin_future: Future, resolve: Callable[[bin], object]):
+        self._bin_future = bin_future
+        self._resolve = resolve
+        self._resolved = False
+        self._response = None
+
+    def done(self) -> bool:
+        """Returns whether the response has been received."""
+        return self._bin_future.done()
+
+    def result(self, timeout: float = TIMEOUT_INTERVAL) -> object:
+        """Waits for the response and returns it.
+
+        Args:
+            timeout: the number of seconds to wait for the response.
+
+        Returns:
+            The deserialized response.
+        """
+        if not self._resolved:
+            self._response = self._resolve(self._bin_future.result(timeout))
+            self._resolved = True
+        return self._response
+
 
 class WebsocketClientWorker(BaseWorker):
+
+    connection_errors = CONNECTION_ERRORS
+
     def __init__(
         self,
         hook,
@@ -32,13 +83,35 @@ class WebsocketClientWorker(BaseWorker):
         log_msgs: bool = False,
         verbose: bool = False,
         data: List[Union[torch.Tensor, AbstractTensor]] = None,
+        binary_frames: bool = True,
+        pipelined: bool = False,
     ):
         """A client which will forward all messages to a remote worker running a
         WebsocketServerWorker and receive all responses back from the server.
+
+        Args:
+            binary_frames: whether to request binary websocket frames when connecting.
+                Serialized messages are then sent as they are instead of being
+                hex-encoded into text frames. Servers which don't acknowledge the
+                request during the handshake are talked to with hex-encoded frames.
+            pipelined: whether to request binary frames prefixed with request ids,
+                which lets many messages be in flight at once on the connection
+                (see send_msg_async). Responses are then received by a background
+                thread and matched to their request by id.
         """
 
         self.port = port
         self.host = host
+        self.binary_frames = binary_frames
+        self.use_binary_frames = False
+        self.pipelined = pipelined
+        self.use_pipelining = False
+
+        # futures of the requests sent on the current pipelined connection, by
+        # request id. Each connection has its own, see _create_connection
+        self._pending_requests = {}
+        self._request_ids = itertools.count()
+        self._send_lock = threading.Lock()
 
         super().__init__(
             hook=hook,
@@ -61,13 +134,94 @@ class WebsocketClientWorker(BaseWorker):
         return f"wss://{self.host}:{self.port}" if self.secure else f"ws://{self.host}:{self.port}"
 
     def connect(self):
+        self.ws = self._create_connection()
+        self._log_msgs_remote(self.log_msgs)
+
+    def _create_connection(self):
+        """Opens a websocket connection to the server and negotiates the frame mode.
+
+        Binary frames are only used if they were requested and the server
+        acknowledged them in its handshake response, so that older servers
+        keep receiving hex-encoded text frames.
+        """
         args = {"max_size": None, "timeout": TIMEOUT_INTERVAL, "url": self.url}
 
         if self.secure:
             args["sslopt"] = {"cert_reqs": ssl.CERT_NONE}
 
-        self.ws = websocket.create_connection(**args)
-        self._log_msgs_remote(self.log_msgs)
+        # frame modes in order of preference, the server acknowledges the
+        # first one it supports
+        frame_modes = []
+        if self.binary_frames:
+            if self.pipelined:
+                frame_modes.append(WEBSOCKET_FRAMES.PIPELINED)
+            frame_modes.append(WEBSOCKET_FRAMES.BINARY)
+            args["header"] = [f"{WEBSOCKET_FRAMES.HEADER}: {', '.join(frame_modes)}"]
+
+        ws = websocket.create_connection(**args)
+
+        # websocket-client stores the handshake response headers lowercased
+        headers = ws.getheaders() or {}
+        frame_mode = headers.get(WEBSOCKET_FRAMES.HEADER.lower())
+        self.use_binary_frames = frame_mode in frame_modes
+        self.use_pipelining = frame_mode == WEBSOCKET_FRAMES.PIPELINED
+
+        if self.use_pipelining:
+            # the requests sent on a previous connection are failed by its own receiver
+            pending_requests = self._pending_requests = {}
+            receiver = threading.Thread(
+                target=self._receive_responses, args=(ws, pending_requests), daemon=True
+            )
+            receiver.start()
+
+        return ws
+
+    def _receive_responses(self, ws: websocket.WebSocket, pending_requests: dict):
+        """Receives the responses of a pipelined connection and resolves the
+        futures of the matching requests.
+
+        Args:
+            ws: the connection.
+            pending_requests: the futures of the requests sent on this connection,
+                by request id.
+        """
+        try:
+            while True:
+                frame = ws.recv()
+                if not frame:
+                    raise websocket.WebSocketConnectionClosedException(
+                        "Websocket connection closed"
+                    )
+                request_id = int.from_bytes(frame[: WEBSOCKET_FRAMES.REQUEST_ID_SIZE], "big")
+                future = pending_requests.pop(request_id, None)
+                if future is not None:
+                    future.set_result(frame[WEBSOCKET_FRAMES.REQUEST_ID_SIZE :])
+        except Exception as e:
+            # the connection is closed: no response will arrive anymore
+            for request_id in list(pending_requests):
+                future = pending_requests.pop(request_id, None)
+                if future is not None:
+                    future.set_exception(e)
+
+    def _send_frame(self, message: bin) -> Future:
+        """Sends a message on a pipelined connection without waiting for its response.
+
+        Returns:
+            A future holding the binary response.
+        """
+        request_id = next(self._request_ids)
+        future = Future()
+        pending_requests = self._pending_requests
+        pending_requests[request_id] = future
+        try:
+            with self._send_lock:
+                self.ws.send_binary(
+                    request_id.to_bytes(WEBSOCKET_FRAMES.REQUEST_ID_SIZE, "big") + message
+                )
+        except Exception:
+            pending_requests.pop(request_id, None)
+            raise
+        return future
 
     def close(self):
         self.ws.shutdown()
@@ -83,28 +237,161 @@ class WebsocketClientWorker(BaseWorker):
     def _send_msg(self, message: bin, location=None) -> bin:
         return self._recv_msg(message)
 
-    def _forward_to_websocket_server_worker(self, message: bin) -> bin:
-        self.ws.send(str(binascii.hexlify(message)))
-        response = binascii.unhexlify(self.ws.recv()[2:-1])
-        return response
+    def _send_to_websocket_server_worker(self, message: bin):
+        """Sends a message in a frame of the frame mode of the connection, without
+        request id."""
+        if self.use_binary_frames:
+            self.ws.send_binary(message)
+        else:
+            self.ws.send(str(binascii.hexlify(message)))
+
+    def _receive_from_websocket_server_worker(self) -> bin:
+        """Receives the response to the message sent last, see
+        _send_to_websocket_server_worker."""
+        response = self.ws.recv()
+        if not response:
+            raise websocket.WebSocketConnectionClosedException("Websocket connection closed")
+        if self.use_binary_frames:
+            return response
+        return binascii.unhexlify(response[2:-1])
 
     def _recv_msg(self, message: bin) -> bin:
-        """Forwards a message to the WebsocketServerWorker"""
-        response = self._forward_to_websocket_server_worker(message)
-        if not self.ws.connected:
-            logger.warning("Websocket connection closed (worker: %s)", self.id)
-            self.ws.shutdown()
-            time.sleep(0.1)
-            # Avoid timing out on the server-side
-            self.ws = websocket.create_connection(self.url, max_size=None, timeout=TIMEOUT_INTERVAL)
-            logger.warning("Created new websocket connection")
-            time.sleep(0.1)
-            response = self._forward_to_websocket_server_worker(message)
-            if not self.ws.connected:
-                raise RuntimeError(
-                    "Websocket connection closed and creation of new connection failed."
-                )
-        return response
+        """Forwards a message to the WebsocketServerWorker.
+
+        If the connection is lost before the message is sent, the message is sent
+        again on a new connection. Once it is sent, the server may have executed it:
+        the error is raised instead of sending the message twice, like timeouts.
+        """
+        if self.use_pipelining:
+            return self._send_msg_async(message).result(timeout=TIMEOUT_INTERVAL)
+
+        try:
+            self._send_to_websocket_server_worker(message)
+        except CONNECTION_ERRORS as e:
+            logger.warning("Websocket connection failed (worker: %s): %r", self.id, e)
+            self._reconnect()
+            self._send_to_websocket_server_worker(message)
+
+        return self._receive_from_websocket_server_worker()
+
+    def _reconnect(self):
+        """Replaces a closed connection with a new one. On a pipelined connection, the
+        requests in flight on the closed connection fail."""
+        logger.warning("Websocket connection closed (worker: %s)", self.id)
+        self.ws.shutdown()
+        time.sleep(0.1)
+        # Avoid timing out on the server-side
+        self.ws = self._create_connection()
+        logger.warning("Created new websocket connection")
+        time.sleep(0.1)
+
+    def _send_msg_async(self, message: bin) -> Future:
+        if self.use_pipelining:
+            # a frame which fails to be sent isn't received by the server, while the
+            # requests in flight when the connection is lost fail without being resent
+            try:
+                return self._send_frame(message)
+            except CONNECTION_ERRORS as e:
+                logger.warning("Websocket connection failed (worker: %s): %r", self.id, e)
+                self._reconnect()
+                return self._send_frame(message)
+
+        # without request ids, the response must be received before sending another message
+        future = Future()
+        future.set_result(self._recv_msg(message))
+        return future
+
+    def send_msg_async(self, message: Message) -> ResponseFuture:
+        """Sends a message to the remote worker without waiting for its response.
+
+        On a pipelined connection, many messages can be in flight at once and their
+        responses are matched to the requests by id. On other connections, the
+        message is sent synchronously. Like BaseWorker.send_msg, the messages pending
+        for this worker are sent first, and the message is traced and recorded in
+        the metrics of the local worker.
+
+        Args:
+            message: the message to send.
+
+        Returns:
+            A ResponseFuture holding the deserialized response.
+        """
+        return ResponseFuture(*self._send_msg_async_from(self.hook.local_worker, message))
+
+    def send_command_async(self, message: tuple, return_ids: tuple = None) -> ResponseFuture:
+        """Sends a command to the remote worker without waiting for its response.
+
+        This is the asynchronous counterpart of BaseWorker.send_command, called on
+        the local worker with this worker as recipient: while this worker is batched,
+        the command is buffered instead.
+
+        Args:
+            message: A tuple (name, target, args, kwargs) representing the command.
+            return_ids: A tuple of ids for the results of the command.
+
+        Returns:
+            A ResponseFuture holding the PointerTensor(s) to the results.
+        """
+        if return_ids is None:
+            return_ids = tuple([sy.ID_PROVIDER.pop()])
+
+        local_worker = self.hook.local_worker
+        name, target, args_, kwargs_ = message
+
+        if self._command_batch is not None:
+            self.buffer_command(
+                local_worker, ComputationAction(name, target, args_, kwargs_, return_ids)
+            )
+            buffered = Future()
+            buffered.set_result(None)
+            return ResponseFuture(
+                buffered, lambda _: local_worker.build_command_response(self, None, return_ids)
+            )
+
+        command = TensorCommandMessage.computation(name, target, args_, kwargs_, return_ids)
+        bin_future, deserialize = self._send_msg_async_from(local_worker, command)
+
+        def resolve(bin_response: bin):
+            ids = return_ids
+            try:
+                ret_val = deserialize(bin_response)
+            except ResponseSignatureError as e:
+                ret_val = None
+                ids = e.ids_generated
+            return local_worker.build_command_response(self, ret_val, ids)
+
+        return ResponseFuture(bin_future, resolve)
+
+    def _send_msg_async_from(
+        self, sender: BaseWorker, message: Message
+    ) -> Tuple[Future, Callable[[bin], object]]:
+        """Sends a message of sender to this worker without waiting for its response,
+        see BaseWorker.send_msg.
+
+        Returns:
+            A future holding the binary response, and the function deserializing it
+            and recording the message in the metrics and spans of sender.
+        """
+        if sender.verbose:
+            print(f"worker {sender} sending {message} to {self}")
+
+        # send what is pending for this worker first, to keep the order
+        sender._send_pending_msgs(message, self)
+
+        t0 = time.perf_counter()
+        sent_message = sender._traced(message)
+        request = sy.serde.serialize(sent_message, worker=sender)
+
+        t1 = time.perf_counter()
+        bin_future = self._send_msg_async(request)
+
+        def deserialize(bin_response: bin) -> object:
+            t2 = time.perf_counter()
+            response = sy.serde.deserialize(bin_response, worker=sender)
+            sender._record_sent(message, sent_message, len(request) + len(bin_response), t0, t1, t2)
+            return response
+
+        return bin_future, deserialize
 
     def _send_msg_and_deserialize(self, command_name: str, *args, **kwargs):
         message = self.create_worker_command_message(command_name=command_name, *args, **kwargs)
@@ -120,6 +407,12 @@ class WebsocketClientWorker(BaseWorker):
     def objects_count_remote(self):
         return self._send_msg_and_deserialize("objects_count")
 
+    def prometheus_metrics_remote(self):
+        return self._send_msg_and_deserialize("prometheus_metrics")
+
+    def trace_spans_remote(self):
+        return self._send_msg_and_deserialize("trace_spans")
+
     def _get_msg_remote(self, index):
         return self._send_msg_and_deserialize("_get_msg", index=index)
 
@@ -154,7 +447,10 @@ class WebsocketClientWorker(BaseWorker):
 
             # Send the message and return the deserialized response.
             serialized_message = sy.serde.serialize(message)
-            await websocket.send(str(binascii.hexlify(serialized_message)))
+            if self.use_binary_frames:
+                await websocket.send(serialized_message)
+            else:
+                await websocket.send(str(binascii.hexlify(serialized_message)))
             await websocket.recv()  # returned value will be None, so don't care
 
         # Reopen the standard connection
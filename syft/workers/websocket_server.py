@@ -1,9 +1,13 @@
 import asyncio
 import binascii
+from http import HTTPStatus
 import logging
 import socket
 import ssl
 import sys
+import time
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 from typing import List
 
@@ -12,8 +16,11 @@ import torch
 import websockets
 
 import syft as sy
+from syft.codes import WEBSOCKET_FRAMES
 from syft.federated.federated_client import FederatedClient
 from syft.generic.tensor import AbstractTensor
+from syft.messaging.message import Message
+from syft.workers import message_metrics
 from syft.workers.virtual import VirtualWorker
 
 from syft.exceptions import GetNotPermittedError
@@ -35,6 +42,10 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         loop=None,
         cert_path: str = None,
         key_path: str = None,
+        binary_frames: bool = True,
+        executor: Union[int, Executor] = None,
+        metrics: "message_metrics.MessageMetrics" = None,
+        metrics_path: str = "/metrics",
     ):
         """This is a simple extension to normal workers wherein
         all messages are passed over websockets. Note that because
@@ -56,74 +67,315 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
                 yourself
             cert_path: path to used secure certificate, only needed for secure connections
             key_path: path to secure key, only needed for secure connections
+            binary_frames: whether to acknowledge clients asking for binary websocket
+                frames during the handshake. Clients which don't ask for them keep
+                using hex-encoded text frames.
+            executor: if provided, the received frames are decoded and the responses
+                encoded concurrently on this executor, off the event loop. Either the
+                number of threads of a ThreadPoolExecutor or an Executor instance. As
+                the state of the worker isn't thread-safe, the messages of all the
+                connections are still executed one at a time, on a dedicated thread,
+                in the order they were received on each connection. With an executor
+                which doesn't run threads of this process, such as a
+                ProcessPoolExecutor, only the frames are decoded on the executor and
+                the responses are encoded on a thread pool of this process.
+            metrics: the MessageMetrics recording the messages of this worker, see
+                syft.workers.message_metrics. Messages are not recorded when None.
+            metrics_path: the HTTP path on which the metrics of the messages of this
+                worker are served in the Prometheus text format, see prometheus_metrics.
+                The metrics are not served when None.
         """
 
         self.port = port
         self.host = host
         self.cert_path = cert_path
         self.key_path = key_path
+        self.binary_frames = binary_frames
+        self.metrics_path = metrics_path
 
         if loop is None:
             loop = asyncio.new_event_loop()
 
-        # this queue is populated when messages are received
-        # from a client
-        self.broadcast_queue = asyncio.Queue()
-
         # this is the asyncio event loop
         self.loop = loop
 
+        if isinstance(executor, int):
+            executor = ThreadPoolExecutor(max_workers=executor)
+        self.executor = executor
+
+        # the single thread executing the messages of all the connections when an
+        # executor is used, and the threads encoding the responses: the executor itself
+        # if it runs threads, since the responses are encoded in this process
+        self._execution_thread = None
+        self._encoding_threads = executor
+        if executor is not None:
+            self._execution_thread = ThreadPoolExecutor(max_workers=1)
+            if not isinstance(executor, ThreadPoolExecutor):
+                self._encoding_threads = ThreadPoolExecutor()
+
         # call BaseWorker constructor
         super().__init__(hook=hook, id=id, data=data, log_msgs=log_msgs, verbose=verbose)
 
-    async def _consumer_handler(self, websocket: websockets.WebSocketCommonProtocol):
+        self.metrics = metrics
+
+    async def _consumer_handler(
+        self, websocket: websockets.WebSocketCommonProtocol, queue: asyncio.Queue
+    ):
         """This handler listens for messages from WebsocketClientWorker
         objects.
 
         Args:
             websocket: the connection object to receive messages from and
                 add them into the queue.
+            queue: the queue of the messages received on this connection.
 
         """
         try:
             while True:
                 msg = await websocket.recv()
-                await self.broadcast_queue.put(msg)
+                await queue.put(msg)
         except websockets.exceptions.ConnectionClosed:
-            self._consumer_handler(websocket)
+            self._consumer_handler(websocket, queue)
 
-    async def _producer_handler(self, websocket: websockets.WebSocketCommonProtocol):
+    async def _producer_handler(
+        self,
+        websocket: websockets.WebSocketCommonProtocol,
+        queue: asyncio.Queue,
+        pipelined: bool = False,
+    ):
         """This handler listens to the queue and processes messages as they
         arrive.
 
         Args:
             websocket: the connection object we use to send responses
                 back to the client.
+            queue: the queue of the messages received on this connection.
+            pipelined: whether the frames of this connection carry request ids.
 
         """
         while True:
 
             # get a message from the queue
-            message = await self.broadcast_queue.get()
-
-            # convert that string message to the binary it represent
-            message = binascii.unhexlify(message[2:-1])
+            message = await queue.get()
 
             # process the message
-            response = self._recv_msg(message)
-
-            # convert the binary to a string representation
-            # (this is needed for the websocket library)
-            response = str(binascii.hexlify(response))
+            response = self._process_frame(message, pipelined)
 
             # send the response
             await websocket.send(response)
 
+    async def _scheduler_handler(
+        self, queue: asyncio.Queue, responses: asyncio.Queue, pipelined: bool = False
+    ):
+        """This handler schedules the processing of the messages of a connection
+        as they arrive.
+
+        Args:
+            queue: the queue of the messages received on this connection.
+            responses: the queue of the pending executions whose responses
+                must be sent back to the client. Responses are sent in the order
+                of the requests, unless the connection is pipelined in which case
+                they are sent as soon as they are ready.
+            pipelined: whether the frames of this connection carry request ids.
+
+        """
+        # resolved once the previous message of this connection is queued for execution
+        previous_submission = None
+        while True:
+            message = await queue.get()
+            submission = asyncio.get_event_loop().create_future()
+            response = asyncio.ensure_future(
+                self._execute_frame(message, pipelined, previous_submission, submission)
+            )
+            previous_submission = submission
+            if pipelined:
+                response.add_done_callback(responses.put_nowait)
+            else:
+                await responses.put(response)
+
+    async def _response_handler(
+        self, websocket: websockets.WebSocketCommonProtocol, responses: asyncio.Queue
+    ):
+        """This handler sends the responses back to the client as the executions
+        scheduled by _scheduler_handler complete.
+
+        Args:
+            websocket: the connection object we use to send responses
+                back to the client.
+            responses: the queue of the pending executions.
+
+        """
+        while True:
+            execution = await responses.get()
+            response = await execution
+            await websocket.send(response)
+
+    def _process_frame(
+        self, message: Union[bytes, str], pipelined: bool = False
+    ) -> Union[bytes, str]:
+        """Processes a message received in a websocket frame and returns the
+        response in the same frame mode."""
+        if isinstance(message, bytes):
+            if pipelined:
+                # pipelined frames start with the id of the request, which
+                # is sent back along with the response
+                request_id = message[: WEBSOCKET_FRAMES.REQUEST_ID_SIZE]
+                return request_id + self._recv_msg(message[WEBSOCKET_FRAMES.REQUEST_ID_SIZE :])
+
+            # binary frames carry the serialized message as it is
+            return self._recv_msg(message)
+
+        # convert that string message to the binary it represent
+        message = binascii.unhexlify(message[2:-1])
+
+        # process the message
+        response = self._recv_msg(message)
+
+        # convert the binary to a string representation
+        # (this is needed for the websocket library)
+        return str(binascii.hexlify(response))
+
+    async def _execute_frame(
+        self,
+        message: Union[bytes, str],
+        pipelined: bool,
+        previous_submission: asyncio.Future,
+        submission: asyncio.Future,
+    ) -> Union[bytes, str]:
+        """Processes a message received in a websocket frame: it is decoded on the
+        executor, executed on the execution thread after the previous message of the
+        connection, and its response is encoded on the encoding threads.
+
+        As without an executor, an error raised while decoding or executing the
+        message, other than the errors sent back to the client by _recv_msg, closes
+        the connection.
+
+        Args:
+            message: the content of the frame.
+            pipelined: whether the frames of this connection carry request ids.
+            previous_submission: resolved once the previous message of the connection
+                is queued on the execution thread, None for the first message.
+            submission: resolved once this message is queued on the execution thread,
+                or once the previous message is if this one can't be decoded.
+
+        Returns:
+            The response frame, in the same frame mode as the message.
+        """
+        loop = asyncio.get_event_loop()
+        try:
+            decoded = await loop.run_in_executor(self.executor, _decode_frame, message, pipelined)
+            if previous_submission is not None:
+                await previous_submission
+            # the execution thread runs the messages in the order they are queued
+            execution = loop.run_in_executor(
+                self._execution_thread, self._execute_frame_msg, decoded
+            )
+        finally:
+            if previous_submission is None or previous_submission.done():
+                submission.set_result(None)
+            else:
+                previous_submission.add_done_callback(lambda _: submission.set_result(None))
+
+        executed = await execution
+        request_id, is_text, bin_message, msg, simple_response, response_type, durations = executed
+        bin_response = await loop.run_in_executor(
+            self._encoding_threads, self._encode_response, simple_response, response_type
+        )
+
+        if msg is not None:
+            # recorded on the execution thread, the only one touching the worker
+            self._execution_thread.submit(
+                self._record_frame, msg, len(bin_message) + len(bin_response), durations
+            )
+
+        return _frame(bin_response, is_text, request_id)
+
+    def _execute_frame_msg(self, decoded: tuple) -> tuple:
+        """Details, executes and simplifies the response of a decoded message, see
+        BaseWorker.recv_msg. This is the only step which touches the state of the
+        worker, it runs on the execution threads."""
+        request_id, is_text, bin_message, simple_msg, decode_time = decoded
+
+        if self.log_msgs:
+            self.msg_history.append(bin_message)
+
+        t1 = time.perf_counter()
+        msg = None
+        try:
+            msg = sy.serde.msgpack.serde._deserialize_msgpack_simple(simple_msg, self)
+            t2 = time.perf_counter()
+            response = self._execute_msg(msg)
+        except (ResponseSignatureError, GetNotPermittedError) as e:
+            t2 = time.perf_counter()
+            response = e
+
+        t3 = time.perf_counter()
+        simple_response = sy.serde.msgpack.serde._serialize_msgpack_simple(response, self)
+        durations = (decode_time + t2 - t1, t3 - t2, time.perf_counter() - t3)
+
+        return request_id, is_text, bin_message, msg, simple_response, type(response), durations
+
+    def _encode_response(self, simple_response: object, response_type: type) -> bin:
+        """Serializes and compresses the simplified response of a message, with the
+        compression policy of this worker."""
+        return sy.serde.msgpack.serde._serialize_msgpack_binary(
+            simple_response, self, obj_type=response_type
+        )
+
+    def _record_frame(self, msg: Message, n_bytes: int, durations: tuple):
+        """Records a message received in a websocket frame in the metrics and spans of
+        this worker, once its response is encoded."""
+        deserialize_time, execute_time, simplify_time = durations
+        t2 = time.perf_counter() - simplify_time
+        t1 = t2 - execute_time
+        self._record_received(msg, n_bytes, t1 - deserialize_time, t1, t2)
+
     def _recv_msg(self, message: bin) -> bin:
         try:
             return self.recv_msg(message)
         except (ResponseSignatureError, GetNotPermittedError) as e:
-            return sy.serde.serialize(e)
+            return sy.serde.serialize(e, worker=self)
+
+    def _handshake_headers(self, path: str, request_headers) -> List[tuple]:
+        """Acknowledges the first frame mode asked by the client which this server supports.
+
+        Clients list the frame modes they support in order of preference. Pipelined
+        frames are binary frames prefixed with a request id.
+
+        Args:
+            path: the request path of the handshake
+            request_headers: the HTTP headers sent by the client
+
+        Returns:
+            The extra headers to add to the handshake response.
+        """
+        if not self.binary_frames:
+            return []
+
+        requested_modes = request_headers.get(WEBSOCKET_FRAMES.HEADER, "").split(",")
+        for mode in requested_modes:
+            mode = mode.strip()
+            if mode in (WEBSOCKET_FRAMES.PIPELINED, WEBSOCKET_FRAMES.BINARY):
+                return [(WEBSOCKET_FRAMES.HEADER, mode)]
+        return []
+
+    async def _process_request(self, path: str, request_headers):
+        """Answers the HTTP requests to metrics_path with the metrics of this worker,
+        instead of opening a websocket connection.
+
+        Args:
+            path: the request path
+            request_headers: the HTTP headers sent by the client
+
+        Returns:
+            The HTTP status, headers and body of the response to the metrics requests,
+            None for the other requests.
+        """
+        if self.metrics_path is None or path != self.metrics_path:
+            return None
+
+        headers = [("Content-Type", "text/plain; version=0.0.4; charset=utf-8")]
+        return HTTPStatus.OK, headers, self.prometheus_metrics().encode("utf-8")
 
     async def _handler(self, websocket: websockets.WebSocketCommonProtocol, *unused_args):
         """Setup the consumer and producer response handlers with asyncio.
@@ -134,13 +386,26 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         """
 
         asyncio.set_event_loop(self.loop)
-        consumer_task = asyncio.ensure_future(self._consumer_handler(websocket))
-        producer_task = asyncio.ensure_future(self._producer_handler(websocket))
 
-        done, pending = await asyncio.wait(
-            [consumer_task, producer_task], return_when=asyncio.FIRST_COMPLETED
+        # this queue is populated when messages are received from the client
+        queue = asyncio.Queue()
+
+        pipelined = websocket.response_headers.get(WEBSOCKET_FRAMES.HEADER) == (
+            WEBSOCKET_FRAMES.PIPELINED
         )
 
+        handlers = [self._consumer_handler(websocket, queue)]
+        if self.executor is None:
+            handlers.append(self._producer_handler(websocket, queue, pipelined))
+        else:
+            responses = asyncio.Queue()
+            handlers.append(self._scheduler_handler(queue, responses, pipelined))
+            handlers.append(self._response_handler(websocket, responses))
+
+        tasks = [asyncio.ensure_future(handler) for handler in handlers]
+
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
         for task in pending:
             task.cancel()
 
@@ -158,6 +423,8 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
                 max_size=None,
                 ping_timeout=None,
                 close_timeout=None,
+                extra_headers=self._handshake_headers,
+                process_request=self._process_request,
             )
         else:
             # Insecure
@@ -168,6 +435,8 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
                 max_size=None,
                 ping_timeout=None,
                 close_timeout=None,
+                extra_headers=self._handshake_headers,
+                process_request=self._process_request,
             )
 
         asyncio.get_event_loop().run_until_complete(start_server)
@@ -182,3 +451,49 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
 
     def objects_count(self, *args):
         return len(self._objects)
+
+    def prometheus_metrics(self, *args) -> str:
+        """Returns the metrics of the messages of this worker in the Prometheus text format."""
+        if self.metrics is None:
+            return ""
+        return self.metrics.to_prometheus(worker_id=self.id)
+
+    def trace_spans(self, *args) -> list:
+        """Returns the spans recorded by this worker, see syft.workers.tracing."""
+        if self.tracer is None:
+            return []
+        return self.tracer.spans
+
+
+def _decode_frame(message: Union[bytes, str], pipelined: bool) -> tuple:
+    """Decompresses and decodes the msgpack form of the message of a frame, which
+    doesn't touch the state of the worker and can run in another process.
+
+    Returns:
+        The request id (or None), whether the frame is a text frame, the binary
+        message, its msgpack form and the time spent decoding it.
+    """
+    t0 = time.perf_counter()
+    request_id = None
+    if not isinstance(message, bytes):
+        bin_message = binascii.unhexlify(message[2:-1])
+    elif pipelined:
+        request_id = message[: WEBSOCKET_FRAMES.REQUEST_ID_SIZE]
+        bin_message = message[WEBSOCKET_FRAMES.REQUEST_ID_SIZE :]
+    else:
+        bin_message = message
+
+    simple_msg = sy.serde.msgpack.serde._deserialize_msgpack_binary(bin_message)
+    is_text = not isinstance(message, bytes)
+    return request_id, is_text, bin_message, simple_msg, time.perf_counter() - t0
+
+
+def _frame(bin_response: bin, is_text: bool, request_id: bytes = None) -> Union[bytes, str]:
+    """Puts a binary response in a frame of the given frame mode."""
+    if is_text:
+        # convert the binary to a string representation
+        # (this is needed for the websocket library)
+        return str(binascii.hexlify(bin_response))
+    if request_id is not None:
+        return request_id + bin_response
+    return bin_response
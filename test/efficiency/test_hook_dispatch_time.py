@@ -0,0 +1,54 @@
+import time
+
+import torch
+
+import syft
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+
+def time_per_call(method, *args, n_calls=10000):
+    t0 = time.time()
+    for _ in range(n_calls):
+        method(*args)
+    return (time.time() - t0) / n_calls
+
+
+@assert_time(max_time=10)
+def test_native_method_overhead(hook):
+    """Measures the overhead per call of the hooked methods of native tensors over
+    the unhooked torch methods."""
+    x = torch.tensor([1.0, 2.0, 3.0])
+    y = torch.tensor([4.0, 5.0, 6.0])
+
+    for method_name, args in [("add", (y,)), ("__mul__", (2,)), ("abs", ()), ("sum", ())]:
+        hooked_time = time_per_call(getattr(x, method_name), *args)
+        native_time = time_per_call(getattr(x, f"native_{method_name}"), *args)
+
+        if PRINT_IN_UNITTESTS:  # pragma: no cover
+            print(
+                f"{method_name}: hooked {hooked_time * 1e6:.2f} us, "
+                f"native {native_time * 1e6:.2f} us, "
+                f"overhead {(hooked_time - native_time) * 1e6:.2f} us"
+            )
+
+
+@assert_time(max_time=10)
+def test_wrapper_method_signatures(hook):
+    """Calls a method of a wrapper with alternating signatures, whose hook functions
+    are all cached instead of being rebuilt at each change of signature."""
+    x = syft.LoggingTensor().on(torch.tensor([1.0, 2.0, 3.0]))
+    y = syft.LoggingTensor().on(torch.tensor([4.0, 5.0, 6.0]))
+
+    t0 = time.time()
+    for _ in range(1000):
+        x.view(3)
+        x.view(1, 3)
+        x + y
+        x + 1
+    call_time = (time.time() - t0) / 4000
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(f"wrapper method: {call_time * 1e6:.2f} us per call")
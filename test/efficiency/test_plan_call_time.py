@@ -0,0 +1,64 @@
+import time
+
+import torch
+
+import syft
+from syft.serde.serde import deserialize
+from syft.serde.serde import serialize
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+N_LAYERS = 25
+
+
+def mlp_plan():
+    """Returns an MLP plan of 4 actions per layer, ie 100 actions."""
+    state = []
+    for _ in range(N_LAYERS):
+        state += [torch.randn(8, 8) / 8, torch.randn(8)]
+
+    @syft.func2plan(args_shape=[(1, 8)], state=tuple(state))
+    def mlp(x, state):
+        params = state.read()
+        for i in range(N_LAYERS):
+            weight, bias = params[2 * i], params[2 * i + 1]
+            x = x.matmul(weight).add(bias).relu().mul(0.5)
+        return x
+
+    return mlp
+
+
+@assert_time(max_time=20)
+def test_plan_call_overhead(hook):
+    """Measures the time per call of a plan run from its actions, as fetched plans
+    and the plans run by remote workers are, compared to its forward function."""
+    plan = mlp_plan()
+    assert len(plan.actions) == 4 * N_LAYERS
+    fetched_plan = deserialize(serialize(plan))
+    x = torch.randn(1, 8)
+
+    # the first call compiles the plan
+    t0 = time.time()
+    fetched_plan(x)
+    first_call_time = time.time() - t0
+
+    n_calls = 200
+    t0 = time.time()
+    for _ in range(n_calls):
+        fetched_plan(x)
+    call_time = (time.time() - t0) / n_calls
+
+    t0 = time.time()
+    for _ in range(n_calls):
+        plan(x)
+    forward_time = (time.time() - t0) / n_calls
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(
+            f"first call: {first_call_time * 1e3:.2f} ms, "
+            f"compiled: {call_time * 1e3:.2f} ms, forward: {forward_time * 1e3:.2f} ms"
+        )
+
+    assert (fetched_plan(x) == plan(x)).all()
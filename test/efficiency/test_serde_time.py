@@ -0,0 +1,81 @@
+import time
+
+import pytest
+import torch
+
+import syft
+from syft.messaging.message import TensorCommandMessage
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+
+def make_message(workers):
+    pointer = torch.tensor([1, 2, 3]).send(workers["bob"]).child
+    return TensorCommandMessage.computation(
+        "__add__", pointer, (pointer, 2), {}, (syft.ID_PROVIDER.pop(),)
+    )
+
+
+def make_pointer(workers):
+    return torch.tensor([1, 2, 3]).send(workers["bob"]).child
+
+
+def make_additive_sharing_tensor(workers):
+    tensor = torch.tensor([1, 2, 3]).share(
+        workers["alice"], workers["bob"], crypto_provider=workers["james"]
+    )
+    return tensor.child
+
+
+def make_plan(workers):
+    @syft.func2plan(args_shape=[(3,)])
+    def plan(x):
+        y = x + x
+        return torch.abs(y) * 2
+
+    return plan
+
+
+@pytest.mark.parametrize(
+    "make_obj", [make_message, make_pointer, make_additive_sharing_tensor, make_plan]
+)
+@assert_time(max_time=20)
+def test_serde_round_trip(workers, make_obj):
+    """Round-trips syft objects through the msgpack simplify/detail steps, whose
+    dispatch to the simplifiers goes through the per-type cache of serde."""
+    me = workers["me"]
+    obj = make_obj(workers)
+    n_round_trips = 1000
+
+    t0 = time.time()
+    for _ in range(n_round_trips):
+        simplified = syft.serde.msgpack.serde._simplify(me, obj)
+    simplify_time = (time.time() - t0) / n_round_trips
+
+    binary = syft.serde.serialize(obj)
+    t0 = time.time()
+    for _ in range(n_round_trips):
+        syft.serde.msgpack.serde._detail(me, simplified)
+    detail_time = (time.time() - t0) / n_round_trips
+
+    assert type(syft.serde.deserialize(binary)) == type(obj)
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(
+            f"{type(obj).__name__}: simplify {simplify_time * 1e6:.0f} us, "
+            f"detail {detail_time * 1e6:.0f} us, {len(binary)} bytes"
+        )
+
+
+@assert_time(max_time=5)
+def test_simplify_nested_collections(workers):
+    """Simplifies collections of simple python objects, which are kept as they are."""
+    me = workers["me"]
+    obj = [(i, str(i), float(i), None) for i in range(1000)]
+
+    for _ in range(100):
+        simplified = syft.serde.msgpack.serde._simplify(me, obj)
+
+    assert syft.serde.msgpack.serde._detail(me, simplified) == obj
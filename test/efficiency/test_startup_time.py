@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+# Regression budgets in seconds, which include importing torch
+IMPORT_TIME_BUDGET = 15
+HOOK_TIME_BUDGET = 5
+
+STARTUP_SCRIPT = """
+import json
+import sys
+import time
+
+t0 = time.perf_counter()
+import syft
+t1 = time.perf_counter()
+import torch
+hook = syft.TorchHook(torch)
+t2 = time.perf_counter()
+
+print(json.dumps({
+    "import_time": t1 - t0,
+    "hook_time": t2 - t1,
+    "modules": [name for name in ("websockets", "phe") if name in sys.modules],
+}))
+"""
+
+
+@assert_time(max_time=60)
+def test_startup_time():
+    """Measures the time to import syft and to hook torch in a new python process, as
+    short-lived workers and command line tools do."""
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], check=True, stdout=subprocess.PIPE
+    ).stdout
+    startup = json.loads(output.decode().strip().splitlines()[-1])
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(
+            f"import syft: {startup['import_time']:.2f} s, "
+            f"TorchHook: {startup['hook_time']:.2f} s"
+        )
+
+    assert startup["import_time"] < IMPORT_TIME_BUDGET
+    assert startup["hook_time"] < HOOK_TIME_BUDGET
+    # the subsystems used by few workers are only imported on their first use
+    assert startup["modules"] == []
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+import torch
+
+import syft
+from syft.codes import TENSOR_SERIALIZATION
+from syft.serde.msgpack import torch_serde
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+
+@pytest.mark.parametrize("size", [1, 100, 10_000, 1_000_000])
+@assert_time(max_time=30)
+def test_tensor_serialization_strategies(workers, size):
+    """Round-trips tensors of several sizes through each tensor serialization
+    strategy and reports their speed and the size of the serialized tensors."""
+    me = workers["me"]
+    tensor = torch.rand(size)
+    n_round_trips = max(1, 1_000 // size)
+
+    strategies = [
+        TENSOR_SERIALIZATION.TORCH,
+        TENSOR_SERIALIZATION.NUMPY,
+        TENSOR_SERIALIZATION.ALL,
+        TENSOR_SERIALIZATION.RAW,
+    ]
+    timings = {}
+    for strategy in strategies:
+        me.torch_serialization = strategy
+        try:
+            t0 = time.time()
+            for _ in range(n_round_trips):
+                serialized = syft.serde.serialize(tensor)
+                deserialized = syft.serde.deserialize(serialized)
+            timings[strategy] = (time.time() - t0) / n_round_trips
+        finally:
+            me.torch_serialization = TENSOR_SERIALIZATION.TORCH
+
+        assert (deserialized == tensor).all()
+
+        if PRINT_IN_UNITTESTS:  # pragma: no cover
+            print(
+                f"{strategy} {size} values: {timings[strategy] * 1e6:.0f} us per round-trip, "
+                f"{len(serialized)} bytes"
+            )
+
+
+def test_raw_tensor_serialization_size(workers):
+    """Raw tensors are their storage bytes plus a header of a few bytes."""
+    me = workers["me"]
+    tensor = torch.rand(1000)
+
+    tensor_bin = torch_serde.raw_tensor_serializer(me, tensor)
+
+    assert len(tensor_bin) < tensor.numel() * tensor.element_size() + 32
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+import torch
+
+from syft.workers.websocket_server import WebsocketServerWorker
+from test.conftest import instantiate_websocket_client_worker
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+
+def _count_wire_bytes(ws):
+    """Wraps the send/recv methods of a websocket connection to count payload bytes.
+
+    `send_binary` goes through `send`, so only the latter is wrapped to count each
+    frame once.
+    """
+    counter = {"sent": 0, "received": 0}
+    send, recv = ws.send, ws.recv
+
+    def counted_send(payload, *args, **kwargs):
+        counter["sent"] += len(payload)
+        return send(payload, *args, **kwargs)
+
+    def counted_recv():
+        payload = recv()
+        counter["received"] += len(payload)
+        return payload
+
+    ws.send, ws.recv = counted_send, counted_recv
+    return counter
+
+
+@pytest.mark.parametrize("binary_frames, port", [(True, 8775), (False, 8776)])
+@assert_time(max_time=30)
+def test_websocket_frames_throughput(hook, start_proc, binary_frames, port):
+    """Round-trips a ~4MB tensor through a loopback server in both frame modes and
+    reports the throughput and the number of bytes put on the wire."""
+    kwargs = {"id": f"fed-frames-{port}", "host": "localhost", "port": port, "hook": hook}
+    server = start_proc(WebsocketServerWorker, **kwargs)
+
+    try:
+        time.sleep(0.1)
+        remote_proxy = instantiate_websocket_client_worker(binary_frames=binary_frames, **kwargs)
+        assert remote_proxy.use_binary_frames == binary_frames
+
+        counter = _count_wire_bytes(remote_proxy.ws)
+
+        x = torch.rand(1024, 1024)
+        n_round_trips = 5
+
+        t0 = time.time()
+        for _ in range(n_round_trips):
+            y = x.send(remote_proxy).get()
+        dt = time.time() - t0
+
+        assert (y == x).all()
+
+        # x travels to the server and back on every round-trip
+        payload_bytes = 2 * x.numel() * x.element_size() * n_round_trips
+        wire_bytes = counter["sent"] + counter["received"]
+
+        if binary_frames:
+            # Only the serialized messages are sent
+            assert wire_bytes < 1.2 * payload_bytes
+        else:
+            # Hex-encoding doubles the size of every message
+            assert wire_bytes > 1.5 * payload_bytes
+
+        if PRINT_IN_UNITTESTS:  # pragma: no cover
+            mode = "binary" if binary_frames else "hex"
+            print(
+                f"{mode} frames: {payload_bytes / dt / 2 ** 20:.1f} MB/s, "
+                f"{wire_bytes / 2 ** 20:.1f} MB on the wire"
+            )
+
+        remote_proxy.close()
+        time.sleep(0.1)
+        remote_proxy.remove_worker_from_local_worker_registry()
+    finally:
+        server.terminate()
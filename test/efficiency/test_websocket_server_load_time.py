@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+import torch
+import websocket
+
+import syft as sy
+from syft.codes import WEBSOCKET_FRAMES
+from syft.messaging.message import TensorCommandMessage
+from syft.workers.websocket_server import WebsocketServerWorker
+from test.conftest import instantiate_websocket_client_worker
+from test.efficiency.assertions import assert_time
+
+PRINT_IN_UNITTESTS = False
+
+
+def _percentile(latencies, q):
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+
+def _run_client(url, bin_message, n_requests, latencies):
+    """Sends the same serialized message n_requests times over its own connection."""
+    ws = websocket.create_connection(
+        url, max_size=None, header=[f"{WEBSOCKET_FRAMES.HEADER}: {WEBSOCKET_FRAMES.BINARY}"]
+    )
+    for _ in range(n_requests):
+        t0 = time.time()
+        ws.send_binary(bin_message)
+        ws.recv()
+        latencies.append(time.time() - t0)
+    ws.close()
+
+
+@pytest.mark.parametrize("executor, port", [(None, 8780), (4, 8781)])
+@assert_time(max_time=60)
+def test_websocket_server_multi_client_latency(hook, start_proc, executor, port):
+    """Several clients run independent matmuls on the same server at the same time,
+    the p50/p99 latencies of their requests are reported."""
+    kwargs = {"id": f"fed-load-{port}", "host": "localhost", "port": port, "hook": hook}
+    server = start_proc(WebsocketServerWorker, executor=executor, **kwargs)
+
+    try:
+        time.sleep(0.1)
+        remote_proxy = instantiate_websocket_client_worker(**kwargs)
+
+        n_clients, n_requests = 4, 20
+
+        # Each client works on its own remote tensor, so their requests are independent
+        pointers = [torch.rand(512, 512).send(remote_proxy) for _ in range(n_clients)]
+        bin_messages = [
+            sy.serde.serialize(
+                TensorCommandMessage.computation(
+                    "matmul", ptr.id_at_location, (ptr.child,), {}, (sy.ID_PROVIDER.pop(),)
+                )
+            )
+            for ptr in pointers
+        ]
+
+        latencies = []
+        clients = [
+            threading.Thread(
+                target=_run_client, args=(remote_proxy.url, bin_message, n_requests, latencies)
+            )
+            for bin_message in bin_messages
+        ]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+
+        assert len(latencies) == n_clients * n_requests
+
+        if PRINT_IN_UNITTESTS:  # pragma: no cover
+            print(
+                f"executor={executor}: "
+                f"p50={_percentile(latencies, 0.5) * 1000:.1f}ms "
+                f"p99={_percentile(latencies, 0.99) * 1000:.1f}ms"
+            )
+
+        del pointers
+        time.sleep(0.1)
+        remote_proxy.close()
+        time.sleep(0.1)
+        remote_proxy.remove_worker_from_local_worker_registry()
+    finally:
+        server.terminate()
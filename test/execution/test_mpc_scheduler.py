@@ -0,0 +1,88 @@
+import torch as th
+
+import syft as sy
+from syft.execution import mpc_scheduler
+from syft.serde.serde import deserialize
+from syft.serde.serde import serialize
+
+
+def test_schedule(hook):
+    @sy.func2plan(args_shape=[(2, 2), (2, 2)])
+    def plan(x, h):
+        i = x.matmul(h).sigmoid()
+        f = (x * h) + 1
+        return i * f
+
+    compiled = deserialize(serialize(plan)).compile()
+    levels = mpc_scheduler.schedule(compiled.steps)
+
+    names = [
+        ([step.name for step in secure_steps], [step.name for step in other_steps])
+        for secure_steps, other_steps in levels
+    ]
+    assert names == [([], []), (["matmul", "__mul__"], ["sigmoid", "__add__"]), (["__mul__"], [])]
+
+
+def test_schedule_side_effects(hook):
+    @sy.func2plan(args_shape=[(2,)], state=(th.tensor([1.0, 2.0]),))
+    def plan(x, state):
+        (bias,) = state.read()
+        y = x * x
+        bias.add_(1)
+        return y * bias + x * bias
+
+    compiled = deserialize(serialize(plan)).compile()
+    levels = mpc_scheduler.schedule(compiled.steps)
+
+    # the multiplications by the bias run after it is modified in place
+    names = [
+        ([step.name for step in secure_steps], [step.name for step in other_steps])
+        for secure_steps, other_steps in levels
+    ]
+    assert names == [([], []), (["__mul__"], ["add_"]), (["__mul__", "__mul__"], ["__add__"])]
+
+
+def test_is_shared(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+    x = th.tensor([1, 2])
+
+    assert not mpc_scheduler.is_shared([x, None])
+    assert mpc_scheduler.is_shared([x, x.share(bob, alice, crypto_provider=james)])
+    assert mpc_scheduler.is_shared([x.fix_prec().share(bob, alice, crypto_provider=james).child])
+
+
+def test_run_in_rounds_thread_state(hook):
+    """The functions run in rounds see the trace and the grad mode of the calling thread"""
+    from syft.frameworks.torch.mpc import spdz
+    from syft.workers import tracing
+
+    def state():
+        return tracing.current_context(), th.is_grad_enabled()
+
+    with tracing.context(1, 2), th.no_grad():
+        states = spdz.run_in_rounds([state, state])
+
+    assert states == [((1, 2), False), ((1, 2), False)]
+
+
+def test_run_in_rounds_idle_runners(hook, monkeypatch):
+    """At most MAX_IDLE_RUNNERS runner threads are kept idle, the others are stopped"""
+    import threading
+
+    from syft.frameworks.torch.mpc import spdz
+
+    def live_runners():
+        return [thread for thread in threading.enumerate() if isinstance(thread, spdz._Runner)]
+
+    monkeypatch.setattr(spdz, "MAX_IDLE_RUNNERS", 2)
+    monkeypatch.setattr(spdz, "_idle_runners", [])
+    n_live_runners = len(live_runners())
+
+    assert spdz.run_in_rounds([lambda: 1, lambda: 2, lambda: 3]) == [1, 2, 3]
+
+    assert len(spdz._idle_runners) == 2
+    assert len(live_runners()) == n_live_runners + 2
+
+    for runner in spdz._idle_runners:
+        runner.stop()
+        runner.join()
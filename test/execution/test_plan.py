@@ -10,6 +10,7 @@ import syft as sy
 from syft.generic.pointers.pointer_tensor import PointerTensor
 from syft.generic.frameworks.types import FrameworkTensor
 from syft.execution.plan import Plan
+from syft.execution.plan import shape_signature
 from syft.serde.serde import deserialize
 from syft.serde.serde import serialize
 
@@ -1126,3 +1127,161 @@ def test_plan_input_usage(hook):
     pointer_to_result = pointer_plan(pointer_to_data_1, pointer_to_data_2)
     result = pointer_to_result.get()
     assert (result == x12).all
+
+
+def test_compiled_plan(hook):
+    @sy.func2plan(args_shape=[(2,), (2,)], state=(th.tensor([1.0, 2.0]),))
+    def plan_ops(x, y, state):
+        (bias,) = state.read()
+        z = th.cat([x, y]).view(2, 2)
+        a, b = z.unbind(0)
+        return F.relu(a - b) + bias, th.matmul(z, x)
+
+    fetched_plan = deserialize(serialize(plan_ops))
+    assert fetched_plan.forward is None
+
+    x, y = th.tensor([3.0, -1.0]), th.tensor([1.0, 2.0])
+    expected = plan_ops(x, y)
+    results = fetched_plan(x, y)
+    assert fetched_plan._compiled is not None
+    assert len(fetched_plan._compiled) == len(fetched_plan.actions)
+    for result, expected_result in zip(results, expected):
+        assert (result == expected_result).all()
+
+    # the compiled plan runs the next calls, and reads the current state
+    fetched_plan.state.state_placeholders[0].child.add_(1)
+    results = fetched_plan(y, x)
+    assert (results[0] == th.tensor([2.0, 6.0])).all()
+    assert (results[1] == th.tensor([5.0, 1.0])).all()
+
+
+def test_plan_variants(hook, workers):
+    bob = workers["bob"]
+
+    @sy.func2plan(args_shape=[(1, 3)], state=(th.tensor([1.0, 2.0, 3.0]),))
+    def plan_flat(x, state):
+        (weight,) = state.read()
+        # the shape of x is recorded in the actions
+        return (x * weight).view(x.shape[0] * 3)
+
+    variant = plan_flat.add_variant(args_shape=[(2, 3)])
+    assert plan_flat.variants == {shape_signature((th.zeros(2, 3),)): variant}
+
+    x1 = th.tensor([[1.0, 1, 1]])
+    x2 = th.tensor([[1.0, 1, 1], [2, 2, 2]])
+    expected1 = th.tensor([1.0, 2, 3])
+    expected2 = th.tensor([1.0, 2, 3, 2, 4, 6])
+
+    fetched_plan = deserialize(serialize(plan_flat))
+    assert fetched_plan.forward is None
+    assert (fetched_plan(x1) == expected1).all()
+    assert (fetched_plan(x2) == expected2).all()
+
+    plan_ptr = plan_flat.send(bob)
+    assert (plan_ptr(x2.send(bob)).get() == expected2).all()
+    assert (plan_ptr(x1.send(bob)).get() == expected1).all()
+
+
+def test_plan_variants_added_after_send(hook, workers):
+    bob = workers["bob"]
+
+    @sy.func2plan(args_shape=[(1, 3)])
+    def plan_flat(x):
+        return (x * 2).view(x.shape[0] * 3)
+
+    plan_ptr = plan_flat.send(bob)
+    plan_flat.add_variant(args_shape=[(2, 3)])
+
+    # the variant is sent to the worker holding the plan, through the same pointer
+    assert plan_flat.send(bob) is plan_ptr
+    x2 = th.tensor([[1.0, 1, 1], [2, 2, 2]])
+    assert (plan_ptr(x2.send(bob)).get() == th.tensor([2.0, 2, 2, 4, 4, 4])).all()
+
+
+def test_plan_variants_lru(hook):
+    @sy.func2plan(args_shape=[(1,)])
+    def plan_double(x):
+        return x * 2
+
+    plan_double.max_variants = 2
+    variant2 = plan_double.add_variant(args_shape=[(2,)])
+    plan_double.add_variant(args_shape=[(3,)])
+    assert plan_double.add_variant(th.zeros(2)) is variant2
+    assert plan_double.add_variant(args_shape=[(1,)]) is plan_double
+
+    # the least recently used variant is evicted
+    plan_double.add_variant(args_shape=[(4,)])
+    assert list(plan_double.variants) == [
+        shape_signature((th.zeros(2),)),
+        shape_signature((th.zeros(4),)),
+    ]
+
+
+def test_plan_sync_state(hook, workers):
+    bob, alice = workers["bob"], workers["alice"]
+
+    @sy.func2plan(args_shape=[(3,)], state=(th.tensor([1.0, 2.0, 3.0]), th.tensor([1.0])))
+    def plan_affine(x, state):
+        weight, bias = state.read()
+        return x * weight + bias
+
+    plan_affine.send(bob)
+    plan_affine.send(alice)
+    weight, bias = plan_affine.state.tensors()
+    x = th.tensor([1.0, 1.0, 1.0])
+
+    bob.log_msgs = True
+    weight.add_(1)
+    plan_affine.sync_state(bob)
+    # only the modified tensor is sent
+    values, deltas = bob._get_msg(-1).args[1:]
+    assert list(values) == [plan_affine.state.state_placeholders[0].id]
+    assert deltas == {}
+    assert (plan_affine.pointers[bob](x.send(bob)).get() == th.tensor([3.0, 4.0, 5.0])).all()
+
+    bias.add_(2)
+    plan_affine.sync_state(deltas=True)
+    assert (plan_affine.pointers[bob](x.send(bob)).get() == th.tensor([5.0, 6.0, 7.0])).all()
+    assert (plan_affine.pointers[alice](x.send(alice)).get() == th.tensor([5.0, 6.0, 7.0])).all()
+
+    # nothing is sent when the state didn't change
+    n_messages = len(bob.msg_history)
+    plan_affine.sync_state(bob)
+    assert len(bob.msg_history) == n_messages
+    bob.log_msgs = False
+
+    with pytest.raises(RuntimeError):
+        plan_affine.sync_state(workers["james"])
+
+
+def test_plan_sync_state_snapshots(hook, workers):
+    bob, alice = workers["bob"], workers["alice"]
+
+    @sy.func2plan(args_shape=[(1,)], state=(th.tensor([1.0]),))
+    def plan_scale(x, state):
+        (weight,) = state.read()
+        return x * weight
+
+    plan_scale.send(bob)
+    plan_scale.send(alice)
+    (weight,) = plan_scale.state.tensors()
+    weight_id = plan_scale.state.state_placeholders[0].id
+
+    # the workers share the copy of the unchanged state tensor
+    snapshots = plan_scale._state_snapshots
+    assert snapshots[bob][weight_id] is snapshots[alice][weight_id]
+
+    plan_scale.FULL_SYNC_INTERVAL = 2
+    bob.log_msgs = True
+    try:
+        sent = []
+        for _ in range(3):
+            weight.add_(0.1)
+            plan_scale.sync_state(bob, deltas=True)
+            values, deltas = bob._get_msg(-1).args[1:]
+            sent.append((bool(values), bool(deltas)))
+    finally:
+        bob.log_msgs = False
+
+    # the tensor itself is sent after two syncs with deltas
+    assert sent == [(False, True), (False, True), (True, False)]
@@ -0,0 +1,140 @@
+import functools
+
+import torch as th
+
+import syft as sy
+from syft.execution import plan_optimizer
+from syft.serde.serde import deserialize
+from syft.serde.serde import serialize
+
+
+def run_actions(plan, *args):
+    """Runs a plan from its actions, like a remote worker does."""
+    return deserialize(serialize(plan))(*args)
+
+
+def test_eliminate_dead_code(hook):
+    @sy.func2plan(args_shape=[(2,)])
+    def plan(x):
+        unused = x * 3  # noqa: F841
+        x.abs().sum()
+        return x + 1
+
+    assert len(plan.actions) == 4
+    plan.optimize()
+
+    assert [action.name for action in plan.actions] == ["__add__"]
+    assert len(plan.placeholders) == 2
+    assert (run_actions(plan, th.tensor([1.0, 2.0])) == th.tensor([2.0, 3.0])).all()
+
+
+def test_eliminate_dead_code_keeps_side_effects(hook):
+    @sy.func2plan(args_shape=[(2,)], state=(th.tensor([1.0, 1.0]),))
+    def plan(x, state):
+        (bias,) = state.read()
+        bias.add_(x)
+        return x * 2
+
+    plan.optimize()
+
+    assert [action.name for action in plan.actions] == ["add_", "__mul__"]
+
+
+def test_eliminate_common_subexpressions(hook):
+    @sy.func2plan(args_shape=[(2,), (2,)])
+    def plan(x, y):
+        a = x * y
+        b = x * y
+        return a + b.abs(), (x * y).abs()
+
+    plan.optimize()
+
+    assert [action.name for action in plan.actions] == ["__mul__", "abs", "__add__", "abs"]
+    x, y = th.tensor([1.0, -2.0]), th.tensor([3.0, 4.0])
+    a, b = run_actions(plan, x, y)
+    assert (a == th.tensor([6.0, 0.0])).all()
+    assert (b == th.tensor([3.0, 8.0])).all()
+
+
+def test_eliminate_common_subexpressions_modified_through_view(hook):
+    @sy.func2plan(args_shape=[(2,)], state=(th.tensor([1.0, 2.0]),))
+    def plan(x, state):
+        (w,) = state.read()
+        a = w * 2
+        w.view(2).add_(10)
+        b = w * 2
+        return a + b + x
+
+    plan.optimize()
+
+    # w is modified through a view between the multiplications, so both are kept
+    assert [action.name for action in plan.actions].count("__mul__") == 2
+    # building the plan ran it once, so w is [11, 12] when the plan is run
+    assert (run_actions(plan, th.zeros(2)) == th.tensor([64.0, 68.0])).all()
+
+
+def test_fold_constants(hook):
+    @sy.func2plan(args_shape=[(3,)], state=(th.tensor([1.0, 2.0, 3.0]),))
+    def plan(x, state):
+        (weight,) = state.read()
+        ones = th.ones(3)
+        return x * (weight * 2) + ones * 2
+
+    plan.optimize()
+
+    # the action on the state is not folded by default, as the state may be trained
+    assert [action.name for action in plan.actions] == ["__mul__", "__mul__", "__add__"]
+    assert len(plan.state.state_placeholders) == 2
+    assert plan.state.read() == [plan.state.state_placeholders[0].child]
+    x = th.tensor([1.0, 2.0, 3.0])
+    assert (run_actions(plan, x) == th.tensor([4.0, 10.0, 20.0])).all()
+
+    plan.optimize(passes=(functools.partial(plan_optimizer.fold_constants, fold_state=True),))
+
+    assert [action.name for action in plan.actions] == ["__mul__", "__add__"]
+    assert (run_actions(plan, x) == th.tensor([4.0, 10.0, 20.0])).all()
+
+
+def test_rewrite_inplace(hook):
+    @sy.func2plan(args_shape=[(1, 2)], state=(th.tensor([[1.0, -1.0], [2.0, 1.0]]),))
+    def plan(x, state):
+        (weight,) = state.read()
+        y = x.matmul(weight).relu()
+        z = y.view(2)
+        return z.mul(2) + x.sigmoid() * 0, y.add(1)
+
+    plan.optimize(passes=(plan_optimizer.rewrite_inplace,))
+
+    # z is a view of y, x is an input and the addition has a tensor arg, so only the
+    # relu and the multiplication by 0 are run in place
+    names = [action.name for action in plan.actions]
+    assert names == ["matmul", "relu_", "view", "mul", "sigmoid", "mul_", "__add__", "add"]
+    a, b = run_actions(plan, th.tensor([[1.0, 1.0]]))
+    assert (a == th.tensor([6.0, 0.0])).all()
+    assert (b == th.tensor([[4.0, 1.0]])).all()
+
+
+def test_rewrite_inplace_keeps_dtypes(hook):
+    @sy.func2plan(args_shape=[(2,)])
+    def plan(x):
+        y = x.long() + 1
+        return y.mul(2.5), (x + 1).mul(2)
+
+    plan.optimize(passes=(plan_optimizer.rewrite_inplace,))
+
+    # y is an integer tensor, which mul_ can't multiply by a float
+    names = [action.name for action in plan.actions]
+    assert names == ["long", "__add__", "mul", "__add__", "mul_"]
+    a, b = run_actions(plan, th.tensor([1.0, 2.0]))
+    assert (a == th.tensor([5.0, 7.5])).all()
+    assert (b == th.tensor([4.0, 6.0])).all()
+
+
+def test_plan_optimized_at_build(hook):
+    @sy.func2plan(args_shape=[(2,)], optimize=True)
+    def plan(x):
+        unused = x * 3  # noqa: F841
+        return x + x
+
+    assert len(plan.actions) == 1
+    assert (plan(th.tensor([1.0, 2.0])) == th.tensor([2.0, 4.0])).all()
@@ -146,3 +146,30 @@ def test_get_recorded_ids():
     assert len(ids) == 2
     assert ids[0] == initial_given_ids[-2]
     assert ids[1] == initial_given_ids[-3]
+
+
+def test_counter_id_provider():
+    provider = id_provider.CounterIdProvider()
+
+    ids = [provider.pop() for _ in range(100)]
+
+    assert len(set(ids)) == 100
+    assert ids == sorted(ids)
+    assert all(i > 10e10 and i < 2 ** 63 for i in ids)
+    assert len(provider.generated) == 0
+
+
+def test_counter_id_provider_given_ids():
+    provider = id_provider.CounterIdProvider()
+    generated_id = provider.pop()
+
+    with pytest.raises(exceptions.IdNotUniqueError):
+        provider.set_next_ids([generated_id, 5])
+
+    provider.set_next_ids([4, 5])
+    provider.start_recording_ids()
+    assert provider.pop() == 5
+    assert provider.pop() == 4
+    new_id = provider.pop()
+    assert new_id == generated_id + 1
+    assert provider.get_recorded_ids() == [5, 4, new_id]
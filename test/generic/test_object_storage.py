@@ -1,5 +1,9 @@
+import gc
+import os
+
 import torch
 
+from syft.generic.memory_budget import MemoryBudget
 from syft.generic import object_storage
 
 
@@ -37,3 +41,93 @@ def test_clear_objects_return_None():
     objs = obj_storage.current_objects()
     assert len(objs) == 0
     assert ret_val is None
+
+
+def test_memory_budget_spill(hook, tmpdir):
+    obj_storage = object_storage.ObjectStorage()
+    budget = MemoryBudget(max_bytes=1000, spill_dir=str(tmpdir))
+    obj_storage.memory_budget = budget
+
+    # 800 bytes each
+    x = torch.rand(200)
+    y = torch.rand(200)
+    x_values = x.clone()
+    obj_storage.set_obj(x)
+    obj_storage.set_obj(y)
+
+    # x is the least recently used tensor, it is spilled but still usable
+    assert budget.stats["resident_bytes"] == 800
+    assert budget.stats["spilled_bytes"] == 800
+    assert len(tmpdir.listdir()) == 1
+    assert (obj_storage._objects[x.id] == x_values).all()
+
+    # x is loaded back and y is spilled
+    assert (obj_storage.get_obj(x.id) == x_values).all()
+    assert budget.stats["faults"] == 1
+    assert y.id in budget._spilled and x.id in budget._resident
+
+    obj_storage.clear_objects()
+    assert budget.stats["resident_bytes"] == 0
+    assert budget.stats["spilled_bytes"] == 0
+    assert len(tmpdir.listdir()) == 0
+
+
+def test_memory_budget_temporary_spill_dir(hook):
+    obj_storage = object_storage.ObjectStorage()
+    budget = MemoryBudget(max_bytes=1000)
+    obj_storage.memory_budget = budget
+
+    obj_storage.set_obj(torch.rand(200))
+    assert budget.spill_dir is None
+    obj_storage.set_obj(torch.rand(200))
+    spill_dir = budget.spill_dir
+    assert len(os.listdir(spill_dir)) == 1
+
+    # spilling and then clearing leaves no files behind
+    obj_storage.clear_objects()
+    assert not os.path.exists(spill_dir)
+
+    # the temporary directory is created again by the next spill, and removed
+    # when the budget is collected
+    obj_storage.set_obj(torch.rand(200))
+    obj_storage.set_obj(torch.rand(200))
+    spill_dir = budget.spill_dir
+    assert len(os.listdir(spill_dir)) == 1
+    del obj_storage, budget
+    gc.collect()
+    assert not os.path.exists(spill_dir)
+
+
+def test_memory_budget_resident_objects(hook, tmpdir):
+    obj_storage = object_storage.ObjectStorage()
+    budget = MemoryBudget(max_bytes=1000, spill_dir=str(tmpdir))
+    obj_storage.memory_budget = budget
+
+    dataset = torch.rand(200).tag("#dataset")
+    pinned = torch.rand(200)
+    obj_storage.set_obj(dataset)
+    obj_storage.set_obj(pinned)
+    obj_storage.pin_obj(pinned.id)
+    obj_storage.set_obj(torch.rand(200))
+
+    # tagged and pinned tensors are never spilled
+    assert budget.stats["resident_bytes"] == 2400
+    assert budget.stats["spilled_bytes"] == 0
+
+
+def test_memory_budget_lfu(hook, tmpdir):
+    obj_storage = object_storage.ObjectStorage()
+    budget = MemoryBudget(max_bytes=2000, spill_dir=str(tmpdir), eviction="lfu")
+    obj_storage.memory_budget = budget
+
+    x = torch.rand(200)
+    y = torch.rand(200)
+    obj_storage.set_obj(x)
+    obj_storage.set_obj(y)
+    obj_storage.get_obj(x.id)
+    obj_storage.get_obj(x.id)
+    obj_storage.get_obj(y.id)
+    obj_storage.set_obj(torch.rand(200))
+
+    # y is the most recently used tensor, but the least frequently used one
+    assert list(budget._spilled) == [y.id]
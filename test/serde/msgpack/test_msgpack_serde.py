@@ -3,6 +3,8 @@ This file tests the ability for serde.py to convert complex types into
 simple python types which are serializable by standard serialization tools.
 For more on how/why this works, see serde.py directly.
 """
+import functools
+
 import msgpack as msgpack_lib
 import numpy
 import pytest
@@ -469,6 +471,69 @@ def test_compressed_serde(compress_scheme):
     assert numpy.array_equal(arr, arr_serialized_deserialized)
 
 
+def test_compression_policy():
+    compression._apply_compress_scheme = compression.apply_lz4_compression
+    policy = compression.CompressionPolicy(min_size=128, sample_size=4096)
+
+    # small binaries are not compressed
+    small = msgpack_lib.dumps([1, 2, 3])
+    assert compression._compress(small, policy)[0] == compression.NO_COMPRESSION
+
+    # nor are binaries whose prefix doesn't compress
+    random = numpy.random.bytes(100_000)
+    compressed = compression._compress(random, policy)
+    assert compressed[0] == compression.NO_COMPRESSION
+    assert compression._decompress(compressed) == random
+
+    ones = numpy.ones((100, 100)).tobytes()
+    compressed = compression._compress(ones, policy)
+    assert compressed[0] == compression.LZ4
+    assert compression._decompress(compressed) == ones
+
+    stats = policy.stats
+    assert stats[compression.NO_COMPRESSION]["count"] == 2
+    assert stats[compression.LZ4]["bytes_in"] == len(ones)
+    assert stats[compression.LZ4]["bytes_out"] == len(compressed) - 1
+    assert stats[compression.LZ4]["ratio"] < 0.1
+
+    policy.reset_stats()
+    assert policy.stats == {}
+
+
+def test_compression_without_policy():
+    compression._apply_compress_scheme = compression.apply_lz4_compression
+
+    # without a policy, even small and incompressible binaries are compressed
+    small = msgpack_lib.dumps([1, 2, 3])
+    compressed = compression._compress(small)
+    assert compressed[0] == compression.LZ4
+    assert compression._decompress(compressed) == small
+
+    random = numpy.random.bytes(10_000)
+    compressed = compression._compress(random)
+    assert compressed[0] == compression.LZ4
+    assert compression._decompress(compressed) == random
+
+
+def test_compression_policy_overrides(workers):
+    compression._apply_compress_scheme = compression.apply_lz4_compression
+    me = workers["me"]
+    me.compression_policy = compression.CompressionPolicy(
+        overrides={numpy.ndarray: functools.partial(compression.apply_zlib_compression, level=9)}
+    )
+
+    try:
+        arr = numpy.ones((100, 100))
+        arr_serialized = syft.serde.serialize(arr, worker=me)
+        list_serialized = syft.serde.serialize(arr.tolist(), worker=me)
+    finally:
+        me.compression_policy = None
+
+    assert arr_serialized[0] == compression.ZLIB
+    assert list_serialized[0] == compression.LZ4
+    assert numpy.array_equal(syft.serde.deserialize(arr_serialized), arr)
+
+
 @pytest.mark.parametrize("compress", [True, False])
 def test_dict(compress):
     # Test with integers
@@ -716,6 +781,55 @@ def test_numpy_tensor_serde(tensor):
     assert torch.eq(tensor_deserialized, tensor).all()
 
 
+@pytest.mark.parametrize(
+    "tensor",
+    [
+        torch.rand(10, 10),
+        torch.tensor([[0.25, 1.5], [0.15, 0.25], [1.25, 0.5]], requires_grad=True),
+        torch.randint(low=0, high=10, size=[3, 7]),
+        torch.tensor([True, False, True]),
+        torch.tensor(3.5),
+        torch.zeros(0, 4),
+        torch.rand(3, 4).t(),
+        torch.rand(2, 3, 4, 5).contiguous(memory_format=torch.channels_last),
+        torch.rand(2, 3).to(torch.bfloat16),
+    ],
+)
+def test_raw_tensor_serde(tensor, workers):
+    me = workers["me"]
+    me.torch_serialization = syft.codes.TENSOR_SERIALIZATION.RAW
+    try:
+        tensor_serialized = syft.serde.serialize(tensor)
+        tensor_deserialized = syft.serde.deserialize(tensor_serialized)
+    finally:
+        me.torch_serialization = syft.codes.TENSOR_SERIALIZATION.TORCH
+
+    assert tensor_deserialized.dtype == tensor.dtype
+    assert tensor_deserialized.shape == tensor.shape
+    assert tensor_deserialized.requires_grad == tensor.requires_grad
+    assert torch.eq(tensor_deserialized.float(), tensor.float()).all()
+    if tensor.dim() == 4:
+        # the memory format is kept
+        assert tensor_deserialized.stride() == tensor.stride()
+
+
+def test_raw_tensor_deserializer_zero_copy(workers):
+    me = workers["me"]
+    tensor = torch.tensor([1, 2, 3])
+    tensor_bin = torch_serde.raw_tensor_serializer(me, tensor)
+
+    # a writable buffer is viewed without copy
+    buffer = bytearray(tensor_bin)
+    tensor_view = torch_serde.raw_tensor_deserializer(me, buffer)
+    tensor_view += 1
+    assert (torch_serde.raw_tensor_deserializer(me, buffer) == tensor + 1).all()
+
+    # a read-only buffer is copied
+    tensor_copy = torch_serde.raw_tensor_deserializer(me, tensor_bin)
+    tensor_copy += 1
+    assert (torch_serde.raw_tensor_deserializer(me, tensor_bin) == tensor).all()
+
+
 @pytest.mark.parametrize("compress", [True, False])
 def test_additive_sharing_tensor_serde(compress, workers):
     alice, bob, james, me = workers["alice"], workers["bob"], workers["james"], workers["me"]
@@ -855,8 +969,25 @@ def test_no_simplifier_found(workers):
     """Test that types that can not be simplified are cached."""
     me = workers["me"]
     # Clean cache.
-    msgpack.serde.no_simplifiers_found = set()
+    msgpack.serde.clear_simplifier_cache()
     x = 1.3
     assert type(x) not in msgpack.serde.no_simplifiers_found
     _ = msgpack.serde._simplify(me, x)
     assert type(x) in msgpack.serde.no_simplifiers_found
+    assert msgpack.serde._simplifier_cache[type(x)] is None
+
+
+def test_inherited_simplifier_cached(workers):
+    """Test that the simplifier of a parent type is resolved once and cached."""
+    me = workers["me"]
+
+    class Args(tuple):
+        pass
+
+    args = Args((1, "a"))
+    simplified = msgpack.serde._simplify(me, args)
+
+    assert msgpack.serde._simplifier_cache[Args] == msgpack.serde.simplifiers[tuple]
+    assert msgpack.serde.inherited_simplifiers_found[Args] == msgpack.serde.simplifiers[tuple]
+    assert simplified == msgpack.serde._simplify(me, (1, "a"))
+    assert msgpack.serde._detail(me, simplified) == (1, "a")
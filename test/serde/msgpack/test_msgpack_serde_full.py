@@ -74,14 +74,17 @@ samples[syft.execution.placeholder.PlaceHolder] = make_placeholder
 samples[syft.frameworks.torch.fl.dataset.BaseDataset] = make_basedataset
 
 samples[syft.messaging.message.TensorCommandMessage] = make_command_message
+samples[syft.messaging.message.BatchCommandMessage] = make_batchcommandmessage
 samples[syft.messaging.message.ObjectMessage] = make_objectmessage
 samples[syft.messaging.message.ObjectRequestMessage] = make_objectrequestmessage
 samples[syft.messaging.message.IsNoneMessage] = make_isnonemessage
 samples[syft.messaging.message.GetShapeMessage] = make_getshapemessage
 samples[syft.messaging.message.ForceObjectDeleteMessage] = make_forceobjectdeletemessage
+samples[syft.messaging.message.ForceObjectDeleteBatchMessage] = make_forceobjectdeletebatchmessage
 samples[syft.messaging.message.SearchMessage] = make_searchmessage
 samples[syft.messaging.message.PlanCommandMessage] = make_plancommandmessage
 samples[syft.messaging.message.WorkerCommandMessage] = make_workercommandmessage
+samples[syft.messaging.message.TracedMessage] = make_tracedmessage
 
 samples[syft.frameworks.torch.tensors.interpreters.gradients_core.GradFunc] = make_gradfn
 
@@ -2,6 +2,7 @@ import torch
 
 import syft
 from syft.serde import protobuf
+from syft.serde.msgpack import proto as msgpack_proto
 from syft.serde.torch.serde import TORCH_STR_DTYPE
 
 from test.serde.serde_helpers import *
@@ -84,3 +85,36 @@ def test_protobuf_serde_tensor_roundtrip_quantized(str_dtype):
     serde_worker.framework = original_framework
 
     assert compare(roundtrip_tensor, tensor) is True
+
+
+@pytest.mark.parametrize("str_dtype", dtypes)
+def test_protobuf_serde_tensor_roundtrip_raw(str_dtype):
+    """Checks that tensors serialized with the raw strategy stay same"""
+    serde_worker = syft.hook.local_worker
+    serde_worker.torch_serialization = syft.codes.TENSOR_SERIALIZATION.RAW
+
+    tensor = torch.rand([10, 10]) * 16
+    tensor = tensor.to(TORCH_STR_DTYPE[str_dtype])
+
+    try:
+        protobuf_tensor = protobuf.serde._bufferize(serde_worker, tensor)
+        roundtrip_tensor = protobuf.serde._unbufferize(serde_worker, protobuf_tensor)
+    finally:
+        serde_worker.torch_serialization = syft.codes.TENSOR_SERIALIZATION.TORCH
+
+    assert type(roundtrip_tensor) == torch.Tensor
+    assert roundtrip_tensor.dtype == tensor.dtype
+    assert numpy.array_equal(roundtrip_tensor.float().numpy(), tensor.float().numpy())
+
+
+def test_protobuf_serde_msgpack_only_types():
+    """Checks that the types serialized only with msgpack have no Protobuf serde"""
+    protobuf_types = {
+        msgpack_proto.fullname(python_type)
+        for python_type in protobuf.proto.MAP_PYTHON_TO_PROTOBUF_CLASSES
+    }
+    assert not protobuf_types & set(msgpack_proto.MSGPACK_ONLY_TYPES)
+
+    message = syft.messaging.message.BatchCommandMessage([])
+    with pytest.raises(Exception, match="No corresponding Protobuf message"):
+        protobuf.serde._bufferize(syft.hook.local_worker, message)
@@ -777,6 +777,7 @@ def make_plan(**kwargs):
                     ),  # (str) description
                     # (PlaceHolder) placeholders
                     msgpack.serde._simplify(syft.hook.local_worker, plan.placeholders),
+                    msgpack.serde._simplify(syft.hook.local_worker, []),  # (list) variants
                 ),
             ),
             "cmp_detailed": compare,
@@ -798,6 +799,7 @@ def make_plan(**kwargs):
                     ),  # (str) description
                     # (PlaceHolder) placeholders
                     msgpack.serde._simplify(syft.hook.local_worker, model_plan.placeholders),
+                    msgpack.serde._simplify(syft.hook.local_worker, []),  # (list) variants
                 ),
             ),
             "cmp_detailed": compare,
@@ -1491,6 +1493,52 @@ def make_command_message(**kwargs):
     ]
 
 
+# syft.messaging.message.BatchCommandMessage
+def make_batchcommandmessage(**kwargs):
+    bob = kwargs["workers"]["bob"]
+    bob.log_msgs = True
+
+    x = torch.tensor([1, 2, 3, 4]).send(bob)
+    y = x * 2
+    op1 = bob._get_msg(-1).action
+
+    a = torch.tensor([[1, 2], [3, 4]]).send(bob)
+    b = a.sum(1, keepdim=True)
+    op2 = bob._get_msg(-1).action
+
+    bob.log_msgs = False
+
+    batch = syft.messaging.message.BatchCommandMessage([op1, op2])
+
+    def compare(detailed, original):
+        assert type(detailed) == syft.messaging.message.BatchCommandMessage
+        # the actions are only detailed when they are executed
+        assert detailed.simplified
+        assert len(detailed.actions) == len(original.actions)
+        for simple_op, original_op in zip(detailed.actions, original.actions):
+            detailed_op = msgpack.serde._detail(syft.hook.local_worker, simple_op)
+            assert type(detailed_op) == syft.execution.computation.ComputationAction
+            assert detailed_op.name == original_op.name
+            assert detailed_op.return_ids == original_op.return_ids
+        return True
+
+    return [
+        {
+            "value": batch,
+            "simplified": (
+                CODE[syft.messaging.message.BatchCommandMessage],
+                (
+                    (
+                        msgpack.serde._simplify(syft.hook.local_worker, op1),
+                        msgpack.serde._simplify(syft.hook.local_worker, op2),
+                    ),  # (tuple) simplified actions
+                ),
+            ),
+            "cmp_detailed": compare,
+        }
+    ]
+
+
 # syft.messaging.message.ObjectMessage
 def make_objectmessage(**kwargs):
     bob = kwargs["workers"]["bob"]
@@ -1642,6 +1690,59 @@ def make_forceobjectdeletemessage(**kwargs):
     ]
 
 
+# ForceObjectDeleteBatchMessage
+def make_forceobjectdeletebatchmessage(**kwargs):
+    del_message = syft.messaging.message.ForceObjectDeleteBatchMessage([1, 2, 3])
+
+    def compare(detailed, original):
+        assert type(detailed) == syft.messaging.message.ForceObjectDeleteBatchMessage
+        assert detailed.object_ids == original.object_ids
+        return True
+
+    return [
+        {
+            "value": del_message,
+            "simplified": (
+                CODE[syft.messaging.message.ForceObjectDeleteBatchMessage],
+                ((CODE[list], (1, 2, 3)),),  # (list) ids
+            ),
+            "cmp_detailed": compare,
+        }
+    ]
+
+
+# TracedMessage
+def make_tracedmessage(**kwargs):
+    del_message = syft.messaging.message.ForceObjectDeleteBatchMessage([1, 2, 3])
+    traced_message = syft.messaging.message.TracedMessage(123, 456, del_message)
+
+    def compare(detailed, original):
+        assert type(detailed) == syft.messaging.message.TracedMessage
+        assert detailed.trace_id == original.trace_id
+        assert detailed.parent_id == original.parent_id
+        assert type(detailed.message) == syft.messaging.message.ForceObjectDeleteBatchMessage
+        assert detailed.message.object_ids == original.message.object_ids
+        return True
+
+    return [
+        {
+            "value": traced_message,
+            "simplified": (
+                CODE[syft.messaging.message.TracedMessage],
+                (
+                    123,  # (int) trace_id
+                    456,  # (int) parent_id
+                    (
+                        CODE[syft.messaging.message.ForceObjectDeleteBatchMessage],
+                        ((CODE[list], (1, 2, 3)),),
+                    ),  # (Message) message
+                ),
+            ),
+            "cmp_detailed": compare,
+        }
+    ]
+
+
 # SearchMessage
 def make_searchmessage(**kwargs):
     search_message = syft.messaging.message.SearchMessage([1, "test", 3])
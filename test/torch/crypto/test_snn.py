@@ -10,6 +10,7 @@ from syft.frameworks.torch.mpc.securenn import (
     share_convert,
     relu_deriv,
     division,
+    max_tournament,
     maxpool,
     maxpool2d,
     maxpool_deriv,
@@ -145,6 +146,17 @@ def test_division(workers):
     assert (res1.get() == torch.tensor([[5, 0], [5, 4]])).all()
 
 
+def test_max_tournament(workers):
+    alice, bob, james = workers["alice"], workers["bob"], workers["james"]
+    t = th.tensor([[10, 0, 15, 7, -3], [2, 9, 9, -1, 4], [-5, -2, -8, -2, -9]])
+    x = t.share(alice, bob, crypto_provider=james).child
+    max, ind = max_tournament(x)
+
+    assert (max.get() == t.max(dim=1)[0]).all()
+    # the first of several equal values is selected
+    assert (ind.get() == th.tensor([2, 1, 1])).all()
+
+
 def test_maxpool(workers):
     alice, bob, james = workers["alice"], workers["bob"], workers["james"]
     x = th.tensor([[10, 0], [15, 7]]).share(alice, bob, crypto_provider=james).child
@@ -16,6 +16,13 @@ def test_build_rule_numpy():
     assert result == [1, 1, [0, 0, 0]]
 
 
+def test_args_signature():
+    pointer = PointerTensor(id=1000, location="location", owner="owner", garbage_collect_data=False)
+    args = ([torch.tensor([1, 2]), pointer], 42)
+    assert hook_args.args_signature(args) == (list, int)
+    assert hook_args.args_signature(args, deep=True) == ((list, (torch.Tensor, PointerTensor)), int)
+
+
 def test_backward_multiple_use(workers):
     """
     Test using backward() in different contexts (FL or Encrypted) within
@@ -90,6 +90,68 @@ def test_virtual_get(workers):
     assert (x == t).all()
 
 
+def test_reconstruct_all(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+    t1 = torch.tensor([1, -2, 3])
+    t2 = torch.tensor([[4, 5], [-6, 7]])
+    x1 = t1.share(bob, alice, james, crypto_provider=james).child
+    x2 = t2.share(bob, alice, james, crypto_provider=james).child
+
+    r1, r2 = AdditiveSharingTensor.reconstruct_all(x1, x2)
+
+    for worker in (bob, alice, james):
+        assert (r1.child[worker.id].get() == t1).all()
+        assert (r2.child[worker.id].get() == t2).all()
+
+    r = x1.reconstruct()
+    assert (r.child[bob.id].get() == t1).all()
+
+
+def test_reconstruct_all_messages(workers, monkeypatch):
+    me, bob, alice, james = (workers["me"], workers["bob"], workers["alice"], workers["james"])
+    tensors = [torch.tensor([i, -i]) for i in range(5)]
+    shared = [t.share(bob, alice, james, crypto_provider=james).child for t in tensors]
+
+    messages = []
+    send_msg = syft.workers.base.BaseWorker.send_msg
+
+    def recorded_send_msg(self, message, location):
+        if isinstance(message, syft.messaging.message.WorkerCommandMessage):
+            messages.append((self.id, location.id, message.command_name))
+        return send_msg(self, message, location)
+
+    monkeypatch.setattr(syft.workers.base.BaseWorker, "send_msg", recorded_send_msg)
+    opened = AdditiveSharingTensor.reconstruct_all(*shared)
+    monkeypatch.undo()
+
+    # one message from the owner, and one message from and to each other
+    # shareholder, whatever the number of tensors
+    opener = shared[0].locations[0]
+    others = [worker.id for worker in (bob, alice, james) if worker.id != opener.id]
+    assert sorted(messages) == sorted(
+        [(me.id, opener.id, "open_shares")]
+        + [(opener.id, other, "get_shares") for other in others]
+        + [(opener.id, other, "load_data") for other in others]
+    )
+
+    for t, r in zip(tensors, opened):
+        for worker in (bob, alice, james):
+            assert (r.child[worker.id].get() == t).all()
+
+
+def test_reconstruct_all_respects_permissions(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+    x = torch.tensor([1, 2, 3]).share(bob, alice, james, crypto_provider=james).child
+
+    # a shareholder only gives its shares to workers allowed to get them
+    other = x.locations[1]
+    share = other.get_obj(x.child[other.id].id_at_location)
+    share.allow = lambda user=None: False
+
+    with pytest.raises(syft.exceptions.GetNotPermittedError):
+        AdditiveSharingTensor.reconstruct_all(x)
+
+
 def test_non_client_registration(hook, workers):
     hook.local_worker.is_client_worker = False
     bob, alice, james = workers["bob"], workers["alice"], workers["james"]
@@ -763,6 +825,8 @@ def test_max(workers):
     x = t.fix_prec().share(bob, alice, crypto_provider=james)
     max_value = x.max().get().float_prec()
     assert max_value == torch.tensor([5.0])
+    # the max of all the values is a scalar, like with torch.max
+    assert max_value.shape == t.max().shape
 
 
 def test_argmax(workers):
@@ -795,6 +859,13 @@ def test_argmax(workers):
     ids = x.argmax(dim=1).get().float_prec()
     assert (ids.long() == torch.argmax(t, dim=1)).all()
 
+    # dim=0 on 3 dimensions
+    t = torch.tensor([[[1, 2.0], [4, 3]], [[3, 9.0], [2, 5]], [[0, 1.0], [7, 6]]])
+    x = t.fix_prec().share(bob, alice, crypto_provider=james)
+    max_value, ids = x.max(dim=0)
+    assert (max_value.get().float_prec() == torch.max(t, dim=0)[0]).all()
+    assert (ids.get().float_prec().long() == torch.argmax(t, dim=0)).all()
+
 
 def test_mod(workers):
     alice, bob, james = workers["alice"], workers["bob"], workers["james"]
@@ -946,3 +1017,227 @@ def test_correct_tag_and_description_after_send(workers):
 
     assert me.request_search("tag_additive_test1", location=alice)
     assert me.request_search("tag_additive_test2", location=alice)
+
+
+def test_prg_share_get(workers):
+    me, bob, alice, james = (workers["me"], workers["bob"], workers["alice"], workers["james"])
+    me.prg_sharing = True
+    try:
+        t = torch.tensor([[1, -2, 3], [4, 5, -6]])
+
+        bob.log_msgs = True
+        x = t.share(bob, alice, james, crypto_provider=james)
+        bob.log_msgs = False
+
+        # bob's share was derived from the seed he shares with me
+        assert not any(
+            isinstance(bob._get_msg(i), syft.messaging.message.ObjectMessage)
+            for i in range(len(bob.msg_history))
+        )
+        bob.msg_history = []
+
+        assert (x.get() == t).all()
+
+        y = t.share(bob, alice, james, crypto_provider=james)
+        z = t.share(bob, alice, james, crypto_provider=james)
+        assert ((y + z).get() == t * 2).all()
+    finally:
+        me.prg_sharing = False
+
+
+def test_prg_shares_of_zero(workers):
+    from syft.frameworks.torch.mpc.securenn import _shares_of_zero
+
+    me, bob, alice, james = (workers["me"], workers["bob"], workers["alice"], workers["james"])
+    me.prg_sharing = True
+    try:
+        field = 2 ** 62
+        zero = _shares_of_zero(5, field, "long", james, bob, alice)
+        shares = [share.copy().get() for share in zero.child.values()]
+        # the shares are random but sum to zero
+        assert (shares[0] != 0).any()
+        assert (zero.get() == 0).all()
+    finally:
+        me.prg_sharing = False
+
+
+def test_prg_seeds_and_nonces_cannot_be_reused(workers):
+    me, bob, alice = workers["me"], workers["bob"], workers["alice"]
+    me.share_prg_seed(bob)
+
+    # a peer can't replace the seed bob shares with me
+    with pytest.raises(syft.exceptions.GetNotPermittedError):
+        bob.set_prg_seed(me.id, 0)
+
+    # nor derive again a share bob already derived, or one from an older nonce
+    first_nonce, nonce = me.new_prg_nonce(), me.new_prg_nonce()
+    bob.prg_share(me.id, nonce, (2,), 2 ** 62, torch.int64)
+    with pytest.raises(syft.exceptions.GetNotPermittedError):
+        bob.prg_share(me.id, nonce, (2,), 2 ** 62, torch.int64)
+    with pytest.raises(syft.exceptions.GetNotPermittedError):
+        bob.prg_share(me.id, first_nonce, (2,), 2 ** 62, torch.int64)
+
+    # the nonces of another issuer are counted separately
+    bob.prg_share(me.id, alice.new_prg_nonce(), (2,), 2 ** 62, torch.int64)
+
+
+def test_prg_shares_of_zero_from_two_issuers(workers):
+    from syft.frameworks.torch.mpc import prg
+
+    me, bob, alice, james = (workers["me"], workers["bob"], workers["alice"], workers["james"])
+    field = 2 ** 62
+
+    # the seeds are shared before any share is derived, whatever the order of the
+    # workers, and the nonces of different issuers don't need to be ordered
+    zero = prg.shares_of_zero(james, (3,), field, torch.int64, james, alice, bob)
+    later_zero = prg.shares_of_zero(me, (3,), field, torch.int64, james, bob, alice)
+    other_zero = prg.shares_of_zero(james, (3,), field, torch.int64, james, alice, bob)
+
+    for x in (zero, later_zero, other_zero):
+        assert (x.get() == 0).all()
+
+
+def test_triple_pool(workers, monkeypatch):
+    from syft.frameworks.torch.mpc import beaver
+
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+    pool = beaver.triple_pool(james)
+    pool.clear()
+    hits, misses = pool.hits, pool.misses
+
+    t = torch.tensor([1, 2, 3, 4])
+    x = t.share(bob, alice, crypto_provider=james)
+
+    generations = []
+    generate_triples = beaver.generate_triples
+
+    def recorded_generate_triples(crypto_provider, specs, field, locations):
+        generations.append(len(specs))
+        return generate_triples(crypto_provider, specs, field, locations)
+
+    monkeypatch.setattr(beaver, "generate_triples", recorded_generate_triples)
+
+    beaver.prewarm_triples(james, torch.mul, x.child.field, t.shape, t.shape, [bob, alice], n=2)
+    assert pool.stats["size"] == 2
+    # the triples are generated in a single request
+    assert generations == [2]
+
+    for _ in range(3):
+        assert ((x * x).get() == t * t).all()
+
+    # the two first multiplications used the triples of the pool
+    assert pool.stats == {"size": 0, "hits": hits + 2, "misses": misses + 1}
+
+
+def test_triple_key_depends_on_equation_parameters():
+    from functools import partial
+    from syft.frameworks.torch.mpc import beaver
+
+    def conv(stride):
+        return lambda a, b: torch.conv2d(a, b, stride=stride)
+
+    def key(cmd):
+        return beaver.triple_key(cmd, 2 ** 62, (1, 1, 4, 4), (1, 1, 2, 2), [])
+
+    assert key(conv(1)) == key(conv(1))
+    assert key(conv(1)) != key(conv(2))
+    assert key(partial(torch.conv2d, stride=1)) != key(partial(torch.conv2d, stride=2))
+    assert key(torch.mul) != key(torch.matmul)
+
+
+def test_triple_pool_prewarm_from_plan(workers):
+    from syft.frameworks.torch.mpc import beaver
+
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+    pool = beaver.triple_pool(james)
+    pool.clear()
+
+    @syft.func2plan()
+    def plan_mul(x, y):
+        return x * y + x.matmul(y)
+
+    t = torch.tensor([[1, 2], [3, 4]])
+    x = t.share(bob, alice, crypto_provider=james)
+    y = t.share(bob, alice, crypto_provider=james)
+
+    result = beaver.prewarm_triples_from_plan(plan_mul, x, y, n=3)
+    expected = t * t + t.matmul(t)
+    assert (result.get() == expected).all()
+    assert pool.stats["size"] == 6
+
+    hits = pool.hits
+    assert (plan_mul(x, y).get() == expected).all()
+    assert pool.hits == hits + 2
+
+
+def test_plan_multiplications_batched_by_level(workers, monkeypatch):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+
+    @syft.func2plan(args_shape=[(2, 2), (2, 2)])
+    def plan_gates(x, h):
+        i = x.matmul(h)
+        f = x * h
+        o = h.matmul(x)
+        return (i + f) * o
+
+    # the plan is run from its actions, as when it is fetched
+    plan = syft.serde.deserialize(syft.serde.serialize(plan_gates))
+
+    t = torch.tensor([[1, 2], [3, 4]])
+    u = torch.tensor([[1, 0], [2, 1]])
+    x = t.share(bob, alice, crypto_provider=james)
+    h = u.share(bob, alice, crypto_provider=james)
+
+    rounds = []
+    reconstruct_all = AdditiveSharingTensor.reconstruct_all
+
+    def record_round(*tensors):
+        rounds.append(len(tensors))
+        return reconstruct_all(*tensors)
+
+    monkeypatch.setattr(AdditiveSharingTensor, "reconstruct_all", staticmethod(record_round))
+
+    result = plan(x, h)
+
+    assert (result.get() == (t.matmul(u) + t * u) * u.matmul(t)).all()
+    # the 3 independent multiplications are done in a single round, with their
+    # deltas and epsilons opened together
+    assert rounds == [6, 2]
+
+
+def test_plan_multiplications_opened_in_one_message(workers, monkeypatch):
+    me, bob, alice, james = (workers["me"], workers["bob"], workers["alice"], workers["james"])
+
+    @syft.func2plan(args_shape=[(2, 2), (2, 2)])
+    def plan_two_multiplications(x, h):
+        return x * h + x.matmul(h)
+
+    plan = syft.serde.deserialize(syft.serde.serialize(plan_two_multiplications))
+
+    t = torch.tensor([[1, 2], [3, 4]])
+    u = torch.tensor([[1, 0], [2, 1]])
+    x = t.share(bob, alice, crypto_provider=james)
+    h = u.share(bob, alice, crypto_provider=james)
+
+    messages = []
+    send_msg = syft.workers.base.BaseWorker.send_msg
+
+    def recorded_send_msg(self, message, location):
+        if isinstance(message, syft.messaging.message.WorkerCommandMessage):
+            messages.append((self.id, message.command_name))
+        return send_msg(self, message, location)
+
+    monkeypatch.setattr(syft.workers.base.BaseWorker, "send_msg", recorded_send_msg)
+    sequential = x * h + x.matmul(h)
+    sequential_messages, messages = messages, []
+    result = plan(x, h)
+    monkeypatch.undo()
+
+    expected = t * u + t.matmul(u)
+    assert (sequential.get() == expected).all()
+    assert (result.get() == expected).all()
+    # run one after the other, each multiplication opens its deltas and epsilons,
+    # while in the plan the level of both multiplications opens them in one message
+    assert sequential_messages.count((me.id, "open_shares")) == 2
+    assert messages.count((me.id, "open_shares")) == 1
+    assert len([m for m in messages if m[1] == "get_shares"]) == 1
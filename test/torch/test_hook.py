@@ -221,6 +221,55 @@ def test_hook_args_and_cmd_signature_malleability():
     assert (r3 == syft.LoggingTensor().on(torch.tensor([2.0, 4]))).all()
 
 
+def test_hook_args_cached_per_signature(monkeypatch):
+    """The hook functions of methods used with different signatures are all cached"""
+    from syft.generic.frameworks.hook import hook_args
+
+    a = syft.LoggingTensor().on(torch.tensor([1.0, 2]))
+    b = syft.LoggingTensor().on(torch.tensor([1.0, 2]))
+
+    for _ in range(2):
+        a + b
+        a + 1
+        a.view(2)
+        a.view(1, 2)
+    assert len(hook_args.hook_method_args_functions["Tensor.__add__"]) == 2
+    assert len(hook_args.hook_method_args_functions["Tensor.view"]) == 2
+
+    # the oldest signatures are forgotten when a new one is cached
+    monkeypatch.setattr(hook_args, "MAX_CACHED_SIGNATURES", 1)
+    r = a + 1.5
+    assert (r == syft.LoggingTensor().on(torch.tensor([2.5, 3.5]))).all()
+    assert len(hook_args.hook_method_args_functions["Tensor.__add__"]) == 1
+    r = a + b
+    assert (r == syft.LoggingTensor().on(torch.tensor([2.0, 4]))).all()
+    assert len(hook_args.hook_method_args_functions["Tensor.__add__"]) == 1
+
+
+def test_hook_args_signature_of_single_arg():
+    """Args which are a single tensor, as in unwrap_args_from_function, have a signature"""
+    from syft.generic.frameworks.hook import hook_args
+
+    x = torch.tensor([1.0, 2])
+    assert hook_args.args_signature(x) is torch.Tensor
+    assert hook_args.args_signature(x, deep=True) is torch.Tensor
+    assert hook_args.args_signature((x, 1)) == (torch.Tensor, int)
+
+
+def test_native_method_fast_path():
+    """Native tensors run the native methods without hooking, even for types with
+    their own native methods"""
+    x = torch.tensor([1.0, -2.0])
+    param = torch.nn.Parameter(torch.tensor([1.0, -2.0]))
+
+    assert (x.abs() == torch.tensor([1.0, 2.0])).all()
+    assert (param.abs() == torch.tensor([1.0, 2.0])).all()
+    assert (x.add(x) == torch.tensor([2.0, -4.0])).all()
+
+    with pytest.raises(RuntimeError):
+        x.add(torch.tensor([1.0, 2.0, 3.0]))
+
+
 def test_torch_func_signature_without_tensor():
     """The hook on the args of torch commands should work even if the args
     don't contain any tensor"""
@@ -1,4 +1,7 @@
+import gc
+import json
 import pytest
+import threading
 import time
 
 import syft as sy
@@ -124,3 +127,332 @@ def test_send_command_not_whitelisted(hook, workers):
 
             with pytest.raises(AttributeError):
                 getattr(attr, method_not_exist)
+
+
+def test_batched_commands(workers):
+    bob = workers["bob"]
+    x = th.tensor([1, 2, 3]).send(bob)
+    y = th.tensor([4, 5, 6]).send(bob)
+
+    bob.log_msgs = True
+    with bob.batched():
+        z = (x + y) * 2
+        # nothing is sent until the batch is flushed
+        assert len(bob.msg_history) == 0
+    bob.log_msgs = False
+
+    assert len(bob.msg_history) == 1
+    batch = bob._get_msg(0)
+    assert isinstance(batch, sy.messaging.message.BatchCommandMessage)
+    assert len(batch.actions) == 2
+    bob.msg_history = []
+
+    assert (z.get() == th.tensor([10, 14, 18])).all()
+
+
+def test_batched_commands_flush(workers):
+    bob = workers["bob"]
+    x = th.tensor([1, 2, 3]).send(bob)
+
+    bob.log_msgs = True
+    with bob.batched(max_size=2):
+        y = x + 1
+        z = y + 1
+        # the batch is sent once max_size commands are buffered
+        assert len(bob.msg_history) == 1
+        t = z + 1
+        # getting a result sends the pending commands first
+        assert (t.get() == th.tensor([4, 5, 6])).all()
+    bob.log_msgs = False
+    bob.msg_history = []
+
+    assert (z.get() == th.tensor([3, 4, 5])).all()
+
+
+def test_deferred_gc(hook, workers):
+    me = hook.local_worker
+    bob = workers["bob"]
+    me.deferred_gc = True
+    try:
+        flushed = me.gc_stats["flushed"]
+        x = th.tensor([1, 2, 3]).send(bob)
+        x_id = x.id_at_location
+        del x
+
+        # the deletion is queued
+        assert x_id in bob._objects
+        assert me.gc_stats["pending"] == 1
+
+        me.flush_gc()
+        assert x_id not in bob._objects
+        assert me.gc_stats["pending"] == 0
+        assert me.gc_stats["flushed"] == flushed + 1
+    finally:
+        me.deferred_gc = False
+
+
+def test_deferred_gc_flush(hook, workers):
+    me = hook.local_worker
+    bob = workers["bob"]
+    me.deferred_gc = True
+    me.gc_batch_size = 2
+    try:
+        flushes = me.gc_stats["flushes"]
+        x = th.tensor([1, 2, 3]).send(bob)
+        y = th.tensor([4, 5, 6]).send(bob)
+        x_id, y_id = x.id_at_location, y.id_at_location
+
+        # the deletions are sent before the next message to bob
+        del x
+        assert x_id in bob._objects
+        assert (y.get() == th.tensor([4, 5, 6])).all()
+        assert x_id not in bob._objects
+
+        # the deletions are sent once gc_batch_size deletions are queued
+        x = th.tensor([1, 2, 3]).send(bob)
+        y = th.tensor([4, 5, 6]).send(bob)
+        x_id, y_id = x.id_at_location, y.id_at_location
+        del x
+        del y
+        assert x_id not in bob._objects and y_id not in bob._objects
+        assert me.gc_stats["flushes"] == flushes + 2
+    finally:
+        me.deferred_gc = False
+        me.gc_batch_size = 100
+
+
+def test_deferred_gc_flush_interval(hook, workers):
+    me = hook.local_worker
+    alice, bob = workers["alice"], workers["bob"]
+    me.deferred_gc = True
+    me.gc_flush_interval = 1000
+    try:
+        x = th.tensor([1, 2, 3]).send(alice)
+        x_id = x.id_at_location
+        del x
+        assert x_id in alice._objects
+
+        # too old deletions are sent with the next message, whatever its location
+        me.gc_flush_interval = 0
+        y = th.tensor([4, 5, 6]).send(bob)
+        assert x_id not in alice._objects
+        assert me.gc_stats["pending"] == 0
+        assert (y.get() == th.tensor([4, 5, 6])).all()
+    finally:
+        me.deferred_gc = False
+        me.gc_flush_interval = 1.0
+
+
+def test_send_obj_in_chunks(hook, workers):
+    me = hook.local_worker
+    bob = workers["bob"]
+    me.transfer_chunk_size = 100
+    progress = []
+    me.transfer_progress = lambda sent, total: progress.append((sent, total))
+    try:
+        x = th.rand(10, 11)
+        x.tags = {"#chunked"}
+        x_ptr = x.send(bob)
+
+        # 440 bytes are sent in chunks of 25 floats
+        assert progress == [(100, 440), (200, 440), (300, 440), (400, 440), (440, 440)]
+        assert bob._objects[x.id].tags == {"#chunked"}
+        assert x.id not in bob._chunked_transfers
+        assert (x_ptr.get() == x).all()
+    finally:
+        me.transfer_chunk_size = None
+        me.transfer_progress = None
+
+
+def test_send_obj_in_chunks_resume(hook, workers):
+    me = hook.local_worker
+    bob = workers["bob"]
+    x = th.arange(100, dtype=th.int64)
+
+    def interrupt(sent, total):
+        if sent == 400:
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        me.send_obj_in_chunks(x, bob, chunk_size=200, progress=interrupt)
+    assert bob._chunked_transfers[x.id]["next_chunk"] == 2
+    assert x.id not in bob._objects
+
+    # the transfer resumes from the third chunk
+    progress = []
+    me.send_obj_in_chunks(
+        x, bob, chunk_size=200, progress=lambda sent, total: progress.append(sent)
+    )
+    assert progress == [600, 800]
+    assert (bob._objects[x.id] == x).all()
+    bob.rm_obj(x.id)
+
+
+def test_send_obj_in_chunks_auto_resume(hook, workers):
+    me = hook.local_worker
+    bob = workers["bob"]
+    x = th.arange(100, dtype=th.int64)
+    send_msg = me.send_msg
+    sent = []
+
+    def drop_third_chunk(message, location):
+        if message.command_name == "receive_chunk" and len(sent) == 2:
+            sent.append(None)
+            raise ConnectionError
+        if message.command_name == "receive_chunk":
+            sent.append(message.message[0][1])
+        return send_msg(message, location)
+
+    me.send_msg = drop_third_chunk
+    try:
+        me.send_obj_in_chunks(x, bob, chunk_size=200)
+    finally:
+        del me.send_msg
+
+    # the transfer resumed from the third chunk once the connection was lost
+    assert sent == [0, 1, None, 2, 3]
+    assert (bob._objects[x.id] == x).all()
+    bob.rm_obj(x.id)
+
+
+def test_send_obj_in_chunks_release(hook, workers):
+    me = hook.local_worker
+    bob = workers["bob"]
+    x, y, z = th.arange(100), th.arange(100), th.arange(100)
+
+    def interrupt(sent, total):
+        raise RuntimeError
+
+    for tensor in (x, y):
+        with pytest.raises(RuntimeError):
+            me.send_obj_in_chunks(tensor, bob, chunk_size=200, progress=interrupt)
+
+    # an aborted transfer is released
+    me.abort_obj_in_chunks(x.id, bob)
+    assert x.id not in bob._chunked_transfers
+
+    # an abandoned transfer is released when it expires
+    bob.transfer_expiry = 0.0
+    try:
+        with pytest.raises(RuntimeError):
+            me.send_obj_in_chunks(z, bob, chunk_size=200, progress=interrupt)
+    finally:
+        bob.transfer_expiry = 600.0
+    assert y.id not in bob._chunked_transfers
+    assert z.id in bob._chunked_transfers
+
+    # or when too many transfers are in progress
+    bob.max_chunked_transfers = 1
+    try:
+        with pytest.raises(RuntimeError):
+            me.send_obj_in_chunks(x, bob, chunk_size=200, progress=interrupt)
+    finally:
+        bob.max_chunked_transfers = 16
+    assert list(bob._chunked_transfers) == [x.id]
+
+    me.abort_obj_in_chunks(x.id, bob)
+    assert not bob._chunked_transfers
+
+
+def test_message_metrics(workers):
+    me = workers["me"]
+    bob = workers["bob"]
+    me.metrics = sy.workers.message_metrics.MessageMetrics()
+    bob.metrics = sy.workers.message_metrics.MessageMetrics()
+
+    try:
+        x = th.tensor([1, 2, 3]).send(bob)
+        y = x + x
+    finally:
+        me_metrics, bob_metrics = me.metrics, bob.metrics
+        me.metrics, bob.metrics = None, None
+
+    sent = me_metrics.summary()
+    assert sent[("sent", "ObjectMessage", "")]["count"] == 1
+    (command_key,) = [key for key in sent if key[1] == "TensorCommandMessage"]
+    # messages between VirtualWorkers are exchanged in-process, without bytes
+    assert sent[command_key]["bytes"] == 0
+    assert sent[command_key]["latency_buckets"][float("inf")] == 1
+
+    received = bob_metrics.summary()
+    assert received[("received", "ObjectMessage", "")]["count"] == 1
+    assert received[("received",) + command_key[1:]]["execute_time"] > 0
+
+    prometheus = me_metrics.to_prometheus(worker_id=me.id)
+    assert (
+        f'syft_messages_total{{worker="{me.id}",direction="sent",message_type="ObjectMessage",op=""}} 1'
+        in prometheus
+    )
+
+
+def test_message_metrics_of_exited_threads(workers):
+    metrics = sy.workers.message_metrics.MessageMetrics()
+    message = sy.messaging.message.ObjectMessage(th.tensor([1]))
+
+    threads = [
+        threading.Thread(target=metrics.record, args=("sent", message, 10, 0.0, 0.001))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    # the metrics of the exited threads are merged, not kept by thread
+    assert not metrics._threads_metrics
+    summary = metrics.summary()
+    assert summary[("sent", "ObjectMessage", "")]["count"] == 3
+    assert summary[("sent", "ObjectMessage", "")]["bytes"] == 30
+
+    metrics.reset()
+    assert not metrics.summary()
+
+
+def test_tracing_spans(workers, tmpdir):
+    me = workers["me"]
+    bob = workers["bob"]
+    me_tracer = me.tracer = sy.workers.tracing.Tracer(me.id)
+    bob_tracer = bob.tracer = sy.workers.tracing.Tracer(bob.id)
+    bob_metrics = bob.metrics = sy.workers.message_metrics.MessageMetrics()
+
+    try:
+        with me.tracer.span("step") as step_id:
+            x = th.tensor([1, 2, 3]).send(bob)
+            y = x + x
+    finally:
+        me.tracer, bob.tracer, bob.metrics = None, None, None
+
+    (step,) = [span for span in me_tracer.spans if span["name"] == "step"]
+    sends = [span for span in me_tracer.spans if span["name"] == "send"]
+    receives = [span for span in bob_tracer.spans if span["name"] == "receive"]
+    assert len(sends) == len(receives) == 2
+
+    # all the spans belong to the trace of the step
+    trace_id = step["args"]["trace_id"]
+    assert all(span["args"]["trace_id"] == trace_id for span in me_tracer.spans + bob_tracer.spans)
+
+    # the messages sent are children of the step, and received by bob in their children
+    assert all(send["args"]["parent_id"] == step_id for send in sends)
+    send_ids = [send["args"]["span_id"] for send in sends]
+    assert [receive["args"]["parent_id"] for receive in receives] == send_ids
+    assert [receive["args"]["message_type"] for receive in receives] == [
+        "ObjectMessage",
+        "TensorCommandMessage",
+    ]
+    phases = [span["name"] for span in bob_tracer.spans if span["args"]["parent_id"] in send_ids]
+    assert phases == ["receive", "receive"]
+    execute_parents = [
+        span["args"]["parent_id"] for span in bob_tracer.spans if span["name"] == "execute"
+    ]
+    assert execute_parents == [receive["args"]["span_id"] for receive in receives]
+
+    # the messages are still recorded as themselves in the metrics
+    assert ("received", "ObjectMessage", "") in bob_metrics.summary()
+
+    path = str(tmpdir.join("trace.json"))
+    sy.workers.tracing.export_chrome_trace(path, me_tracer.spans, bob_tracer.spans)
+    with open(path) as trace_file:
+        events = json.load(trace_file)["traceEvents"]
+    process_names = [event["args"]["name"] for event in events if event["ph"] == "M"]
+    assert process_names == [str(me.id), str(bob.id)]
+    assert len(events) == len(me_tracer.spans) + len(bob_tracer.spans) + 2
@@ -279,3 +279,45 @@ def test_send_command_not_whitelisted(hook, workers):
 
             with pytest.raises(AttributeError):
                 getattr(attr, method_not_exist)
+
+
+def test_in_process_messages(hook):
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(hook, id=f"bob{worker_id}", in_process=True)
+
+    x = torch.tensor([1.0, 2.0, 3.0])
+
+    with patch.object(VirtualWorker, "_recv_msg") as recv_binary:
+        x_ptr = x.send(bob)
+        y_ptr = x_ptr * 2
+        y = y_ptr.get()
+
+    # no message went through the binary serialization
+    recv_binary.assert_not_called()
+    assert (y == torch.tensor([2.0, 4.0, 6.0])).all()
+
+    # tensors are cloned on receive, so the sender and bob don't share memory
+    x.add_(1)
+    assert (x_ptr.get() == torch.tensor([1.0, 2.0, 3.0])).all()
+
+    w = torch.tensor([1.0, 2.0], requires_grad=True)
+    w_ptr = w.send(bob)
+    assert bob.get_obj(w_ptr.id_at_location).requires_grad
+
+    bob.remove_worker_from_local_worker_registry()
+
+
+def test_in_process_messages_strict_serde(hook):
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(hook, id=f"bob{worker_id}", in_process=True)
+
+    VirtualWorker.strict_serde = True
+    try:
+        with patch.object(VirtualWorker, "_recv_msg_in_process") as recv_in_process:
+            x_ptr = torch.tensor([1, 2, 3]).send(bob)
+            assert (x_ptr.get() == torch.tensor([1, 2, 3])).all()
+    finally:
+        VirtualWorker.strict_serde = False
+
+    recv_in_process.assert_not_called()
+    bob.remove_worker_from_local_worker_registry()
@@ -1,14 +1,18 @@
+from concurrent.futures import ProcessPoolExecutor
 import io
 from os.path import exists, join
 import time
 from socket import gethostname
+import urllib.request
 from OpenSSL import crypto, SSL
 import pytest
 import torch
+import websocket
 import syft as sy
 from syft.generic.frameworks.hook import hook_args
 from syft.frameworks.torch.fl import utils
 
+from syft.workers.message_metrics import MessageMetrics
 from syft.workers.websocket_client import WebsocketClientWorker
 from syft.workers.websocket_server import WebsocketServerWorker
 
@@ -18,6 +22,16 @@ from test.conftest import instantiate_websocket_client_worker
 PRINT_IN_UNITTESTS = False
 
 
+def test_websocket_workers_lazy_import():
+    """The websocket workers are imported on their first access from syft"""
+    assert sy.WebsocketClientWorker is WebsocketClientWorker
+    assert sy.WebsocketServerWorker is WebsocketServerWorker
+    assert "WebsocketClientWorker" in vars(sy)
+
+    with pytest.raises(AttributeError):
+        sy.NotAWorker
+
+
 @pytest.mark.parametrize("secure", [True, False])
 def test_websocket_worker_basic(hook, start_proc, secure, tmpdir):
     """Evaluates that you can do basic tensor operations using
@@ -266,6 +280,191 @@ def test_send_command_not_whitelisted(hook, start_remote_worker):
     server.terminate()
 
 
+@pytest.mark.parametrize(
+    "client_binary, server_binary", [(True, True), (True, False), (False, True)]
+)
+def test_websocket_frame_mode_negotiation(hook, start_proc, client_binary, server_binary):
+    """Binary frames are only used when both peers agree on them during the handshake,
+    the other combinations fall back to hex-encoded text frames."""
+    kwargs = {"id": "fed-frame-mode", "host": "localhost", "port": 8774, "hook": hook}
+    server = start_proc(WebsocketServerWorker, binary_frames=server_binary, **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(binary_frames=client_binary, **kwargs)
+
+    assert remote_proxy.use_binary_frames == (client_binary and server_binary)
+
+    x = torch.tensor([1.0, 2, 3]).send(remote_proxy)
+    y = (x + x).get()
+    assert (y == torch.tensor([2.0, 4, 6])).all()
+
+    x.get()  # retrieve remote object before closing the websocket connection
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+@pytest.mark.parametrize("executor", [2, "process"])
+def test_websocket_worker_executor(hook, start_proc, executor):
+    """Messages processed on an executor are executed in the order they were received
+    on a connection, also when they are decoded in other processes."""
+    if executor == "process":
+        executor = ProcessPoolExecutor(max_workers=2)
+    kwargs = {"id": "fed-executor", "host": "localhost", "port": 8782, "hook": hook}
+    server = start_proc(WebsocketServerWorker, executor=executor, **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(**kwargs)
+
+    x = torch.tensor([1.0, 2, 3]).send(remote_proxy)
+    for _ in range(10):
+        x.add_(1)
+    y = x * 2
+
+    assert (y.get() == torch.tensor([22.0, 24, 26])).all()
+
+    x.get()  # retrieve remote object before closing the websocket connection
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+@pytest.mark.parametrize("executor", [None, 2])
+def test_websocket_worker_pipelined_commands(hook, start_proc, executor):
+    """Many commands can be in flight on a pipelined connection, their responses
+    being matched to the requests by id."""
+    kwargs = {"id": "fed-pipelined", "host": "localhost", "port": 8783, "hook": hook}
+    server = start_proc(WebsocketServerWorker, executor=executor, **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(pipelined=True, **kwargs)
+
+    assert remote_proxy.use_pipelining
+
+    x = torch.tensor([1.0, 2, 3]).send(remote_proxy)
+    futures = [
+        remote_proxy.send_command_async(("mul", x.child, (float(i),), {})) for i in range(10)
+    ]
+    results = [future.result().wrap().get() for future in futures]
+
+    for i, result in enumerate(results):
+        assert (result == torch.tensor([1.0, 2, 3]) * i).all()
+
+    x.get()  # retrieve remote object before closing the websocket connection
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+def test_websocket_worker_pipelined_commands_metrics_and_batching(hook, start_proc):
+    """Commands sent asynchronously are recorded in the metrics of the local worker
+    and buffered while the recipient is batched, like the commands sent synchronously."""
+    kwargs = {"id": "fed-pipelined-hooks", "host": "localhost", "port": 8786, "hook": hook}
+    server = start_proc(WebsocketServerWorker, **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(pipelined=True, **kwargs)
+    local_worker = hook.local_worker
+
+    x = torch.tensor([1.0, 2, 3]).send(remote_proxy)
+
+    local_worker.metrics = MessageMetrics()
+    try:
+        y = remote_proxy.send_command_async(("mul", x.child, (2.0,), {})).result()
+    finally:
+        metrics, local_worker.metrics = local_worker.metrics, None
+    (command_key,) = [key for key in metrics.summary() if key[1] == "TensorCommandMessage"]
+    assert command_key[0] == "sent"
+    assert metrics.summary()[command_key]["bytes"] > 0
+
+    with remote_proxy.batched():
+        future = remote_proxy.send_command_async(("add", x.child, (1.0,), {}))
+        assert future.done()
+        z = future.result()
+        assert len(remote_proxy._command_batch) == 1
+
+    assert (z.wrap().get() == torch.tensor([2.0, 3, 4])).all()
+    assert (y.wrap().get() == torch.tensor([2.0, 4, 6])).all()
+
+    x.get()  # retrieve remote object before closing the websocket connection
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+def test_websocket_worker_resends_only_unsent_messages(hook, start_proc):
+    """A message is sent again on a new connection if the connection was lost before
+    it was sent, but not once it was sent, and timeouts are raised."""
+    kwargs = {"id": "fed-resend", "host": "localhost", "port": 8787, "hook": hook}
+    server = start_proc(WebsocketServerWorker, **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(**kwargs)
+
+    sent = []
+    send = remote_proxy._send_to_websocket_server_worker
+
+    def counted_send(message):
+        sent.append(message)
+        send(message)
+
+    remote_proxy._send_to_websocket_server_worker = counted_send
+
+    # the connection is lost before the message is sent: it is sent again
+    remote_proxy.ws.shutdown()
+    assert remote_proxy.objects_count_remote() == 0
+    assert len(sent) == 2
+    assert remote_proxy.ws.connected
+
+    # the message was sent when the response times out: it isn't sent again
+    def timeout():
+        raise websocket.WebSocketTimeoutException("timed out")
+
+    remote_proxy._receive_from_websocket_server_worker = timeout
+    with pytest.raises(websocket.WebSocketTimeoutException):
+        remote_proxy.objects_count_remote()
+    assert len(sent) == 3
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+def test_websocket_worker_prometheus_metrics(hook, start_proc):
+    """The metrics of the messages of the server are served over HTTP in the Prometheus format."""
+    kwargs = {"id": "fed-metrics", "host": "localhost", "port": 8784, "hook": hook}
+    server = start_proc(WebsocketServerWorker, metrics=MessageMetrics(), **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(**kwargs)
+
+    x = torch.tensor([1.0, 2, 3]).send(remote_proxy)
+    x.get()
+
+    metrics = remote_proxy.prometheus_metrics_remote()
+    assert 'syft_messages_total{worker="fed-metrics",direction="received"' in metrics
+
+    with urllib.request.urlopen("http://localhost:8784/metrics") as response:
+        assert response.status == 200
+        metrics = response.read().decode("utf-8")
+    assert "# TYPE syft_message_latency_seconds histogram" in metrics
+    assert 'message_type="ObjectMessage"' in metrics
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
 @pytest.mark.skip
 def test_evaluate(hook, start_proc):  # pragma: no cover
 